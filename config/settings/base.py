@@ -1,6 +1,7 @@
 """Base settings to build other settings files upon."""
 
 import environ
+from celery.schedules import crontab
 
 ROOT_DIR = environ.Path(__file__) - 3
 APPS_DIR = ROOT_DIR.path('prm')
@@ -41,6 +42,7 @@ DJANGO_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.admin',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -54,6 +56,8 @@ LOCAL_APPS = [
     'prm.users.apps.UsersConfig',
     'prm.relations.apps.RelationsConfig',
     'prm.journals.apps.JournalsConfig',
+    'prm.search.apps.SearchConfig',
+    'prm.sync.apps.SyncConfig',
 ]
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
@@ -82,6 +86,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 # Middlewares
 MIDDLEWARE = [
+    'prm.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'prm.middleware.MultipleProxyMiddleware',
@@ -108,6 +113,22 @@ STATICFILES_FINDERS = [
 MEDIA_ROOT = str(APPS_DIR('media'))
 MEDIA_URL = '/media/'
 
+# Files holding personal data, like exports, never served publicly, see
+# prm.utils.storages
+PRIVATE_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+PRIVATE_FILE_STORAGE_OPTIONS = {'location': str(ROOT_DIR('private'))}
+# Seconds account export links work, exports are deleted afterwards
+EXPORTS_TIMEOUT = env.int('EXPORTS_TIMEOUT', default=2 * 24 * 60 * 60)
+
+# Resized copies of the uploaded pictures, see prm.utils.pictures. Sizes
+# are the longest side in pixels.
+PICTURE_VARIANTS = {
+    'small': 96,
+    'medium': 320,
+    'large': 1024,
+}
+PICTURE_VARIANTS_QUALITY = 80
+
 # Templates
 TEMPLATES = [
     {
@@ -145,6 +166,17 @@ X_FRAME_OPTIONS = 'DENY'
 EMAIL_BACKEND = env('DJANGO_EMAIL_BACKEND',
                     default='django.core.mail.backends.smtp.EmailBackend')
 
+# Queued emails delivery, see prm.taskapp.emails
+EMAIL_BATCH_SIZE = env.int('EMAIL_BATCH_SIZE', default=100)
+# Seconds queued emails wait for others to be delivered along with them
+EMAIL_BATCH_DELAY = env.int('EMAIL_BATCH_DELAY', default=5)
+# Messages per minute accepted by the relay, 0 means unlimited
+EMAIL_RATE_LIMIT = env.int('EMAIL_RATE_LIMIT', default=0)
+EMAIL_MAX_ATTEMPTS = 5
+# Seconds a worker holds the emails it's sending before others can retry
+# them, the delivery task time limit
+EMAIL_LEASE_TIME = 5 * 60
+
 # Admin
 ADMIN_URL = 'admin/'
 
@@ -159,6 +191,28 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERYD_TASK_TIME_LIMIT = 5 * 60
 CELERYD_TASK_SOFT_TIME_LIMIT = 60
+CELERY_BEAT_SCHEDULE = {
+    'compute-contact-reminders': {
+        'task': 'compute_contact_reminders',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    'send-queued-emails': {
+        'task': 'send_queued_emails',
+        'schedule': 60,
+    },
+    'prune-tombstones': {
+        'task': 'prune_tombstones',
+        'schedule': crontab(hour=4, minute=30),
+    },
+    'prune-exports': {
+        'task': 'prune_exports',
+        'schedule': crontab(hour=5, minute=0),
+    },
+    'prune-imports': {
+        'task': 'prune_imports',
+        'schedule': crontab(hour=5, minute=15),
+    },
+}
 
 # Django REST Framework
 REST_FRAMEWORK = {
@@ -171,14 +225,59 @@ REST_FRAMEWORK = {
         'djangorestframework_camel_case.parser.CamelCaseJSONParser',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'prm.users.authentication.CachedTokenAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'prm.utils.pagination.LimitOffsetOrCursorPagination',
     'PAGE_SIZE': 10
 }
 
+# Maximum number of items accepted by the bulk endpoints
+BULK_MAX_ITEMS = 5000
+
+# Seconds the progress of contacts imports can be polled, as long as
+# celery keeps the task results
+CONTACTS_IMPORT_STATUS_TIMEOUT = 24 * 60 * 60
+
+# Responses cache, see prm.utils.mixins.CachedResponseMixin
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300)
+# Basenames of the viewsets whose responses aren't cached, like 'contacts'
+RESPONSE_CACHE_DISABLED = env.list('RESPONSE_CACHE_DISABLED', default=[])
+
 LOGIN_URL = '/users/login/'
 
+# Days without interactions before being reminded of a contact, unless
+# the contact sets its own interval
+CONTACT_REMINDER_INTERVAL = env.int('CONTACT_REMINDER_INTERVAL', default=30)
+# Users whose reminders are computed by each task
+CONTACT_REMINDERS_BATCH_SIZE = 500
+
+# Days deleted objects are kept track of for delta sync, clients that
+# haven't synced for longer need a full sync
+SYNC_TOMBSTONE_DAYS = env.int('SYNC_TOMBSTONE_DAYS', default=90)
+# Seconds sync tokens are set back, so changes committed by slower
+# transactions are synced along with the next sync
+SYNC_OVERLAP = 60
+# Objects and deleted codes returned by each sync, the rest are returned by
+# the syncs continuing it
+SYNC_PAGE_SIZE = env.int('SYNC_PAGE_SIZE', default=1000)
+
+# Token authentication cache (seconds)
+AUTH_TOKEN_CACHE_TIMEOUT = env.int('AUTH_TOKEN_CACHE_TIMEOUT', default=60)
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = env.int(
+    'AUTH_TOKEN_LOCAL_CACHE_TIMEOUT', default=5)
+AUTH_TOKEN_LOCAL_CACHE_SIZE = 1024
+
+# Request instrumentation, see prm.middleware.instrumentation
+INSTRUMENTATION_ENABLED = env.bool('INSTRUMENTATION_ENABLED', default=False)
+# Bearer token required by /metrics, which is disabled without it
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+# Seconds between the flushes of the request histograms of each process to
+# the cache, which every process exports
+METRICS_FLUSH_INTERVAL = env.int('METRICS_FLUSH_INTERVAL', default=10)
+
+# Seconds clients may cache the API schema, see prm.utils.schema
+SCHEMA_CACHE_TIMEOUT = env.int('SCHEMA_CACHE_TIMEOUT', default=3600)
+
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
         'Bearer': {
@@ -54,6 +54,12 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 # Media
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 MEDIA_URL = f'https://{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/'
+PRIVATE_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
+PRIVATE_FILE_STORAGE_OPTIONS = {
+    'location': 'private',
+    'default_acl': 'private',
+    'file_overwrite': False,
+}
 
 # Templates
 TEMPLATES[0]['OPTIONS']['loaders'] = [  # noqa F405
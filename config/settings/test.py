@@ -3,6 +3,8 @@
 With these settings, tests run faster.
 """
 
+import tempfile
+
 from .base import *  # NOQA
 from .base import env
 
@@ -19,6 +21,13 @@ CACHES = {
     }
 }
 
+# Media
+# Uploads and their picture variants are written to a temporary folder
+DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+MEDIA_ROOT = tempfile.mkdtemp(prefix="prm-media-")
+PRIVATE_FILE_STORAGE_OPTIONS = {
+    "location": tempfile.mkdtemp(prefix="prm-private-")}
+
 # Passwords
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
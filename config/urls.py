@@ -6,10 +6,11 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.http import JsonResponse
 from rest_framework import permissions
-from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from prm.middleware import metrics_view
+from prm.utils.schema import get_cached_schema_view
 
-schema_view = get_schema_view(
+schema_view = get_cached_schema_view(
     openapi.Info(
         title="Dockpad's PRM API",
         default_version='v1',
@@ -34,12 +35,17 @@ urlpatterns = [
     # Django Admin
     path(settings.ADMIN_URL, admin.site.urls),
 
+    # Prometheus metrics
+    path('metrics', metrics_view, name='metrics'),
+
     # App urls
     path('', include(('prm.users.urls', 'users'), namespace='users')),
     path('', include(('prm.relations.urls', 'relations'),
                      namespace='relations')),
     path('', include(('prm.journals.urls', 'journals'),
                      namespace='journals')),
+    path('', include(('prm.search.urls', 'search'), namespace='search')),
+    path('', include(('prm.sync.urls', 'sync'), namespace='sync')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 
@@ -0,0 +1,8 @@
+"""API benchmark suite.
+
+Seeds users with realistic data volumes (`seed`), drives every endpoint
+of the users, relations and journals apps (`scenarios`) through the test
+client or a local gunicorn server and reports their throughput, latency
+percentiles and query counts, compared with the stored baselines
+(`runner`). See the `benchmark_api` command.
+"""
@@ -0,0 +1,200 @@
+"""Benchmark runner."""
+
+# Standard Library
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+# Django
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+# Versions
+from ..utils.versions import bump_data_version
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+# Savepoints depend on the transaction the request runs in, like the one
+# wrapping each test, they're left out of the query counts
+SAVEPOINT_QUERIES = re.compile(r'(RELEASE |ROLLBACK TO )?SAVEPOINT ')
+
+
+def percentile(timings, percent):
+    """Nearest rank percentile of an ascending sorted list"""
+    index = max(0, int(round(percent / 100 * len(timings))) - 1)
+    return timings[index]
+
+
+class ClientDriver:
+    """Requests through the Django test client, in this process, counting
+       their queries"""
+
+    def __init__(self, user, host=None):
+        self.client = APIClient(**({'HTTP_HOST': host} if host else {}))
+        self.client.force_authenticate(user)
+
+    def request(self, method, path, params, data):
+        """Returns the status code and query count of the request"""
+        with CaptureQueriesContext(connection) as context:
+            if data is None:
+                response = getattr(self.client, method)(path, params)
+            else:
+                if params:
+                    path = f'{path}?{urlencode(params)}'
+                response = getattr(self.client, method)(
+                    path, data, format='json')
+            if response.streaming:
+                # Streamed responses query as they're consumed
+                b''.join(response.streaming_content)
+        queries = [
+            query for query in context.captured_queries
+            if not SAVEPOINT_QUERIES.match(query['sql'])]
+        return response.status_code, len(queries)
+
+
+class HTTPDriver:
+    """Requests to a running server. Queries are read from the
+       Server-Timing header, when instrumentation is enabled."""
+
+    def __init__(self, base_url, user):
+        self.base_url = base_url
+        self.token = Token.objects.get_or_create(user=user)[0].key
+
+    def request(self, method, path, params, data):
+        url = self.base_url + path
+        if params:
+            url = f'{url}?{urlencode(params)}'
+        request = Request(
+            url, method=method.upper(),
+            data=None if data is None else json.dumps(data).encode(),
+            headers={
+                'Authorization': f'Token {self.token}',
+                'Content-Type': 'application/json',
+            })
+        try:
+            with urlopen(request) as response:
+                response.read()
+                status, headers = response.status, response.headers
+        except HTTPError as err:
+            status, headers = err.code, err.headers
+        match = SERVER_TIMING_QUERIES.search(
+            headers.get('Server-Timing', ''))
+        return status, int(match.group(1)) if match else None
+
+
+@contextmanager
+def gunicorn_server(port, workers):
+    """Runs the project on a local gunicorn with instrumentation enabled,
+       yields its URL"""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'config.wsgi',
+         '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+         '--chdir', str(settings.ROOT_DIR)],
+        env=dict(os.environ, INSTRUMENTATION_ENABLED='True'))
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError('gunicorn exited, is it installed?')
+            try:
+                socket.create_connection(('127.0.0.1', port), 1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError('gunicorn did not start in time')
+                time.sleep(0.2)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run_scenario(driver, scenario, context, user, requests, concurrency=1):
+    """Issues the scenario's request `requests` times. Concurrent requests
+       need a thread safe driver, the test client is not."""
+    method, path, params, data = scenario.get_request(context)
+    # The first request misses the responses cache, whatever ran before
+    bump_data_version(user.pk)
+
+    def timed_request(_):
+        start = time.perf_counter()
+        status, queries = driver.request(method, path, params, data)
+        return (time.perf_counter() - start) * 1000, status, queries
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(timed_request, range(requests)))
+    else:
+        results = [timed_request(i) for i in range(requests)]
+    elapsed = time.perf_counter() - start
+
+    timings = sorted(timing for timing, _, _ in results)
+    queries = [count for _, _, count in results if count is not None]
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, status, _ in results if status >= 400),
+        'throughput': round(requests / elapsed, 1),
+        'p50': round(percentile(timings, 50), 2),
+        'p90': round(percentile(timings, 90), 2),
+        'p99': round(percentile(timings, 99), 2),
+        # The most expensive request, with a cold cache
+        'queries': max(queries) if queries else None,
+    }
+
+
+def load_baselines(path=BASELINES_PATH):
+    try:
+        with open(path) as baselines_file:
+            return json.load(baselines_file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(baselines, path=BASELINES_PATH):
+    with open(path, 'w') as baselines_file:
+        json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+        baselines_file.write('\n')
+
+
+def find_regressions(results, baseline, tolerance=None):
+    """Messages describing the results worse than the baseline. Query
+       counts must not grow, latencies are only compared when a tolerance
+       is given, as they depend on the machine."""
+    regressions = []
+    for name, result in results.items():
+        if result['errors']:
+            regressions.append(f'{name}: {result["errors"]} failed requests')
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        if (result['queries'] is not None
+                and expected.get('queries') is not None
+                and result['queries'] > expected['queries']):
+            regressions.append(
+                f'{name}: {result["queries"]} queries, '
+                f'baseline {expected["queries"]}')
+        if tolerance is not None:
+            for key in ('p50', 'p99'):
+                limit = expected[key] * (1 + tolerance)
+                if result[key] > limit:
+                    regressions.append(
+                        f'{name}: {key} {result[key]}ms, baseline '
+                        f'{expected[key]}ms')
+    return regressions
@@ -0,0 +1,95 @@
+"""Benchmark scenarios, one request per endpoint."""
+
+# Standard Library
+from datetime import timedelta
+
+# Models
+from ..journals.models import Event, Mood
+from ..relations.models import ActivityLog, Contact
+
+
+class Scenario:
+    """Request formatted with the codes of the benchmark user's objects.
+       Writes are idempotent, so every request does the same work."""
+
+    def __init__(self, name, path, params=None, method='get', data=None):
+        self.name = name
+        self.path = path
+        self.params = params or {}
+        self.method = method
+        self.data = data
+
+    def get_request(self, context):
+        return (
+            self.method,
+            self.path.format(**context),
+            {name: value.format(**context)
+             for name, value in self.params.items()},
+            self.data)
+
+
+DATE_RANGE = {'from': '{from_date}', 'to': '{to_date}'}
+
+EVENT_DATA = {
+    'title': 'Bench', 'location': 'Bench', 'date': '2019-10-01',
+    'start_time': '10:00', 'end_time': '11:00',
+}
+
+SCENARIOS = [
+    # Users
+    Scenario('users-detail', '/users/{username}/'),
+    Scenario('users-profile', '/users/profile/'),
+    Scenario('users-export', '/users/{username}/export/'),
+
+    # Relations
+    Scenario('contacts-list', '/contacts/'),
+    Scenario('contacts-list-ordered', '/contacts/',
+             {'ordering': '-last_interaction'}),
+    Scenario('contacts-detail', '/contacts/{contact}/'),
+    Scenario('contacts-search', '/contacts/search/', {'q': 'contact'}),
+    Scenario('contacts-reminders', '/contacts/reminders/'),
+    Scenario('contacts-update', '/contacts/{contact}/', method='patch',
+             data={'nickname': 'Bench'}),
+    Scenario('activities-list', '/activities/'),
+    Scenario('activities-detail', '/activities/{activity}/'),
+    Scenario('activities-logs', '/activities/logs/'),
+    Scenario('activity-logs-list', '/activities/{activity}/logs/'),
+    Scenario('activity-logs-detail', '/activities/{activity}/logs/{log}/'),
+
+    # Journals
+    Scenario('moods-list', '/moods/', DATE_RANGE),
+    Scenario('moods-detail', '/moods/{date}/'),
+    Scenario('moods-stats', '/moods/stats/', DATE_RANGE),
+    Scenario('moods-upsert', '/moods/', method='post', data={
+        'date': '2019-10-01', 'mood': Mood.GOOD, 'description': 'Bench'}),
+    Scenario('events-list', '/events/', DATE_RANGE),
+    Scenario('events-detail', '/events/{event}/'),
+    Scenario('events-update', '/events/{event}/', method='put',
+             data=EVENT_DATA),
+]
+
+
+def get_context(user):
+    """Codes of the user's objects the scenarios request"""
+    log = (
+        ActivityLog.objects
+        .filter(owner=user, activity__isnull=False)
+        .select_related('activity')
+        .first())
+    last_date = Mood.objects.filter(owner=user).latest().date
+    return {
+        'username': user.username,
+        'contact': Contact.objects.filter(owner=user).first().code,
+        'activity': log.activity.code,
+        'log': log.code,
+        'event': Event.objects.filter(owner=user).first().code,
+        'date': str(last_date),
+        'from_date': str(last_date - timedelta(days=30)),
+        'to_date': str(last_date),
+    }
+
+
+def get_scenarios(names=None):
+    if not names:
+        return SCENARIOS
+    return [scenario for scenario in SCENARIOS if scenario.name in names]
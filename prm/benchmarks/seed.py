@@ -0,0 +1,101 @@
+"""Benchmark data."""
+
+# Standard Library
+import random
+from datetime import timedelta
+
+# Django
+from django.db import transaction
+from django.utils import timezone
+
+# Models
+from ..users.models import User
+from ..journals.models import Event, Mood
+from ..relations.models import Activity, ActivityLog, Contact, ContactStats
+
+USERNAME_PREFIX = 'benchmark_api_'
+BATCH_SIZE = 5000
+
+# Rows by table for each user
+VOLUMES = {
+    # Quick runs and the test suite
+    'small': {
+        'contacts': 20, 'activities': 5, 'logs': 50, 'events': 50,
+        'moods': 30,
+    },
+    # A few years of daily use
+    'realistic': {
+        'contacts': 300, 'activities': 20, 'logs': 3000, 'events': 1500,
+        'moods': 1000,
+    },
+}
+
+
+def get_benchmark_users():
+    return User.objects.filter(username__startswith=USERNAME_PREFIX)
+
+
+def seed(users_count, volume, seed_value=0):
+    """Creates the benchmark users along with their data. The same seed
+       creates the same data, so runs can be compared."""
+    return seed_rows(users_count, VOLUMES[volume], seed_value)
+
+
+def seed_rows(users_count, rows, seed_value=0):
+    """Like `seed`, with the rows by table for each user"""
+    rng = random.Random(seed_value)
+    today = timezone.localdate()
+    users = []
+    for i in range(users_count):
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email=f'{USERNAME_PREFIX}{i}@prm.com',
+                username=f'{USERNAME_PREFIX}{i}',
+                password=None,
+                is_active=True)
+            seed_user(user, rows, today, rng)
+        users.append(user)
+    return users
+
+
+def seed_user(user, rows, today, rng):
+    contacts = Contact.objects.bulk_create(
+        Contact(owner=user, first_name=f'Contact {i}', last_name='Bench',
+                email=f'contact{i}@bench.com')
+        for i in range(rows['contacts']))
+    activities = Activity.objects.bulk_create(
+        Activity(owner=user, name=f'Activity {i}', description='Bench')
+        for i in range(rows['activities']))
+    Mood.objects.bulk_create(
+        (Mood(owner=user, date=today - timedelta(days=i),
+              mood=rng.randint(Mood.SAD, Mood.HAPPY), description='Bench')
+         for i in range(rows['moods'])),
+        batch_size=BATCH_SIZE)
+
+    def random_date():
+        return today - timedelta(days=rng.randrange(rows['moods']))
+
+    events = Event.objects.bulk_create(
+        (Event(owner=user, title='Bench', location='Bench',
+               date=random_date(), start_time='10:00', end_time='11:00')
+         for i in range(rows['events'])),
+        batch_size=BATCH_SIZE)
+    logs = ActivityLog.objects.bulk_create(
+        (ActivityLog(owner=user, activity=rng.choice(activities),
+                     details='Bench', date=random_date())
+         for i in range(rows['logs'])),
+        batch_size=BATCH_SIZE)
+
+    Event.contacts.through.objects.bulk_create(
+        (Event.contacts.through(event_id=event.pk, contact_id=contact.pk)
+         for event in events
+         for contact in rng.sample(contacts, 2)),
+        batch_size=BATCH_SIZE)
+    ActivityLog.companions.through.objects.bulk_create(
+        (ActivityLog.companions.through(
+            activitylog_id=log.pk, contact_id=contact.pk)
+         for log in logs
+         for contact in rng.sample(contacts, 2)),
+        batch_size=BATCH_SIZE)
+    # Relations inserted in bulk don't send m2m_changed
+    ContactStats.objects.refresh(contact.pk for contact in contacts)
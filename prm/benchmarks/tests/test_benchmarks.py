@@ -0,0 +1,41 @@
+"""Benchmark suite tests"""
+
+# Django
+from django.core.cache import cache
+
+# Django REST Framework
+from rest_framework.test import APITransactionTestCase
+
+# Benchmarks
+from ..runner import (
+    ClientDriver,
+    find_regressions,
+    load_baselines,
+    run_scenario)
+from ..scenarios import SCENARIOS, get_context
+from ..seed import seed
+
+BASELINE = 'client:small'
+
+
+class EndpointsBenchmarkTestCase(APITransactionTestCase):
+    """Every endpoint succeeds on the small data volume without issuing
+       more queries than on the stored baseline. Requests commit as they
+       do on the benchmark command."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = seed(1, 'small')[0]
+        return super().setUp()
+
+    def test_no_query_regressions(self):
+        context = get_context(self.user)
+        driver = ClientDriver(self.user)
+        results = {
+            scenario.name: run_scenario(
+                driver, scenario, context, self.user, requests=2)
+            for scenario in SCENARIOS}
+
+        baseline = load_baselines().get(BASELINE, {})
+        self.assertEqual(set(baseline), set(results))
+        self.assertEqual(find_regressions(results, baseline), [])
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class JournalsConfig(AppConfig):
     name = 'prm.journals'
     verbose_name = 'Journals'
+
+    def ready(self):
+        from . import signals  # noqa F401
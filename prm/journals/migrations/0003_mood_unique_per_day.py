@@ -0,0 +1,35 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:44
+
+from django.db import migrations, models
+
+
+def remove_duplicate_moods(apps, schema_editor):
+    """Keep only the last modified mood of each owner and day"""
+    Mood = apps.get_model('journals', 'Mood')
+    duplicates = (
+        Mood.objects
+        .order_by()
+        .values('owner', 'date')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1))
+    for duplicate in duplicates:
+        moods = Mood.objects.filter(
+            owner=duplicate['owner'], date=duplicate['date'])
+        latest = moods.latest('modified')
+        moods.exclude(pk=latest.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0002_auto_20191004_1633'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_moods, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='mood',
+            constraint=models.UniqueConstraint(fields=('owner', 'date'), name='unique_mood_per_day'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0003_mood_unique_per_day'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['owner', 'date'], name='event_owner_date_idx'),
+        ),
+    ]
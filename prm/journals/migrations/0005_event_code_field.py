@@ -0,0 +1,19 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:49
+
+from django.db import migrations
+import prm.utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0004_event_owner_date_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='code',
+            field=prm.utils.fields.RandomCodeField(blank=True, editable=False, length=8, unique=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0005_event_code_field'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['owner', 'modified'], name='event_owner_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mood',
+            index=models.Index(fields=['owner', 'modified'], name='mood_owner_modified_idx'),
+        ),
+    ]
@@ -5,7 +5,7 @@ from django.db import models
 from ...utils import PRMModel
 
 # Fields
-from django_extensions.db.fields import RandomCharField
+from ...utils.fields import RandomCodeField
 
 
 class Event(PRMModel):
@@ -19,7 +19,7 @@ class Event(PRMModel):
 
     title = models.CharField(max_length=200)
 
-    code = RandomCharField(length=8, blank=False, null=False, unique=True)
+    code = RandomCodeField(length=8, blank=False, null=False, unique=True)
 
     description = models.CharField(max_length=2000, blank=True)
 
@@ -32,3 +32,12 @@ class Event(PRMModel):
     end_time = models.TimeField()
 
     contacts = models.ManyToManyField('relations.Contact')
+
+    class Meta(PRMModel.Meta):
+        indexes = [
+            # Delta sync, see prm.sync
+            models.Index(fields=['owner', 'modified'],
+                         name='event_owner_modified_idx'),
+            models.Index(fields=['owner', 'date'],
+                         name='event_owner_date_idx'),
+        ]
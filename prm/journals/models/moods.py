@@ -1,8 +1,103 @@
 # Django
-from django.db import models
+from django.db import connections, models, router
+from django.utils import timezone
 
 # Models
-from ...utils import PRMModel
+from ...utils import PRMModel, PRMQuerySet
+
+# Signals
+from ...utils.signals import bulk_saved
+
+
+class MoodManager(models.Manager.from_queryset(PRMQuerySet)):
+    """Mood manager"""
+
+    upsert_batch_size = 1000
+
+    def upsert_for_day(self, owner, date, **fields):
+        """Creates the owner's mood for the given date, or overwrites the
+           one already logged that day. On PostgreSQL this is a single
+           INSERT ... ON CONFLICT DO UPDATE statement."""
+        return self.upsert_for_days(owner, [dict(fields, date=date)])[0]
+
+    def upsert_for_days(self, owner, moods):
+        """Upserts a list of mood fields dicts, each holding its `date`.
+           When a date is repeated the last mood wins. Returns the saved
+           moods, one per date."""
+        saved = self._upsert_for_days(owner, moods)
+        # The upsert statement doesn't send post_save
+        bulk_saved.send(sender=self.model, objs=saved)
+        return saved
+
+    def _upsert_for_days(self, owner, moods):
+        to_date = self.model._meta.get_field('date').to_python
+        moods = list({
+            to_date(mood['date']): dict(mood, date=to_date(mood['date']))
+            for mood in moods}.values())
+        db = router.db_for_write(self.model)
+        connection = connections[db]
+        if connection.vendor != 'postgresql':
+            return [
+                self.using(db).update_or_create(
+                    owner=owner, date=fields['date'], defaults={
+                        name: value for name, value in fields.items()
+                        if name != 'date'})[0]
+                for fields in moods]
+
+        saved = []
+        for start in range(0, len(moods), self.upsert_batch_size):
+            saved += self._upsert_batch(
+                connection, db, owner,
+                moods[start:start + self.upsert_batch_size])
+        return saved
+
+    def _upsert_batch(self, connection, db, owner, moods):
+        now = timezone.now()
+        instances = [
+            self.model(owner=owner, created=now, modified=now, **fields)
+            for fields in moods]
+        opts = self.model._meta
+        insert_fields = [f for f in opts.concrete_fields if not f.primary_key]
+        update_names = {name for fields in moods for name in fields}
+        update_names.discard('date')
+        update_names.add('modified')
+        update_columns = sorted(
+            opts.get_field(name).column for name in update_names)
+
+        qn = connection.ops.quote_name
+        row = '({})'.format(', '.join(['%s'] * len(insert_fields)))
+        sql = (
+            'INSERT INTO {table} ({columns}) VALUES {rows} '
+            'ON CONFLICT ({owner}, {date}) DO UPDATE SET {updates} '
+            'RETURNING {returning}'
+        ).format(
+            table=qn(opts.db_table),
+            columns=', '.join(qn(f.column) for f in insert_fields),
+            rows=', '.join([row] * len(instances)),
+            owner=qn(opts.get_field('owner').column),
+            date=qn(opts.get_field('date').column),
+            updates=', '.join(
+                f'{qn(column)} = EXCLUDED.{qn(column)}'
+                for column in update_columns),
+            returning=', '.join(qn(f.column) for f in opts.concrete_fields),
+        )
+        params = [
+            f.get_db_prep_save(getattr(mood, f.attname), connection)
+            for mood in instances
+            for f in insert_fields]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        # Updated rows keep the fields that weren't sent, the instances
+        # are built from what was stored
+        field_names = [f.attname for f in opts.concrete_fields]
+        saved = {}
+        for row in rows:
+            mood = self.model.from_db(db, field_names, row)
+            saved[mood.date] = mood
+        return [saved[mood.date] for mood in instances]
 
 
 class Mood(PRMModel):
@@ -30,21 +125,17 @@ class Mood(PRMModel):
     description = models.TextField()
     date = models.DateField()
 
+    objects = MoodManager()
+
     class Meta:
         ordering = ['date', ]
         get_latest_by = 'date'
-
-    def save(self, force_insert=False, force_update=False, using=None,
-             update_fields=None):
-        """Assures that saving to an existing date will overwrite the data"""
-        date = self.date
-        try:
-            existing_mood = Mood.objects.get(date=date)
-            if self != existing_mood:
-                existing_mood.description = self.description
-                existing_mood.mood = self.mood
-                return existing_mood.save()
-        except Mood.DoesNotExist:
-            pass
-        super().save(force_insert=force_insert, force_update=force_update,
-                     using=using, update_fields=update_fields)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['owner', 'date'], name='unique_mood_per_day'),
+        ]
+        indexes = [
+            # Delta sync, see prm.sync
+            models.Index(fields=['owner', 'modified'],
+                         name='mood_owner_modified_idx'),
+        ]
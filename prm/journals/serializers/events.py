@@ -4,6 +4,9 @@ from rest_framework import serializers
 # Models
 from ..models import Event
 
+# Serializers
+from ...utils.serializers import BulkListSerializer
+
 
 class EventModelSerializer(serializers.ModelSerializer):
     """Event serializer"""
@@ -15,6 +18,7 @@ class EventModelSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Event
+        list_serializer_class = BulkListSerializer
         exclude = ('owner', 'id', 'created', 'modified')
 
     def validate_start_time(self, data):
@@ -0,0 +1,26 @@
+"""Journals signals."""
+
+# Django
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+# Models
+from .models import Mood
+
+# Signals
+from ..utils.signals import bulk_saved
+
+# Stats
+from .stats import invalidate_mood_stats
+
+
+@receiver([post_save, post_delete], sender=Mood)
+def invalidate_cached_mood_stats(sender, instance, **kwargs):
+    """Stats must include the moods logged since they were cached"""
+    invalidate_mood_stats(instance.owner_id)
+
+
+@receiver(bulk_saved, sender=Mood)
+def invalidate_bulk_saved_mood_stats(sender, objs, **kwargs):
+    for owner_id in {mood.owner_id for mood in objs}:
+        invalidate_mood_stats(owner_id)
@@ -0,0 +1,117 @@
+"""Mood statistics.
+
+Averages, distributions and buckets are aggregated by the database, the
+rolling average is a window function and streaks are computed over the
+dates fetched along with it, so a request costs three queries no matter
+how many moods are in the range. Results are cached per user until the
+user logs a mood, see `invalidate_mood_stats`.
+"""
+
+# Standard Library
+from collections import OrderedDict
+from datetime import timedelta
+
+# Django
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Q, Window
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.db.models.expressions import RowRange
+
+# Models
+from .models import Mood
+
+# Versions
+from ..utils.versions import bump_version_on_commit, get_version
+
+BUCKETS = {
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+# Moods averaged by the rolling average
+ROLLING_WINDOW = 7
+
+STATS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_stats_version_key(user_pk):
+    return f'mood_stats_version:{user_pk}'
+
+
+def invalidate_mood_stats(user_pk):
+    """Makes every cached stats of the user stale by changing the version
+       their keys are built with, right away and once committed"""
+    bump_version_on_commit(get_stats_version_key(user_pk))
+
+
+def get_mood_stats(user, from_date=None, to_date=None, bucket='week'):
+    """Returns the cached stats of the user moods between both dates"""
+    version = get_version(get_stats_version_key(user.pk))
+    key = f'mood_stats:{user.pk}:{version}:{from_date}:{to_date}:{bucket}'
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_mood_stats(user, from_date, to_date, bucket)
+        cache.set(key, stats, STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def compute_mood_stats(user, from_date, to_date, bucket):
+    queryset = Mood.objects.filter(owner=user).order_by()
+    if from_date and to_date:
+        queryset = queryset.filter(date__gte=from_date, date__lte=to_date)
+
+    totals = queryset.aggregate(
+        average=Avg('mood'),
+        count=Count('id'),
+        **{label: Count('id', filter=Q(mood=value))
+           for value, label in Mood.MOOD_CHOICES})
+
+    buckets = (
+        queryset
+        .annotate(period=BUCKETS[bucket]('date'))
+        .values('period')
+        .annotate(average=Avg('mood'), count=Count('id'))
+        .order_by('period'))
+
+    rolling = (
+        queryset
+        .annotate(
+            period=BUCKETS[bucket]('date'),
+            rolling_average=Window(
+                expression=Avg('mood'),
+                order_by=F('date').asc(),
+                frame=RowRange(start=-(ROLLING_WINDOW - 1), end=0)))
+        .order_by('date')
+        .values_list('date', 'period', 'rolling_average'))
+    rolling = list(rolling)
+
+    # Rolling average as of the last mood of every bucket
+    rolling_buckets = OrderedDict()
+    for _, period, average in rolling:
+        rolling_buckets[period] = average
+
+    return {
+        'average': totals.pop('average'),
+        'count': totals.pop('count'),
+        'distribution': totals,
+        'buckets': list(buckets),
+        'rolling_average': [
+            {'period': period, 'average': average}
+            for period, average in rolling_buckets.items()],
+        **get_streaks([date for date, _, _ in rolling]),
+    }
+
+
+def get_streaks(dates):
+    """Longest and last run of consecutive days with a logged mood, given
+       the sorted dates"""
+    longest = current = 0
+    previous = None
+    for date in dates:
+        if previous is not None and date - previous == timedelta(days=1):
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        previous = date
+    return {'longest_streak': longest, 'last_streak': current}
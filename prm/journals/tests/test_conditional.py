@@ -0,0 +1,109 @@
+"""Conditional requests tests"""
+
+# Standard Library
+from datetime import date, timedelta
+from unittest.mock import patch
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+
+# Models
+from ..models import Mood
+
+# Versions
+from ...utils import versions
+
+# Utils
+from .test_moods import create_user
+
+
+class ConditionalGetTestCase(APITransactionTestCase):
+    """Unchanged resources are answered with 304 without being read"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user('test_user')
+        self.client.force_authenticate(self.user)
+        self.mood = Mood.objects.create(
+            owner=self.user, mood=Mood.GOOD, description='Test mood',
+            date=date(2019, 10, 1))
+        return super().setUp()
+
+    def test_not_modified(self):
+        response = self.client.get('/moods/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertIn('private', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/moods/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(
+            [query for query in context.captured_queries
+             if Mood._meta.db_table in query['sql']])
+
+    def test_validators_differ_by_resource(self):
+        etag = self.client.get('/moods/')['ETag']
+        response = self.client.get(
+            '/moods/2019-10-01/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        other = create_user('other_user')
+        self.client.force_authenticate(other)
+        response = self.client.get('/moods/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_modified_after_write(self):
+        etag = self.client.get('/moods/')['ETag']
+        self.mood.mood = Mood.SAD
+        self.mood.save()
+        response = self.client.get('/moods/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['mood'], Mood.SAD)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        response = self.client.get('/moods/')
+        last_modified = response['Last-Modified']
+        response = self.client.get(
+            '/moods/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since_missing_object(self):
+        """Dates are only answered for the user's existing objects"""
+        future = 'Fri, 01 Jan 2100 00:00:00 GMT'
+        response = self.client.get(
+            '/moods/2019-10-02/', HTTP_IF_MODIFIED_SINCE=future)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(create_user('other_user'))
+        response = self.client.get(
+            '/moods/2019-10-01/', HTTP_IF_MODIFIED_SINCE=future)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            '/moods/2019-10-01/', HTTP_IF_MODIFIED_SINCE=future)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bumped_once_per_transaction(self):
+        """Right away and on commit, whatever the number of changes"""
+        def count_bumps(count):
+            for day in range(1, count + 1):
+                Mood.objects.create(
+                    owner=self.user, mood=Mood.GOOD, description='Test',
+                    date=self.mood.date + timedelta(days=day))
+            with patch.object(versions, 'bump_version',
+                              wraps=versions.bump_version) as bump:
+                Mood.objects.filter(
+                    owner=self.user, date__gt=self.mood.date).delete()
+            return bump.call_count
+
+        self.assertEqual(count_bumps(1), count_bumps(20))
@@ -0,0 +1,94 @@
+"""Mood tests"""
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Mood
+
+MOOD_DATA = {
+    'mood': Mood.GOOD,
+    'description': 'Test mood',
+    'date': '2019-10-01',
+}
+
+
+def create_user(username):
+    return User.objects.create_user(
+        email=f'{username}@user.com',
+        username=username,
+        password='Testpassword123',
+        is_active=True)
+
+
+class MoodUpsertTestCase(APITestCase):
+    """Logging a mood creates or overwrites the owner's mood of the day"""
+
+    def setUp(self):
+        self.user = create_user('test_user')
+        self.client.force_authenticate(self.user)
+        return super().setUp()
+
+    def test_create_mood(self):
+        response = self.client.post('/moods/', MOOD_DATA)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mood = Mood.objects.get(owner=self.user)
+        self.assertEqual(mood.mood, Mood.GOOD)
+        self.assertEqual(response.data['mood'], Mood.GOOD)
+
+    def test_same_day_overwrites_mood(self):
+        """A second mood on the same day replaces the first one"""
+        self.client.post('/moods/', MOOD_DATA)
+        created = Mood.objects.get(owner=self.user).created
+
+        payload = {**MOOD_DATA, 'mood': Mood.SAD, 'description': 'Updated'}
+        response = self.client.post('/moods/', payload)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Mood.objects.count(), 1)
+
+        mood = Mood.objects.get(owner=self.user)
+        self.assertEqual(mood.mood, Mood.SAD)
+        self.assertEqual(mood.description, 'Updated')
+        self.assertEqual(mood.created, created)
+
+    def test_moods_are_scoped_by_owner(self):
+        """Two users can log their mood on the same day"""
+        other_user = create_user('other_user')
+        Mood.objects.upsert_for_day(
+            owner=other_user, date=MOOD_DATA['date'], mood=Mood.HAPPY,
+            description='Other mood')
+
+        response = self.client.post('/moods/', MOOD_DATA)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Mood.objects.count(), 2)
+        self.assertEqual(
+            Mood.objects.get(owner=other_user).mood, Mood.HAPPY)
+
+    def test_upsert_returns_stored_fields(self):
+        """Fields left out of an overwrite keep their stored values"""
+        first = Mood.objects.upsert_for_day(
+            owner=self.user, date=MOOD_DATA['date'], mood=Mood.GOOD,
+            description='Test mood', hightlights='Test highlight')
+        mood = Mood.objects.upsert_for_day(
+            owner=self.user, date=MOOD_DATA['date'], mood=Mood.SAD)
+        self.assertEqual(mood.pk, first.pk)
+        self.assertEqual(mood.mood, Mood.SAD)
+        self.assertEqual(mood.hightlights, 'Test highlight')
+        self.assertEqual(mood.description, 'Test mood')
+        self.assertEqual(mood.created, first.created)
+
+    def test_bulk_upsert_moods(self):
+        """Bulk logged moods overwrite the days that already have one"""
+        self.client.post('/moods/', MOOD_DATA)
+        payload = [
+            {**MOOD_DATA, 'mood': Mood.SAD},
+            {**MOOD_DATA, 'date': '2019-10-02'},
+        ]
+        response = self.client.post('/moods/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(Mood.objects.count(), 2)
+        self.assertEqual(
+            Mood.objects.get(date=MOOD_DATA['date']).mood, Mood.SAD)
@@ -0,0 +1,70 @@
+"""Keyset pagination tests"""
+
+# Standard Library
+from datetime import date, timedelta
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Mood
+
+MOODS = 25
+
+
+class KeysetPaginationTestCase(APITestCase):
+    """Clients opt in to cursor pagination with ?pagination=cursor"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+
+        self.first_day = date(2019, 10, 1)
+        Mood.objects.bulk_create(
+            Mood(owner=self.user, date=self.first_day + timedelta(days=i),
+                 mood=Mood.GOOD, description='Test')
+            for i in range(MOODS))
+        return super().setUp()
+
+    def walk_pages(self, params):
+        """Follow the next links, returning every date and page visited"""
+        dates = []
+        pages = 0
+        response = self.client.get('/moods/', params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            dates += [mood['date'] for mood in response.data['results']]
+            pages += 1
+            if not response.data['next']:
+                return dates, pages
+            response = self.client.get(response.data['next'])
+
+    def test_limit_offset_by_default(self):
+        response = self.client.get('/moods/', {'limit': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], MOODS)
+
+    def test_cursor_pagination_visits_every_mood(self):
+        dates, pages = self.walk_pages({'pagination': 'cursor', 'limit': 10})
+        self.assertEqual(pages, 3)
+        self.assertEqual(dates, [
+            str(self.first_day + timedelta(days=i)) for i in range(MOODS)])
+
+    def test_cursor_pagination_on_date_range(self):
+        params = {
+            'pagination': 'cursor',
+            'limit': 4,
+            'from': str(self.first_day + timedelta(days=5)),
+            'to': str(self.first_day + timedelta(days=14)),
+        }
+        dates, pages = self.walk_pages(params)
+        self.assertEqual(pages, 3)
+        self.assertEqual(dates, [
+            str(self.first_day + timedelta(days=i)) for i in range(5, 15)])
@@ -0,0 +1,77 @@
+"""Journals query count tests"""
+
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ...relations.models import Contact
+from ..models import Event
+
+ROWS = 20
+
+
+class ListQueryCountTestCase(APITestCase):
+    """List endpoints must issue the same number of queries no matter how
+    many rows are on the page"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+
+        contacts = [
+            Contact.objects.create(
+                owner=self.user, first_name=f'Contact {i}', last_name='Test')
+            for i in range(3)]
+
+        for i in range(ROWS):
+            event = Event.objects.create(
+                owner=self.user, title=f'Event {i}', location='Test',
+                date='2019-10-01', start_time='10:00', end_time='11:00')
+            event.contacts.set(contacts)
+        return super().setUp()
+
+    def count_queries(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']),
+                         min(params['limit'], ROWS))
+        return len(context.captured_queries)
+
+    def test_events_list(self):
+        """Event contacts are prefetched"""
+        self.assertEqual(self.count_queries('/events/', {'limit': 1}),
+                         self.count_queries('/events/', {'limit': ROWS}))
+
+    def test_events_date_range_list(self):
+        """Date range filtering keeps the prefetched contacts"""
+        params = {'from': '2019-09-01', 'to': '2019-11-01'}
+        self.assertEqual(
+            self.count_queries('/events/', {**params, 'limit': 1}),
+            self.count_queries('/events/', {**params, 'limit': ROWS}))
+
+    def test_events_bulk_create(self):
+        """Created events are serialized without querying their contacts"""
+        def count_queries(count):
+            event = {
+                'title': 'New', 'location': 'Test', 'date': '2019-10-01',
+                'start_time': '10:00', 'end_time': '11:00',
+            }
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    '/events/bulk/', [event] * count, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data[0]['contacts'], [])
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries(1), count_queries(ROWS))
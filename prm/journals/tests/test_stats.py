@@ -0,0 +1,108 @@
+"""Mood stats tests"""
+
+# Standard Library
+from datetime import date, timedelta
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+
+# Models
+from ..models import Mood
+
+# Stats
+from ..stats import get_stats_version_key
+
+# Utils
+from .test_moods import create_user
+
+
+class MoodStatsTestCase(APITransactionTestCase):
+    """Stats are aggregated on the database and cached until moods change"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user('test_user')
+        self.client.force_authenticate(self.user)
+        start = date(2019, 10, 1)
+        # Three days in a row, a gap, then two more
+        for offset, mood in ((0, Mood.HAPPY), (1, Mood.GOOD), (2, Mood.SAD),
+                             (5, Mood.GOOD), (6, Mood.GOOD)):
+            Mood.objects.create(
+                owner=self.user, mood=mood, description='Test mood',
+                date=start + timedelta(days=offset))
+        other = create_user('other_user')
+        Mood.objects.create(
+            owner=other, mood=Mood.SAD, description='Test mood', date=start)
+        return super().setUp()
+
+    def test_stats(self):
+        response = self.client.get('/moods/stats/', {'bucket': 'month'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 5)
+        self.assertAlmostEqual(response.data['average'], 3.6)
+        self.assertEqual(response.data['distribution'], {
+            'happy': 1, 'good': 3, 'neutral': 0, 'bad': 0, 'sad': 1})
+        self.assertEqual(len(response.data['buckets']), 1)
+        self.assertEqual(response.data['buckets'][0]['count'], 5)
+        self.assertEqual(response.data['longest_streak'], 3)
+        self.assertEqual(response.data['last_streak'], 2)
+        rolling = response.data['rolling_average']
+        self.assertEqual(len(rolling), 1)
+        self.assertAlmostEqual(rolling[0]['average'], 3.6)
+
+    def test_rolling_average_per_bucket(self):
+        """As of the last mood of every week"""
+        response = self.client.get('/moods/stats/', {'bucket': 'week'})
+        rolling = response.data['rolling_average']
+        self.assertEqual(
+            [bucket['period'] for bucket in rolling],
+            [bucket['period'] for bucket in response.data['buckets']])
+        self.assertAlmostEqual(rolling[0]['average'], 3.5)
+        self.assertAlmostEqual(rolling[1]['average'], 3.6)
+
+    def test_stats_between_dates(self):
+        response = self.client.get(
+            '/moods/stats/', {'from': '2019-10-05', 'to': '2019-10-31'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['longest_streak'], 2)
+
+    def test_stats_are_cached(self):
+        self.client.get('/moods/stats/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/moods/stats/')
+        self.assertFalse(any(
+            Mood._meta.db_table in query['sql']
+            for query in queries.captured_queries))
+        self.assertEqual(response.data['count'], 5)
+
+    def test_mood_writes_invalidate_stats(self):
+        self.client.get('/moods/stats/')
+        self.client.post('/moods/', {
+            'mood': Mood.HAPPY, 'description': 'Test mood',
+            'date': '2019-10-08'})
+        response = self.client.get('/moods/stats/')
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(response.data['last_streak'], 3)
+
+    def test_evicted_version_invalidates_stats(self):
+        """Versions evicted from the cache never come back to old ones"""
+        for day in (8, 9):
+            self.client.post('/moods/', {
+                'mood': Mood.HAPPY, 'description': 'Test mood',
+                'date': f'2019-10-0{day}'})
+            response = self.client.get('/moods/stats/')
+            cache.delete(get_stats_version_key(self.user.pk))
+        self.assertEqual(response.data['count'], 7)
+
+    def test_invalid_params(self):
+        response = self.client.get('/moods/stats/', {'from': '2019-10-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/moods/stats/', {'bucket': 'year'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
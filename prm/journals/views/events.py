@@ -1,3 +1,6 @@
+# Django
+from django.db.models import Prefetch
+
 # Django REST Framework
 from rest_framework import mixins, viewsets
 
@@ -6,6 +9,7 @@ from ..serializers import EventModelSerializer
 
 # Models
 from ..models import Event
+from prm.relations.models import Contact
 
 # Permissions
 from rest_framework.permissions import IsAuthenticated
@@ -16,10 +20,19 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg.openapi import Parameter, IN_QUERY, TYPE_STRING
 
 # Mixins
-from ...utils.mixins import ListModelFilterBetweenDatesMixin
+from ...utils.mixins import (
+    BulkModelMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ListModelFilterBetweenDatesMixin,
+    OptimizedQuerysetMixin)
 
 
-class EventsViewSet(ListModelFilterBetweenDatesMixin,
+class EventsViewSet(ConditionalGetMixin,
+                    CachedResponseMixin,
+                    OptimizedQuerysetMixin,
+                    BulkModelMixin,
+                    ListModelFilterBetweenDatesMixin,
                     mixins.CreateModelMixin,
                     mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
@@ -31,8 +44,16 @@ class EventsViewSet(ListModelFilterBetweenDatesMixin,
 
     lookup_field = 'code'
 
+    prefetch_related_lookups = {
+        'default': (
+            Prefetch('contacts', queryset=Contact.objects.only('id', 'code')),
+        ),
+        'destroy': (),
+    }
+
     def get_queryset(self):
-        return Event.objects.filter(owner=self.request.user)
+        return self.optimize_queryset(
+            Event.objects.filter(owner=self.request.user))
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
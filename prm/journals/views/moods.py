@@ -1,5 +1,7 @@
 # Django REST Framework
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 # Serializers
 from ..serializers import MoodModelSerializer
@@ -16,10 +18,23 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg.openapi import Parameter, IN_QUERY, TYPE_STRING
 
 # Mixins
-from ...utils.mixins import ListModelFilterBetweenDatesMixin
+from ...utils.mixins import (
+    BulkModelMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ListModelFilterBetweenDatesMixin)
 
+# Validators
+from ...utils.validators import validate_date
 
-class MoodsViewSet(ListModelFilterBetweenDatesMixin,
+# Stats
+from ..stats import BUCKETS, get_mood_stats
+
+
+class MoodsViewSet(ConditionalGetMixin,
+                   CachedResponseMixin,
+                   BulkModelMixin,
+                   ListModelFilterBetweenDatesMixin,
                    mixins.CreateModelMixin,
                    mixins.RetrieveModelMixin,
                    viewsets.GenericViewSet):
@@ -33,7 +48,19 @@ class MoodsViewSet(ListModelFilterBetweenDatesMixin,
         return Mood.objects.filter(owner=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+        """Logging a mood for a day that already has one overwrites it"""
+        data = serializer.validated_data.copy()
+        serializer.instance = Mood.objects.upsert_for_day(
+            owner=self.request.user, date=data.pop('date'), **data)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Logs many moods at once, overwriting the ones of existing days"""
+        return self.bulk_create(request)
+
+    def perform_bulk_create(self, serializer):
+        serializer.instance = Mood.objects.upsert_for_days(
+            self.request.user, serializer.validated_data)
 
     @swagger_auto_schema(manual_parameters=[
         Parameter('from', IN_QUERY,
@@ -43,3 +70,39 @@ class MoodsViewSet(ListModelFilterBetweenDatesMixin,
     ])
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(manual_parameters=[
+        Parameter('from', IN_QUERY,
+                  description='Beginning date of moods', type=TYPE_STRING),
+        Parameter('to', IN_QUERY,
+                  description='End date of moods', type=TYPE_STRING),
+        Parameter('bucket', IN_QUERY, enum=sorted(BUCKETS),
+                  description='Period moods are averaged by, defaults to '
+                              'week', type=TYPE_STRING),
+    ])
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Mood averages, distribution, streaks and rolling average,
+           optionally between the 'from' and 'to' dates"""
+        from_date = request.query_params.get('from', None)
+        to_date = request.query_params.get('to', None)
+        bucket = request.query_params.get('bucket', 'week')
+
+        if bool(from_date) ^ bool(to_date):
+            return Response(
+                {'message': "'from' and 'to' params must come together"},
+                status=status.HTTP_400_BAD_REQUEST)
+        if bucket not in BUCKETS:
+            return Response(
+                {'message': f"'bucket' must be one of {', '.join(BUCKETS)}"},
+                status=status.HTTP_400_BAD_REQUEST)
+        if from_date and to_date:
+            try:
+                validate_date(from_date)
+                validate_date(to_date)
+            except ValueError as err:
+                return Response({'message': err.args[0]},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            get_mood_stats(request.user, from_date, to_date, bucket))
@@ -1 +1,2 @@
 from .middleware import *
+from .instrumentation import *
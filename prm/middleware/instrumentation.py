@@ -0,0 +1,340 @@
+"""Request instrumentation.
+
+Records the queries, database time, serialization time, render time and
+response size of every request. They're sent back on the Server-Timing
+header, logged as a JSON line on the `prm.requests` logger and aggregated
+by route on histograms, exposed in the Prometheus text format by
+`metrics_view`. Each process adds its observations to histograms shared
+through the cache every METRICS_FLUSH_INTERVAL seconds, so any of them
+exports the ones of every process.
+
+Everything is disabled unless INSTRUMENTATION_ENABLED is set, the
+middleware then removes itself from the chain.
+"""
+
+# Standard Library
+import hashlib
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+# Django
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.urls import get_resolver
+from django.utils.crypto import constant_time_compare
+
+# Django REST Framework
+from rest_framework.serializers import BaseSerializer
+
+# Mixins
+from ..utils.mixins import CachedResponseMixin, get_response_cache_metrics
+
+# Metrics
+from ..utils.metrics import add_member, get_counters, get_members, increment
+
+logger = logging.getLogger('prm.requests')
+
+# Histogram upper bounds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Scale of the sums of durations
+MICROSECONDS = 10 ** 6
+
+_current = threading.local()
+
+# Monotonic time of the last flush of the histograms of this process
+_flushed = {'at': time.monotonic()}
+_flush_lock = threading.Lock()
+
+
+class Histogram:
+    """Cumulative histogram by labels, shared by every process.
+
+    Observations are counted in memory until `flush` adds them to the
+    counters in the cache. Sums are kept as integers, in units of
+    1 / `scale`.
+    """
+
+    def __init__(self, name, description, buckets, scale=1):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.scale = scale
+        # Counts by bucket, plus the overflow, sum and count by labels
+        self.values = {}
+        # Labels known to be on the shared set
+        self.labels = None
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self.lock:
+            counts, total = self.values.get(
+                labels, ([0] * (len(self.buckets) + 1), 0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self.values[labels] = (counts, total + value)
+
+    def get_counter_names(self, labels):
+        """Names of the bucket counters and the sum of the labels"""
+        digest = hashlib.md5(repr(labels).encode()).hexdigest()
+        prefix = f'histogram.{self.name}.{digest}'
+        return (
+            [f'{prefix}.{index}' for index in range(len(self.buckets) + 1)],
+            f'{prefix}.sum')
+
+    def flush(self):
+        """Adds the observations of this process to the shared ones"""
+        with self.lock:
+            values, self.values = self.values, {}
+        if self.labels is None:
+            self.labels = get_members(f'histogram.{self.name}')
+        for labels, (counts, total) in values.items():
+            if labels not in self.labels:
+                add_member(f'histogram.{self.name}', labels)
+                self.labels.add(labels)
+            buckets, total_name = self.get_counter_names(labels)
+            for name, count in zip(buckets, counts):
+                if count:
+                    increment(name, count)
+            increment(total_name, round(total * self.scale))
+
+    def export(self):
+        """Lines in the Prometheus text format"""
+        lines = [f'# HELP {self.name} {self.description}',
+                 f'# TYPE {self.name} histogram']
+        names = {
+            labels: self.get_counter_names(labels)
+            for labels in get_members(f'histogram.{self.name}')}
+        values = get_counters([
+            name for buckets, total_name in names.values()
+            for name in buckets + [total_name]])
+        for labels, (buckets, total_name) in sorted(names.items()):
+            label_text = ','.join(
+                f'{name}="{value}"' for name, value in labels)
+            cumulative = 0
+            for bound, name in zip(self.buckets + ('+Inf',), buckets):
+                cumulative += values[name]
+                lines.append(
+                    f'{self.name}_bucket{{{label_text},le="{bound}"}} '
+                    f'{cumulative}')
+            lines.append(
+                f'{self.name}_sum{{{label_text}}} '
+                f'{values[total_name] / self.scale}')
+            lines.append(f'{self.name}_count{{{label_text}}} {cumulative}')
+        return lines
+
+
+HISTOGRAMS = {
+    'duration': Histogram(
+        'prm_request_duration_seconds', 'Request duration',
+        DURATION_BUCKETS, MICROSECONDS),
+    'db': Histogram(
+        'prm_request_db_seconds', 'Time spent on queries by request',
+        DURATION_BUCKETS, MICROSECONDS),
+    'serialize': Histogram(
+        'prm_request_serialize_seconds',
+        'Time spent on serializers by request, queries included',
+        DURATION_BUCKETS, MICROSECONDS),
+    'queries': Histogram(
+        'prm_request_queries', 'Queries by request', QUERY_BUCKETS),
+    'size': Histogram(
+        'prm_response_size_bytes', 'Response body size', SIZE_BUCKETS),
+}
+
+
+def flush_histograms(force=False):
+    """Flushes the histograms if METRICS_FLUSH_INTERVAL passed"""
+    with _flush_lock:
+        now = time.monotonic()
+        if not force and now - _flushed['at'] < (
+                settings.METRICS_FLUSH_INTERVAL):
+            return
+        _flushed['at'] = now
+    for histogram in HISTOGRAMS.values():
+        histogram.flush()
+
+
+class RequestMetrics:
+    """Metrics of a request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        # Nested serializers are counted once, on the outermost one
+        self.serializing = False
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+
+def timed_serializer_data(data):
+    """Wraps `BaseSerializer.data`, DRF has no hook around serialization"""
+
+    def wrapper(serializer):
+        metrics = getattr(_current, 'metrics', None)
+        if metrics is None or metrics.serializing:
+            return data(serializer)
+        metrics.serializing = True
+        start = time.perf_counter()
+        try:
+            return data(serializer)
+        finally:
+            metrics.serialize += time.perf_counter() - start
+            metrics.serializing = False
+
+    wrapper.timed = True
+    return wrapper
+
+
+def instrument_serializers():
+    if not getattr(BaseSerializer.data.fget, 'timed', False):
+        BaseSerializer.data = property(
+            timed_serializer_data(BaseSerializer.data.fget))
+
+
+def get_route(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unmatched'
+
+
+class InstrumentationMiddleware:
+    """Measures each request, see `prm.middleware.instrumentation`"""
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        instrument_serializers()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        _current.metrics = metrics
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(
+                        metrics.record_query))
+                response = self.get_response(request)
+        finally:
+            _current.metrics = None
+
+        duration = time.perf_counter() - metrics.start
+        size = (
+            None if getattr(response, 'streaming', False)
+            else len(response.content))
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db * 1000:.1f};desc="{metrics.queries} '
+            f'queries"',
+            f'serialize;dur={metrics.serialize * 1000:.1f}',
+            f'render;dur={metrics.render * 1000:.1f}',
+            f'total;dur={duration * 1000:.1f}',
+        ])
+        self.record(request, response, metrics, duration, size)
+        return response
+
+    def process_template_response(self, request, response):
+        """Responses of the API views are rendered after the view
+           returns, the render time is taken around it"""
+        metrics = getattr(_current, 'metrics', None)
+        if metrics is not None:
+            start = time.perf_counter()
+
+            def stop_timer(response):
+                metrics.render += time.perf_counter() - start
+
+            response.add_post_render_callback(stop_timer)
+        return response
+
+    def record(self, request, response, metrics, duration, size):
+        route = get_route(request)
+        labels = (('route', route), ('method', request.method))
+        HISTOGRAMS['duration'].observe(labels, duration)
+        HISTOGRAMS['db'].observe(labels, metrics.db)
+        HISTOGRAMS['serialize'].observe(labels, metrics.serialize)
+        HISTOGRAMS['queries'].observe(labels, metrics.queries)
+        if size is not None:
+            HISTOGRAMS['size'].observe(labels, size)
+        flush_histograms()
+
+        logger.info(json.dumps({
+            'route': route,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 1),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db * 1000, 1),
+            'serialize_ms': round(metrics.serialize * 1000, 1),
+            'render_ms': round(metrics.render * 1000, 1),
+            'size': size,
+        }))
+
+
+def iter_url_patterns(resolver):
+    for pattern in resolver.url_patterns:
+        if hasattr(pattern, 'url_patterns'):
+            yield from iter_url_patterns(pattern)
+        else:
+            yield pattern
+
+
+def get_cached_endpoints():
+    """Basenames of the viewsets caching their responses"""
+    basenames = set()
+    for pattern in iter_url_patterns(get_resolver()):
+        view_class = getattr(pattern.callback, 'cls', None)
+        if view_class and issubclass(view_class, CachedResponseMixin):
+            basenames.add(pattern.callback.initkwargs.get('basename'))
+    basenames.discard(None)
+    return sorted(basenames)
+
+
+def export_response_cache_counters():
+    """Response cache counters shared by every process, see
+       CachedResponseMixin"""
+    basenames = get_cached_endpoints()
+    counters = get_response_cache_metrics(basenames)
+    lines = []
+    for counter in ('hits', 'misses'):
+        name = f'prm_response_cache_{counter}_total'
+        lines += [f'# HELP {name} Response cache {counter}',
+                  f'# TYPE {name} counter']
+        for basename in basenames:
+            value = counters[f'response_cache.{basename}.{counter}']
+            lines.append(f'{name}{{endpoint="{basename}"}} {value}')
+    return lines
+
+
+def metrics_view(request):
+    """Histograms of every process in the Prometheus text format, along
+       with the latest observations of this one. Requires the
+       METRICS_TOKEN as bearer token."""
+    token = settings.METRICS_TOKEN
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    if (not settings.INSTRUMENTATION_ENABLED or not token
+            or not constant_time_compare(authorization, f'Bearer {token}')):
+        raise Http404
+
+    flush_histograms(force=True)
+    lines = []
+    for histogram in HISTOGRAMS.values():
+        lines += histogram.export()
+    lines += export_response_cache_counters()
+    return HttpResponse(
+        '\n'.join(lines) + '\n',
+        content_type='text/plain; version=0.0.4; charset=utf-8')
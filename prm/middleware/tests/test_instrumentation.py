@@ -0,0 +1,94 @@
+"""Request instrumentation tests"""
+
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ...relations.models import Contact
+
+# Instrumentation
+from ..instrumentation import MICROSECONDS, Histogram
+
+
+@override_settings(INSTRUMENTATION_ENABLED=True, METRICS_TOKEN='secret')
+class InstrumentationTestCase(APITestCase):
+    """Requests are measured and aggregated on /metrics"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        Contact.objects.create(
+            owner=self.user, first_name='Contact', last_name='Test')
+        return super().setUp()
+
+    def get_timings(self, response):
+        timings = {}
+        for metric in response['Server-Timing'].split(', '):
+            name, duration = metric.split(';')[:2]
+            timings[name] = float(duration.split('=')[1])
+        return timings
+
+    def test_server_timing(self):
+        with self.assertLogs('prm.requests', 'INFO') as logs:
+            response = self.client.get('/contacts/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = self.get_timings(response)
+        self.assertEqual(
+            set(timings), {'db', 'serialize', 'render', 'total'})
+        self.assertIn('queries"', response['Server-Timing'])
+        self.assertGreater(timings['serialize'], 0)
+        self.assertIn('"route": "relations:contacts-list"', logs.output[0])
+        self.assertIn('"queries": ', logs.output[0])
+
+    def test_metrics(self):
+        self.client.get('/contacts/')
+        response = self.client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = response.content.decode()
+        self.assertIn(
+            'prm_request_queries_count{route="relations:contacts-list",'
+            'method="GET"}', content)
+        self.assertIn(
+            'prm_response_cache_misses_total{endpoint="contacts"}', content)
+
+    def test_histograms_shared_by_processes(self):
+        cache.clear()
+        labels = (('route', 'test'), ('method', 'GET'))
+        processes = [
+            Histogram('prm_test_seconds', 'Test', (0.1, 1), MICROSECONDS)
+            for i in range(2)]
+        processes[0].observe(labels, 0.05)
+        processes[1].observe(labels, 0.5)
+        processes[1].observe(labels, 5)
+        for histogram in processes:
+            histogram.flush()
+
+        lines = processes[0].export()
+        label_text = 'route="test",method="GET"'
+        for line in [
+                f'prm_test_seconds_bucket{{{label_text},le="0.1"}} 1',
+                f'prm_test_seconds_bucket{{{label_text},le="1"}} 2',
+                f'prm_test_seconds_bucket{{{label_text},le="+Inf"}} 3',
+                f'prm_test_seconds_sum{{{label_text}}} 5.55',
+                f'prm_test_seconds_count{{{label_text}}} 3']:
+            self.assertIn(line, lines)
+
+    def test_metrics_require_token(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get('/contacts/')
+        self.assertNotIn('Server-Timing', response)
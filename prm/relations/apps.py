@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RelationsConfig(AppConfig):
     name = 'prm.relations'
     verbose_name = 'Relations'
+
+    def ready(self):
+        from . import signals  # noqa F401
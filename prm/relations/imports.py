@@ -0,0 +1,272 @@
+"""Contacts import.
+
+Parses CSV and vCard files as a pipeline of generators, so files are never
+loaded in memory as a whole. Rows are validated in chunks, contacts whose
+email or phone number are already on the account (or earlier in the file)
+are skipped and the rest are inserted with a single bulk query per chunk.
+"""
+
+# Standard Library
+import codecs
+import csv
+import re
+from itertools import islice
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+# Models
+from .models import Contact
+
+# Serializers
+from .serializers import ContactModelSerializer
+
+CHUNK_SIZE = 500
+
+# Errors kept on the import result, the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+IMPORT_FORMATS = {
+    'csv': ('.csv',),
+    'vcard': ('.vcf', '.vcard'),
+}
+
+# CSV headers other CRMs export, after normalization, by contact field
+CSV_HEADER_ALIASES = {
+    'first_name': ('first_name', 'given_name'),
+    'middle_name': ('middle_name', 'additional_name'),
+    'last_name': ('last_name', 'family_name', 'surname'),
+    'nickname': ('nickname',),
+    'email': ('email', 'e_mail', 'email_address', 'e_mail_address',
+              'e_mail_1_value', 'email_1'),
+    'phone_number': ('phone_number', 'phone', 'mobile', 'mobile_phone',
+                     'telephone', 'phone_1_value'),
+    'company': ('company', 'organization', 'organization_1_name'),
+    'position': ('position', 'job_title', 'title',
+                 'organization_1_title'),
+    'address': ('address', 'home_address', 'address_1_formatted'),
+    'birth_date': ('birth_date', 'birthday'),
+    'biography': ('biography', 'notes', 'note'),
+    'met': ('met', 'how_we_met'),
+}
+
+
+def get_import_format(filename):
+    """Returns the import format matching the file extension, if any"""
+    filename = filename.lower()
+    for import_format, extensions in IMPORT_FORMATS.items():
+        if filename.endswith(extensions):
+            return import_format
+    return None
+
+
+def normalize_header(header):
+    return re.sub(r'[^a-z0-9]+', '_', header.strip().lower()).strip('_')
+
+
+def normalize_phone_number(phone_number):
+    return re.sub(r'[\s().-]', '', phone_number)
+
+
+def normalize_birth_date(birth_date):
+    """Accepts the basic ISO format (YYYYMMDD) vCards use"""
+    if re.fullmatch(r'\d{8}', birth_date):
+        return f'{birth_date[:4]}-{birth_date[4:6]}-{birth_date[6:]}'
+    return birth_date
+
+
+def decode_lines(file):
+    """Decodes the lines of a binary file, skipping the UTF-8 BOM"""
+    return codecs.iterdecode(file, 'utf-8-sig')
+
+
+def parse_csv(lines):
+    """Yields a contact fields dict per CSV row"""
+    reader = csv.reader(lines)
+    headers = [normalize_header(header) for header in next(reader, [])]
+
+    columns = {}
+    for field, aliases in CSV_HEADER_ALIASES.items():
+        for alias in aliases:
+            if alias in headers:
+                columns[field] = headers.index(alias)
+                break
+
+    for row in reader:
+        if not any(row):
+            continue
+        yield {
+            field: row[index].strip()
+            for field, index in columns.items()
+            if index < len(row) and row[index].strip()}
+
+
+def unfold_vcard_lines(lines):
+    """Joins the continuation lines of vCard properties (RFC 6350 3.2)"""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def unescape_vcard_value(value):
+    return (value.replace('\\n', '\n').replace('\\N', '\n')
+            .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def parse_vcard(lines):
+    """Yields a contact fields dict per vCard, only the first email and
+       phone number of each card are kept"""
+    card = None
+    for line in unfold_vcard_lines(lines):
+        name, _, value = line.partition(':')
+        # Drop parameters (TYPE=...) and groups (item1.EMAIL)
+        name = name.split(';')[0].split('.')[-1].upper()
+
+        if name == 'BEGIN' and value.upper() == 'VCARD':
+            card = {}
+        elif name == 'END' and card is not None:
+            if card:
+                yield card
+            card = None
+        elif card is None or not value:
+            continue
+        elif name == 'N':
+            parts = [unescape_vcard_value(part)
+                     for part in re.split(r'(?<!\\);', value)]
+            parts += [''] * (3 - len(parts))
+            last, first, middle = parts[:3]
+            for field, part in (('last_name', last), ('first_name', first),
+                                ('middle_name', middle)):
+                if part:
+                    card[field] = part
+        elif name == 'FN' and 'first_name' not in card:
+            first, _, last = unescape_vcard_value(value).partition(' ')
+            card['first_name'] = first
+            card.setdefault('last_name', last)
+        elif name == 'EMAIL':
+            card.setdefault('email', value)
+        elif name == 'TEL':
+            card.setdefault('phone_number', value.replace('tel:', ''))
+        elif name == 'NICKNAME':
+            card['nickname'] = unescape_vcard_value(value).split(',')[0]
+        elif name == 'ORG':
+            card['company'] = unescape_vcard_value(value.split(';')[0])
+        elif name == 'TITLE':
+            card['position'] = unescape_vcard_value(value)
+        elif name == 'BDAY':
+            card['birth_date'] = value
+        elif name == 'NOTE':
+            card['biography'] = unescape_vcard_value(value)
+        elif name == 'ADR':
+            parts = re.split(r'(?<!\\);', value)
+            card['address'] = ', '.join(
+                unescape_vcard_value(part) for part in parts if part)
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def get_import_owner_key(task_id):
+    return f'contacts_import_owner:{task_id}'
+
+
+def set_import_owner(task_id, user_pk):
+    """Records who started the import task, only they can poll it"""
+    cache.set(
+        get_import_owner_key(task_id), user_pk,
+        settings.CONTACTS_IMPORT_STATUS_TIMEOUT)
+
+
+def get_import_owner(task_id):
+    return cache.get(get_import_owner_key(task_id))
+
+
+def clean_row(row):
+    """Normalize values other CRMs format differently than the API"""
+    if 'phone_number' in row:
+        row['phone_number'] = normalize_phone_number(row['phone_number'])
+    if 'birth_date' in row:
+        row['birth_date'] = normalize_birth_date(row['birth_date'])
+    return row
+
+
+def import_contacts(user, file, import_format, on_progress=None):
+    """Imports the contacts of a binary CSV or vCard file for the user.
+
+    `on_progress` is called with the running result after every chunk.
+    Returns the count of processed, created, duplicated and invalid rows
+    along with the first validation errors.
+    """
+    parse = parse_vcard if import_format == 'vcard' else parse_csv
+    rows = (clean_row(row) for row in parse(decode_lines(file)))
+
+    result = {
+        'processed': 0,
+        'created': 0,
+        'duplicates': 0,
+        'invalid': 0,
+        'errors': [],
+    }
+    seen_emails = set()
+    seen_phone_numbers = set()
+
+    for chunk in chunks(rows, CHUNK_SIZE):
+        valid = []
+        for row in chunk:
+            result['processed'] += 1
+            serializer = ContactModelSerializer(data=row)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+                continue
+            result['invalid'] += 1
+            if len(result['errors']) < MAX_REPORTED_ERRORS:
+                result['errors'].append(
+                    {'row': result['processed'], 'errors': serializer.errors})
+
+        # Single indexed lookup for the whole chunk
+        emails = {data['email'] for data in valid if data.get('email')}
+        phone_numbers = {
+            data['phone_number'] for data in valid
+            if data.get('phone_number')}
+        existing = Contact.objects.filter(owner=user).filter(
+            Q(email__in=emails) | Q(phone_number__in=phone_numbers)
+        ).values_list('email', 'phone_number')
+        for email, phone_number in existing:
+            seen_emails.add(email)
+            seen_phone_numbers.add(phone_number)
+
+        contacts = []
+        for data in valid:
+            email = data.get('email')
+            phone_number = data.get('phone_number')
+            if ((email and email in seen_emails)
+                    or (phone_number and phone_number in seen_phone_numbers)):
+                result['duplicates'] += 1
+                continue
+            seen_emails.add(email)
+            seen_phone_numbers.add(phone_number)
+            contacts.append(Contact(owner=user, **data))
+
+        with transaction.atomic():
+            Contact.objects.bulk_create(contacts)
+        result['created'] += len(contacts)
+
+        if on_progress is not None:
+            on_progress(result)
+    return result
@@ -0,0 +1,52 @@
+"""Kinds of objects.
+
+Contacts, activities, activity logs, events and moods are searched and
+synced by kind, see `prm.search` and `prm.sync`. The kind of every model
+and the many to many relations the others hold with contacts, which also
+feed contact stats, are registered here for all of them.
+"""
+
+# Models
+from .models import Activity, ActivityLog, Contact
+from ..journals.models import Event, Mood
+
+CONTACT = 'contact'
+ACTIVITY = 'activity'
+ACTIVITY_LOG = 'activity_log'
+EVENT = 'event'
+MOOD = 'mood'
+KIND_CHOICES = (
+    (CONTACT, 'Contact'),
+    (ACTIVITY, 'Activity'),
+    (ACTIVITY_LOG, 'Activity log'),
+    (EVENT, 'Event'),
+    (MOOD, 'Mood'),
+)
+
+KINDS = {
+    Contact: CONTACT,
+    Activity: ACTIVITY,
+    ActivityLog: ACTIVITY_LOG,
+    Event: EVENT,
+    Mood: MOOD,
+}
+
+# Many to many relations with contacts, by the model holding them
+CONTACT_RELATIONS = {
+    ActivityLog: 'companions',
+    Event: 'contacts',
+    Activity: 'partners',
+}
+
+
+class KindType:
+    """Base of the types handling the objects of a kind"""
+
+    model = None
+
+    @property
+    def kind(self):
+        return KINDS[self.model]
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
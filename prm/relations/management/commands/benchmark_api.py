@@ -0,0 +1,127 @@
+"""API benchmark command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Benchmarks
+from prm.benchmarks.runner import (
+    HTTPDriver,
+    ClientDriver,
+    find_regressions,
+    gunicorn_server,
+    load_baselines,
+    run_scenario,
+    save_baselines)
+from prm.benchmarks.scenarios import get_context, get_scenarios
+from prm.benchmarks.seed import VOLUMES, get_benchmark_users, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds benchmark users and reports the throughput, latency '
+        'percentiles and query counts of every users, relations and '
+        'journals endpoint, through the test client or a local gunicorn. '
+        'Fails when the results are worse than the stored baselines.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--volume', choices=sorted(VOLUMES), default='realistic',
+            help='Data seeded for each user')
+        parser.add_argument(
+            '--users', type=int, default=10,
+            help='Benchmark users seeded, requests are made as the first')
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Requests issued to each endpoint')
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Only run the given scenarios, can be repeated')
+        parser.add_argument(
+            '--gunicorn', action='store_true',
+            help='Drive a local gunicorn instead of the test client')
+        parser.add_argument(
+            '--port', type=int, default=8765,
+            help='Port of the local gunicorn')
+        parser.add_argument(
+            '--workers', type=int, default=2,
+            help='Workers of the local gunicorn')
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Concurrent requests to the local gunicorn')
+        parser.add_argument(
+            '--no-seed', action='store_true',
+            help='Reuse the data seeded by a previous run')
+        parser.add_argument(
+            '--tolerance', type=float,
+            help='Also fail when latencies exceed the baseline by this '
+                 'ratio, like 0.25')
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Store the results as the new baseline')
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Delete the benchmark users and their data, then exit')
+
+    def handle(self, *args, **options):
+        users = get_benchmark_users()
+        if options['clear']:
+            users.delete()
+            self.stdout.write('Benchmark data deleted')
+            return
+
+        if not options['no_seed']:
+            users.delete()
+            seed(options['users'], options['volume'])
+        user = users.order_by('pk').first()
+        if user is None:
+            raise CommandError('No benchmark data, run without --no-seed')
+
+        scenarios = get_scenarios(options['scenarios'])
+        context = get_context(user)
+        driver_name = 'gunicorn' if options['gunicorn'] else 'client'
+        if options['gunicorn']:
+            try:
+                with gunicorn_server(
+                        options['port'], options['workers']) as url:
+                    results = self.run(
+                        HTTPDriver(url, user), scenarios, context, user,
+                        options['requests'], options['concurrency'])
+            except RuntimeError as err:
+                raise CommandError(str(err))
+        else:
+            results = self.run(
+                ClientDriver(user, 'localhost'), scenarios, context,
+                user, options['requests'])
+
+        baselines = load_baselines()
+        key = f'{driver_name}:{options["volume"]}'
+        if options['save_baseline']:
+            baselines.setdefault(key, {}).update(results)
+            save_baselines(baselines)
+            self.stdout.write(f'Baseline {key} saved')
+            return
+
+        regressions = find_regressions(
+            results, baselines.get(key, {}), options['tolerance'])
+        if regressions:
+            raise CommandError(
+                'Regressions found:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def run(self, driver, scenarios, context, user, requests,
+            concurrency=1):
+        self.stdout.write(
+            f"{'scenario':<24}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}"
+            f"{'p99 ms':>9}{'queries':>9}{'errors':>8}")
+        results = {}
+        for scenario in scenarios:
+            result = run_scenario(
+                driver, scenario, context, user, requests, concurrency)
+            results[scenario.name] = result
+            queries = result['queries']
+            self.stdout.write(
+                f"{scenario.name:<24}{result['throughput']:>9}"
+                f"{result['p50']:>9}{result['p90']:>9}{result['p99']:>9}"
+                f"{'-' if queries is None else queries:>9}"
+                f"{result['errors']:>8}")
+        return results
@@ -0,0 +1,69 @@
+"""Random code generation benchmark command."""
+
+# Standard Library
+import time
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Fields
+from django_extensions.db.fields import RandomCharField
+
+# Models
+from prm.users.models import User
+from prm.relations.models import Contact
+
+USERNAME = 'benchmark_codes'
+
+
+class Command(BaseCommand):
+    help = (
+        'Reports contact insert throughput generating codes with a '
+        'uniqueness probe per row (the django_extensions RandomCharField '
+        'behavior), without probing, and with bulk inserts. Everything is '
+        'rolled back at the end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=5000,
+            help='Contacts inserted by each strategy')
+        parser.add_argument(
+            '--existing', type=int, default=100000,
+            help='Contacts already on the table before measuring')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email=f'{USERNAME}@prm.com', username=USERNAME,
+                password=None)
+            Contact.objects.bulk_create(
+                (self.new_contact(user, i) for i in range(options['existing'])),
+                batch_size=5000)
+
+            self.report('save, probing codes', rows, lambda: [
+                self.save_probing(self.new_contact(user, i))
+                for i in range(rows)])
+            self.report('save', rows, lambda: [
+                self.new_contact(user, i).save() for i in range(rows)])
+            self.report('bulk_create', rows, lambda: (
+                Contact.objects.bulk_create(
+                    (self.new_contact(user, i) for i in range(rows)),
+                    batch_size=1000)))
+
+            transaction.set_rollback(True)
+
+    def new_contact(self, user, i):
+        return Contact(owner=user, first_name=f'Contact {i}', last_name='Test')
+
+    def save_probing(self, contact):
+        field = Contact._meta.get_field('code')
+        RandomCharField.pre_save(field, contact, True)
+        contact.save()
+
+    def report(self, name, rows, insert):
+        start = time.perf_counter()
+        insert()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'{name:<24}{rows / elapsed:>12.0f} rows/s')
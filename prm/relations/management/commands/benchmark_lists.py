@@ -0,0 +1,79 @@
+"""List endpoints benchmark command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Benchmarks
+from prm.benchmarks.runner import ClientDriver, run_scenario
+from prm.benchmarks.scenarios import get_context, get_scenarios
+from prm.benchmarks.seed import get_benchmark_users, seed_rows
+
+CONTACTS_PER_USER = 50
+ACTIVITIES_PER_USER = 10
+
+LIST_SCENARIOS = [
+    'contacts-list',
+    'activities-list',
+    'activities-logs',
+    'activity-logs-list',
+    'moods-list',
+    'events-list',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds benchmark users with moods, events and activity logs and '
+        'reports the p50/p99 latency of the list endpoints. Run it before '
+        'and after a migration with --no-seed to compare both schemas.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=1000000,
+            help='Rows to seed on each of the mood, event and log tables')
+        parser.add_argument(
+            '--users', type=int, default=100,
+            help='Benchmark users the rows are spread across')
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Requests issued to each endpoint')
+        parser.add_argument(
+            '--no-seed', action='store_true',
+            help='Reuse the data seeded by a previous run')
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Delete the benchmark users and their data, then exit')
+
+    def handle(self, *args, **options):
+        users = get_benchmark_users()
+        if options['clear']:
+            users.delete()
+            self.stdout.write('Benchmark data deleted')
+            return
+
+        if not options['no_seed']:
+            users.delete()
+            rows_per_user = max(1, options['rows'] // options['users'])
+            seed_rows(options['users'], {
+                'contacts': CONTACTS_PER_USER,
+                'activities': ACTIVITIES_PER_USER,
+                'moods': rows_per_user,
+                'events': rows_per_user,
+                'logs': rows_per_user,
+            })
+        user = users.order_by('pk').first()
+        if user is None:
+            raise CommandError('No benchmark data, run without --no-seed')
+
+        driver = ClientDriver(user, 'localhost')
+        context = get_context(user)
+        self.stdout.write(f"{'endpoint':<40}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+        for scenario in get_scenarios(LIST_SCENARIOS):
+            result = run_scenario(
+                driver, scenario, context, user, options['requests'])
+            if result['errors']:
+                self.stderr.write(
+                    f'{scenario.name}: {result["errors"]} failed requests')
+            self.stdout.write(
+                f"{scenario.name:<40}{result['p50']:>12.2f}"
+                f"{result['p99']:>12.2f}")
@@ -0,0 +1,42 @@
+"""Contact stats rebuild command."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Models
+from prm.relations.models import Contact, ContactStats
+
+# Utils
+from prm.relations.imports import chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the stats of every contact, or of the contacts of the '
+        'given users, in chunks. Stats are kept up to date on writes, run '
+        'it after loading data without signals or to fix drifted stats.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', dest='usernames', action='append', default=[],
+            help='Only rebuild the stats of this user contacts, repeatable')
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Contacts refreshed per transaction')
+
+    def handle(self, *args, **options):
+        contacts = Contact.objects.order_by('pk')
+        if options['usernames']:
+            contacts = contacts.filter(
+                owner__username__in=options['usernames'])
+        contact_ids = contacts.values_list('pk', flat=True).iterator(
+            chunk_size=options['chunk_size'])
+
+        refreshed = 0
+        for chunk in chunks(contact_ids, options['chunk_size']):
+            with transaction.atomic():
+                refreshed += len(ContactStats.objects.refresh(chunk))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the stats of {refreshed} contacts'))
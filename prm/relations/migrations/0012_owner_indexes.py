@@ -0,0 +1,29 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0011_auto_20191004_1640'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['owner', '-created'], name='activity_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['owner', '-date', '-created'], name='activitylog_owner_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['activity', '-date', '-created'], name='activitylog_activity_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['owner', '-created'], name='contact_owner_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:49
+
+from django.db import migrations
+import prm.utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0012_owner_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contact',
+            name='code',
+            field=prm.utils.fields.RandomCodeField(blank=True, editable=False, length=8, unique=True),
+        ),
+    ]
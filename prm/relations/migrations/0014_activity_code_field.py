@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:51
+
+from django.db import migrations
+import prm.utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0013_contact_code_field'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activity',
+            name='code',
+            field=prm.utils.fields.RandomCodeField(blank=True, editable=False, length=8, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='code',
+            field=prm.utils.fields.RandomCodeField(blank=True, editable=False, length=8, unique=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.28 on 2026-10-18 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0014_activity_code_field'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['owner', 'email'], name='contact_owner_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['owner', 'phone_number'], name='contact_owner_phone_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:00
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0015_contact_duplicates_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactStats',
+            fields=[
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Datetime on which the object was created.', verbose_name='created at ')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Datetime on which the object was last modified.', verbose_name='modified at ')),
+                ('contact', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='relations.Contact')),
+                ('log_count', models.PositiveIntegerField(default=0, help_text='Activity logs shared with the contact')),
+                ('event_count', models.PositiveIntegerField(default=0, help_text='Events shared with the contact')),
+                ('activity_count', models.PositiveIntegerField(default=0, help_text='Activities the contact is partner of')),
+                ('last_interaction', models.DateField(blank=True, help_text='Latest date of an activity log or event with the contact', null=True)),
+                ('top_activities', django.contrib.postgres.fields.jsonb.JSONField(default=list, help_text='Activities with the most logs shared with the contact')),
+            ],
+            options={
+                'verbose_name_plural': 'contact stats',
+                'ordering': ['-created', '-modified'],
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('relations', '0016_contact_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='reminder_interval',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Days without interactions before being reminded of the contact, 0 disables reminders. Defaults to CONTACT_REMINDER_INTERVAL.', null=True),
+        ),
+        migrations.CreateModel(
+            name='ContactReminder',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Datetime on which the object was created.', verbose_name='created at ')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Datetime on which the object was last modified.', verbose_name='modified at ')),
+                ('last_interaction', models.DateField(blank=True, help_text='Latest activity log or event with the contact, if any', null=True)),
+                ('due_date', models.DateField(help_text='Day the contact started being neglected')),
+                ('contact', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='reminder', to='relations.Contact')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['due_date', 'id'],
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contactreminder',
+            index=models.Index(fields=['owner', 'due_date'], name='reminder_owner_due_date_idx'),
+        ),
+    ]
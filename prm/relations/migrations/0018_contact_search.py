@@ -0,0 +1,82 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:06
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import DatabaseError, migrations, transaction
+
+# Keeps search_vector up to date on every insert or update, bulk ones
+# included. Weights: names A, email and company B, free text C.
+CREATE_TRIGGER = '''
+CREATE FUNCTION relations_contact_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple',
+            coalesce(NEW.first_name, '') || ' ' ||
+            coalesce(NEW.middle_name, '') || ' ' ||
+            coalesce(NEW.last_name, '') || ' ' ||
+            coalesce(NEW.nickname, '')), 'A') ||
+        setweight(to_tsvector('simple',
+            coalesce(NEW.email, '') || ' ' ||
+            split_part(coalesce(NEW.email, ''), '@', 1) || ' ' ||
+            coalesce(NEW.company, '')), 'B') ||
+        setweight(to_tsvector('simple',
+            coalesce(NEW.biography, '') || ' ' ||
+            coalesce(NEW.met, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER relations_contact_search_vector_update
+BEFORE INSERT OR UPDATE OF first_name, middle_name, last_name, nickname,
+    email, company, biography, met
+ON relations_contact
+FOR EACH ROW EXECUTE PROCEDURE relations_contact_search_vector();
+
+UPDATE relations_contact SET first_name = first_name;
+'''
+
+DROP_TRIGGER = '''
+DROP TRIGGER relations_contact_search_vector_update ON relations_contact;
+DROP FUNCTION relations_contact_search_vector();
+'''
+
+TRIGRAM_FIELDS = ('first_name', 'last_name', 'nickname')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Fuzzy search is only enabled where pg_trgm can be installed"""
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError:
+        return
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX contact_{field}_trgm_idx ON relations_contact '
+            f'USING gin ({field} gin_trgm_ops)')
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS contact_{field}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0017_contact_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Names, email, company, biography and how you met, maintained by a database trigger', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='contact_search_vector_idx'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0018_contact_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['owner', 'modified'], name='activity_owner_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['owner', 'modified'], name='activitylog_owner_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['owner', 'modified'], name='contact_owner_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:31
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0019_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='picture_variants',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict, help_text='Resized copies of the picture, generated in the background, see prm.utils.pictures'),
+        ),
+    ]
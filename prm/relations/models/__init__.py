@@ -1,3 +1,5 @@
 from .contacts import *
 from .activities import *
 from .activity_logs import *
+from .contact_stats import *
+from .reminders import *
@@ -5,7 +5,7 @@ from django.db import models
 from ...utils import PRMModel
 
 # Fields
-from django_extensions.db.fields import RandomCharField
+from ...utils.fields import RandomCodeField
 
 
 class Activity(PRMModel):
@@ -16,7 +16,7 @@ class Activity(PRMModel):
 
     owner = models.ForeignKey('users.User', on_delete=models.CASCADE)
 
-    code = RandomCharField(length=8, blank=False, null=False, unique=True)
+    code = RandomCodeField(length=8, blank=False, null=False, unique=True)
 
     name = models.CharField(max_length=50)
 
@@ -33,3 +33,12 @@ class Activity(PRMModel):
 
     def __str__(self):
         return f'{self.name} by {self.owner}'
+
+    class Meta(PRMModel.Meta):
+        indexes = [
+            # Delta sync, see prm.sync
+            models.Index(fields=['owner', 'modified'],
+                         name='activity_owner_modified_idx'),
+            models.Index(fields=['owner', '-created'],
+                         name='activity_owner_created_idx'),
+        ]
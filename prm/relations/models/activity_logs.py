@@ -1,6 +1,6 @@
 from ...utils import PRMModel
 from django.db import models
-from django_extensions.db.fields import RandomCharField
+from ...utils.fields import RandomCodeField
 
 
 class ActivityLog(PRMModel):
@@ -10,7 +10,7 @@ class ActivityLog(PRMModel):
     an activity could be biking an a log would be a day you went biking.
     """
 
-    code = RandomCharField(length=8, blank=False, null=False, unique=True)
+    code = RandomCodeField(length=8, blank=False, null=False, unique=True)
 
     activity = models.ForeignKey(
         'relations.Activity', on_delete=models.SET_NULL, null=True)
@@ -32,3 +32,12 @@ class ActivityLog(PRMModel):
 
     class Meta:
         ordering = ['-date', '-created']
+        indexes = [
+            # Delta sync, see prm.sync
+            models.Index(fields=['owner', 'modified'],
+                         name='activitylog_owner_modified_idx'),
+            models.Index(fields=['owner', '-date', '-created'],
+                         name='activitylog_owner_date_idx'),
+            models.Index(fields=['activity', '-date', '-created'],
+                         name='activitylog_activity_date_idx'),
+        ]
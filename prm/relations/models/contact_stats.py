@@ -0,0 +1,136 @@
+# Django
+from django.apps import apps
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+from django.db.models import Count, Max
+from django.utils import timezone
+
+# Models
+from ...utils import PRMModel
+from .activities import Activity
+from .activity_logs import ActivityLog
+from .contacts import Contact
+
+
+class ContactStatsManager(models.Manager):
+    """Contact stats manager"""
+
+    # Activities kept on `top_activities`
+    top_activities_size = 3
+
+    def refresh(self, contact_ids):
+        """Recomputes the stats of the given contacts with a grouped query
+           per relation, whatever the number of contacts. Ids of deleted
+           contacts are ignored."""
+        stats = {
+            pk: self.model(contact_id=pk)
+            for pk in Contact.objects.filter(
+                pk__in=set(contact_ids)).values_list('pk', flat=True)}
+        if not stats:
+            return []
+
+        Event = apps.get_model('journals', 'Event')
+        logs = (
+            ActivityLog.companions.through.objects
+            .filter(contact_id__in=stats)
+            .values('contact_id')
+            .annotate(count=Count('id'), last=Max('activitylog__date'))
+            .order_by())
+        events = (
+            Event.contacts.through.objects
+            .filter(contact_id__in=stats)
+            .values('contact_id')
+            .annotate(count=Count('id'), last=Max('event__date'))
+            .order_by())
+        activities = (
+            Activity.partners.through.objects
+            .filter(contact_id__in=stats)
+            .values('contact_id')
+            .annotate(count=Count('id'))
+            .order_by())
+        shared_activities = (
+            ActivityLog.companions.through.objects
+            .filter(contact_id__in=stats,
+                    activitylog__activity__isnull=False)
+            .values('contact_id', 'activitylog__activity__code',
+                    'activitylog__activity__name')
+            .annotate(count=Count('id'))
+            .order_by('contact_id', '-count', 'activitylog__activity__name'))
+
+        for row in logs:
+            contact_stats = stats[row['contact_id']]
+            contact_stats.log_count = row['count']
+            contact_stats.last_interaction = row['last']
+        for row in events:
+            contact_stats = stats[row['contact_id']]
+            contact_stats.event_count = row['count']
+            if (contact_stats.last_interaction is None
+                    or row['last'] > contact_stats.last_interaction):
+                contact_stats.last_interaction = row['last']
+        for row in activities:
+            stats[row['contact_id']].activity_count = row['count']
+        for row in shared_activities:
+            top_activities = stats[row['contact_id']].top_activities
+            if len(top_activities) < self.top_activities_size:
+                top_activities.append({
+                    'code': row['activitylog__activity__code'],
+                    'name': row['activitylog__activity__name'],
+                    'logs': row['count'],
+                })
+
+        now = timezone.now()
+        existing = set(
+            self.filter(contact_id__in=stats)
+            .values_list('contact_id', flat=True))
+        for contact_stats in stats.values():
+            contact_stats.modified = now
+        self.bulk_update(
+            [stats[pk] for pk in existing],
+            ['log_count', 'event_count', 'activity_count',
+             'last_interaction', 'top_activities', 'modified'])
+        # A concurrent refresh may have created the row meanwhile
+        self.bulk_create(
+            [contact_stats for pk, contact_stats in stats.items()
+             if pk not in existing],
+            ignore_conflicts=True)
+        return list(stats.values())
+
+
+class ContactStats(PRMModel):
+    """
+    Summary of the user's relationship with a contact, derived from the
+    activity logs, events and activities they share. Kept up to date on
+    writes so contacts can be listed along with it without scanning those
+    tables.
+    """
+
+    contact = models.OneToOneField(
+        'relations.Contact',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats')
+
+    log_count = models.PositiveIntegerField(
+        default=0, help_text='Activity logs shared with the contact')
+
+    event_count = models.PositiveIntegerField(
+        default=0, help_text='Events shared with the contact')
+
+    activity_count = models.PositiveIntegerField(
+        default=0, help_text='Activities the contact is partner of')
+
+    last_interaction = models.DateField(
+        blank=True, null=True,
+        help_text='Latest date of an activity log or event with the contact')
+
+    top_activities = JSONField(
+        default=list,
+        help_text='Activities with the most logs shared with the contact')
+
+    objects = ContactStatsManager()
+
+    def __str__(self):
+        return f'Stats of {self.contact_id}'
+
+    class Meta(PRMModel.Meta):
+        verbose_name_plural = 'contact stats'
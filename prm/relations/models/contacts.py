@@ -1,12 +1,65 @@
 # Django
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchRank,
+    SearchVectorField,
+    TrigramSimilarity)
+from django.db import connections, models
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
 from django.core.validators import RegexValidator
 
 # Models
-from ...utils import Entity
+from ...utils import Entity, PRMQuerySet
+
+# Search
+from ...utils.search import get_search_words, prefix_search_query
 
 # Fields
-from django_extensions.db.fields import RandomCharField
+from ...utils.fields import RandomCodeField
+
+
+# Fields compared by trigram similarity when pg_trgm is installed
+TRIGRAM_FIELDS = ('first_name', 'last_name', 'nickname')
+
+_trigram_databases = {}
+
+
+def has_trigram_extension(using):
+    """Whether pg_trgm is installed on the database, checked once"""
+    if using not in _trigram_databases:
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_databases[using] = cursor.fetchone() is not None
+    return _trigram_databases[using]
+
+
+class ContactQuerySet(PRMQuerySet):
+    """Contact queryset"""
+
+    def search(self, text):
+        """Contacts matching every word of the text, words match by
+           prefix. Names with typos are matched by trigram similarity
+           when pg_trgm is installed. Ordered by relevance, as `rank`."""
+        query = prefix_search_query(text)
+        if query is None:
+            return self.none()
+
+        rank = SearchRank(F('search_vector'), query)
+        condition = Q(search_vector=query)
+
+        if has_trigram_extension(self.db):
+            text = ' '.join(get_search_words(text))
+            rank = rank + Greatest(*(
+                TrigramSimilarity(field, text) for field in TRIGRAM_FIELDS))
+            for field in TRIGRAM_FIELDS:
+                condition |= Q(**{f'{field}__trigram_similar': text})
+
+        return (
+            self.annotate(rank=rank)
+            .filter(condition)
+            .order_by('-rank', '-created'))
 
 
 class Contact(Entity):
@@ -18,7 +71,7 @@ class Contact(Entity):
         on_delete=models.CASCADE,
         help_text='User this contact belongs')
 
-    code = RandomCharField(length=8, blank=False, null=False, unique=True)
+    code = RandomCodeField(length=8, blank=False, null=False, unique=True)
 
     first_name = models.CharField('First name', max_length=40)
     middle_name = models.CharField(max_length=20, blank=True)
@@ -59,5 +112,38 @@ class Contact(Entity):
         blank=True,
         help_text='Pets information, as their name, breed, etc..')
 
+    reminder_interval = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        help_text=(
+            'Days without interactions before being reminded of the '
+            'contact, 0 disables reminders. Defaults to '
+            'CONTACT_REMINDER_INTERVAL.'))
+
+    # Uses the SEARCH_CONFIG configuration, see 0018_contact_search
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text='Names, email, company, biography and how you met, '
+                  'maintained by a database trigger')
+
+    objects = ContactQuerySet.as_manager()
+
     def __str__(self):
         return f'{self.first_name} {self.last_name} of {self.owner}'
+
+    class Meta(Entity.Meta):
+        indexes = [
+            # Delta sync, see prm.sync
+            models.Index(fields=['owner', 'modified'],
+                         name='contact_owner_modified_idx'),
+            models.Index(fields=['owner', '-created'],
+                         name='contact_owner_created_idx'),
+            # Duplicates lookups when importing contacts
+            models.Index(fields=['owner', 'email'],
+                         name='contact_owner_email_idx'),
+            models.Index(fields=['owner', 'phone_number'],
+                         name='contact_owner_phone_idx'),
+            GinIndex(fields=['search_vector'],
+                     name='contact_search_vector_idx'),
+        ]
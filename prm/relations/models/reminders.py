@@ -0,0 +1,114 @@
+# Django
+from django.conf import settings
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+# Models
+from ...utils import PRMModel
+from .contact_stats import ContactStats
+from .contacts import Contact
+
+
+class ContactReminderManager(models.Manager):
+    """Contact reminder manager"""
+
+    def rebuild(self, user_ids, today=None):
+        """Replaces the reminders of the given users with a single
+           INSERT ... SELECT over their contacts and stats, so the cost
+           doesn't depend on the number of contacts. Returns the number
+           of reminders created."""
+        today = today or timezone.localdate()
+        db = router.db_for_write(self.model)
+        connection = connections[db]
+        qn = connection.ops.quote_name
+
+        opts = self.model._meta
+        contact_opts = Contact._meta
+        stats_opts = ContactStats._meta
+
+        # Contacts without interactions count from the day they were added
+        last_interaction = (
+            'COALESCE(s.{last}, (c.{created} AT TIME ZONE %s)::date)'
+        ).format(
+            last=qn(stats_opts.get_field('last_interaction').column),
+            created=qn(contact_opts.get_field('created').column))
+        interval = 'COALESCE(c.{interval}, %s)'.format(
+            interval=qn(contact_opts.get_field('reminder_interval').column))
+
+        sql = (
+            'INSERT INTO {table} ({created}, {modified}, {owner}, '
+            '{contact}, {last_interaction}, {due_date}) '
+            'SELECT %s, %s, c.{contact_owner}, c.{contact_pk}, s.{last}, '
+            '{last_interaction_expr} + {interval_expr} '
+            'FROM {contacts} c '
+            'LEFT JOIN {stats} s ON s.{stats_contact} = c.{contact_pk} '
+            'WHERE c.{contact_owner} = ANY(%s) '
+            'AND {interval_expr} > 0 '
+            'AND {last_interaction_expr} + {interval_expr} <= %s'
+        ).format(
+            table=qn(opts.db_table),
+            created=qn(opts.get_field('created').column),
+            modified=qn(opts.get_field('modified').column),
+            owner=qn(opts.get_field('owner').column),
+            contact=qn(opts.get_field('contact').column),
+            last_interaction=qn(opts.get_field('last_interaction').column),
+            due_date=qn(opts.get_field('due_date').column),
+            contact_owner=qn(contact_opts.get_field('owner').column),
+            contact_pk=qn(contact_opts.pk.column),
+            last=qn(stats_opts.get_field('last_interaction').column),
+            last_interaction_expr=last_interaction,
+            interval_expr=interval,
+            contacts=qn(contact_opts.db_table),
+            stats=qn(stats_opts.db_table),
+            stats_contact=qn(stats_opts.get_field('contact').column),
+        )
+        default_interval = settings.CONTACT_REMINDER_INTERVAL
+        now = timezone.now()
+        params = [
+            now, now,
+            settings.TIME_ZONE, default_interval,
+            list(user_ids),
+            default_interval,
+            settings.TIME_ZONE, default_interval,
+            today,
+        ]
+
+        with transaction.atomic(using=db):
+            self.using(db).filter(owner_id__in=user_ids).delete()
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.rowcount
+
+
+class ContactReminder(PRMModel):
+    """
+    Contact the user hasn't interacted with for longer than the contact's
+    reminder interval. Reminders are computed for every user by a
+    scheduled task, see `compute_contact_reminders`.
+    """
+
+    owner = models.ForeignKey('users.User', on_delete=models.CASCADE)
+
+    contact = models.OneToOneField(
+        'relations.Contact',
+        on_delete=models.CASCADE,
+        related_name='reminder')
+
+    last_interaction = models.DateField(
+        blank=True, null=True,
+        help_text='Latest activity log or event with the contact, if any')
+
+    due_date = models.DateField(
+        help_text='Day the contact started being neglected')
+
+    objects = ContactReminderManager()
+
+    def __str__(self):
+        return f'Reminder of {self.contact_id} since {self.due_date}'
+
+    class Meta(PRMModel.Meta):
+        ordering = ['due_date', 'id']
+        indexes = [
+            models.Index(fields=['owner', 'due_date'],
+                         name='reminder_owner_due_date_idx'),
+        ]
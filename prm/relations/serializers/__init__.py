@@ -1,3 +1,5 @@
 from .contacts import *
+from .fields import *
+from .members import *
 from .activities import *
 from .activity_logs import *
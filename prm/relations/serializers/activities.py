@@ -6,7 +6,9 @@ from rest_framework import serializers
 
 # Models
 from ..models import Activity
-from ..models import Contact
+
+# Serializers
+from .members import AddContactMembersSerializer, RemoveContactMembersSerializer
 
 
 class ActivityModelSerializer(serializers.ModelSerializer):
@@ -23,47 +25,11 @@ class ActivityModelSerializer(serializers.ModelSerializer):
         exclude = ('owner', 'id', 'created', 'modified')
 
 
-class AddContactToActivitySerializer(serializers.Serializer):
-    contact = serializers.SlugRelatedField(
-        queryset=Contact.objects.all(),
-        slug_field='code'
-    )
-
-    # TODO: Refactor validate contact logic for add and remove contact
-    # serializers
-    def validate_contact(self, contact):
-        """Validate contact is not part of activity partners"""
-        activity = self.context['activity']
-
-        if contact in activity.partners.all():
-            raise serializers.ValidationError(
-                'Contact is alreday a member of this activity')
-        return contact
-
-    def save(self):
-        activity = self.context['activity']
-        contact = self.validated_data['contact']
-        activity.partners.add(contact)
-        return activity
-
-
-class RemoveContactFromActivitySerializer(serializers.Serializer):
-
-    contact = serializers.SlugRelatedField(
-        queryset=Contact.objects.all(),
-        slug_field='code'
-    )
-
-    def validate_contact(self, contact):
-        """Validate contact is part of activity partners"""
-        activity = self.context['activity']
+class AddContactToActivitySerializer(AddContactMembersSerializer):
+    object_name = 'activity'
+    relation_name = 'partners'
 
-        if contact not in activity.partners.all():
-            raise serializers.ValidationError(
-                'Contact is not a member of this activity')
-        return contact
 
-    def save(self, **kwargs):
-        activity = self.context['activity']
-        activity.partners.remove(self.validated_data['contact'])
-        return activity
+class RemoveContactFromActivitySerializer(RemoveContactMembersSerializer):
+    object_name = 'activity'
+    relation_name = 'partners'
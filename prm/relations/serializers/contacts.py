@@ -2,13 +2,51 @@
 from rest_framework import serializers
 
 # Models
-from ..models import Contact
+from ..models import Contact, ContactReminder, ContactStats
+
+# Serializers
+from ...utils.serializers import BulkListSerializer, PictureVariantsField
+
+
+class ContactStatsModelSerializer(serializers.ModelSerializer):
+    """Contact stats serializer"""
+
+    class Meta:
+        model = ContactStats
+        exclude = ('contact', 'created', 'modified')
 
 
 class ContactModelSerializer(serializers.ModelSerializer):
     owner = serializers.StringRelatedField()
 
+    stats = ContactStatsModelSerializer(read_only=True)
+
+    picture_variants = PictureVariantsField()
+
     class Meta:
         model = Contact
-        exclude = ('created', 'modified')
+        list_serializer_class = BulkListSerializer
+        exclude = ('created', 'modified', 'search_vector')
         read_only_fields = ('id',)
+
+
+class ContactReminderContactSerializer(serializers.ModelSerializer):
+    """Contact of a reminder"""
+
+    picture_variants = PictureVariantsField()
+
+    class Meta:
+        model = Contact
+        fields = (
+            'code', 'first_name', 'last_name', 'nickname', 'picture',
+            'picture_variants')
+
+
+class ContactReminderModelSerializer(serializers.ModelSerializer):
+    """Contact reminder serializer"""
+
+    contact = ContactReminderContactSerializer(read_only=True)
+
+    class Meta:
+        model = ContactReminder
+        fields = ('contact', 'last_interaction', 'due_date', 'created')
@@ -0,0 +1,72 @@
+# Django REST Framework
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class OwnedCodeManyRelatedField(serializers.ManyRelatedField):
+    """Resolves every code with a single query"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        data = list(data)
+        if not self.allow_empty and not data:
+            self.fail('empty')
+        return self.child_relation.resolve(data)
+
+
+class OwnedCodeRelatedField(serializers.SlugRelatedField):
+    """Related field resolving codes among the requesting user's objects.
+
+    Codes are looked up with `owner` and `code`, all the codes given to a
+    `many` field at once, and the objects found are kept on the request so
+    other fields and serializers of the same request don't query them
+    again.
+    """
+
+    default_error_messages = {
+        'does_not_exist': 'Objects with code {value} do not exist.',
+        'invalid': 'Codes must be strings.',
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('slug_field', 'code')
+        super().__init__(**kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return OwnedCodeManyRelatedField(**list_kwargs)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            owner=self.context['request'].user)
+
+    def get_resolved(self):
+        """Objects already resolved on this request, by code"""
+        request = self.context['request']
+        if not hasattr(request, '_resolved_codes'):
+            request._resolved_codes = {}
+        return request._resolved_codes.setdefault(
+            self.queryset.model._meta.label, {})
+
+    def resolve(self, codes):
+        if not all(isinstance(code, str) for code in codes):
+            self.fail('invalid')
+        resolved = self.get_resolved()
+        missing = set(codes) - set(resolved)
+        if missing:
+            resolved.update(
+                (getattr(obj, self.slug_field), obj)
+                for obj in self.get_queryset().filter(
+                    **{f'{self.slug_field}__in': missing}))
+        not_found = sorted(set(codes) - set(resolved))
+        if not_found:
+            self.fail('does_not_exist', value=', '.join(not_found))
+        return [resolved[code] for code in codes]
+
+    def to_internal_value(self, data):
+        return self.resolve([data])[0]
@@ -0,0 +1,83 @@
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from ..models import Contact
+
+# Fields
+from .fields import OwnedCodeRelatedField
+
+
+class ContactMembersSerializer(serializers.Serializer):
+    """Base serializer adding or removing contacts from a many to many
+    relation of the object in the context, like activity partners. The
+    contacts are looked up among the requesting user's.
+
+    Membership is checked with indexed queries limited to the given
+    contacts, and all of them are changed with a single query on the
+    relation table.
+    """
+
+    contact = OwnedCodeRelatedField(
+        many=True,
+        allow_empty=False,
+        queryset=Contact.objects.all()
+    )
+
+    # Context key of the object and its contacts relation
+    object_name = None
+    relation_name = None
+
+    def get_object(self):
+        return self.context[self.object_name]
+
+    def get_relation(self):
+        return getattr(self.get_object(), self.relation_name)
+
+    def get_error(self, message, contacts):
+        codes = ', '.join(contact.code for contact in contacts)
+        return serializers.ValidationError(
+            f'{message} {self.get_object()._meta.verbose_name}: {codes}')
+
+    def get_members(self, contacts):
+        """The given contacts that are already related"""
+        return self.get_relation().filter(
+            pk__in=[contact.pk for contact in contacts])
+
+    def validate_contact(self, contacts):
+        # The same code may come more than once
+        return list({contact.pk: contact for contact in contacts}.values())
+
+
+class AddContactMembersSerializer(ContactMembersSerializer):
+
+    def validate_contact(self, contacts):
+        """Validate contacts are not related yet"""
+        contacts = super().validate_contact(contacts)
+        members = self.get_members(contacts)
+        if members.exists():
+            raise self.get_error(
+                'Contacts already members of this', members.only('code'))
+        return contacts
+
+    def save(self):
+        self.get_relation().add(*self.validated_data['contact'])
+        return self.get_object()
+
+
+class RemoveContactMembersSerializer(ContactMembersSerializer):
+
+    def validate_contact(self, contacts):
+        """Validate contacts are related"""
+        contacts = super().validate_contact(contacts)
+        members = self.get_members(contacts)
+        if members.count() < len(contacts):
+            members = set(members.values_list('pk', flat=True))
+            raise self.get_error('Contacts not members of this', [
+                contact for contact in contacts
+                if contact.pk not in members])
+        return contacts
+
+    def save(self, **kwargs):
+        self.get_relation().remove(*self.validated_data['contact'])
+        return self.get_object()
@@ -0,0 +1,138 @@
+"""Relations signals."""
+
+# Django
+from django.db.models.signals import m2m_changed, post_init, post_save
+from django.dispatch import receiver
+
+# Models
+from .models import Activity, ActivityLog, ContactStats
+from ..journals.models import Event
+
+# Signals
+from ..utils.signals import bulk_saved, deleting, run_batched
+
+# Kinds
+from .kinds import CONTACT_RELATIONS
+
+# Fields of the objects the stats are computed from, by model
+STATS_FIELDS = {
+    ActivityLog: ('date', 'activity_id'),
+    Event: ('date',),
+    Activity: ('name',),
+}
+
+
+def get_contact_ids(model, objects):
+    """Contacts whose stats depend on the objects, given as a queryset or
+       their ids, with a query per relation for all of them"""
+    relation = getattr(model, CONTACT_RELATIONS[model])
+    contact_ids = set(
+        relation.through.objects
+        .filter(**{f'{model._meta.model_name}__in': objects})
+        .values_list('contact_id', flat=True))
+    if model is Activity:
+        # Top activities hold the activity name
+        contact_ids.update(
+            ActivityLog.companions.through.objects
+            .filter(activitylog__activity__in=objects)
+            .values_list('contact_id', flat=True))
+    return contact_ids
+
+
+def refresh_contacts_stats(contact_ids):
+    ContactStats.objects.refresh(contact_ids)
+
+
+def get_stats_values(instance):
+    """Values of the stats fields, deferred ones are None"""
+    return tuple(
+        instance.__dict__.get(field) for field in STATS_FIELDS[type(instance)])
+
+
+def get_relation_changes(sender, instance, action, reverse, model, pk_set,
+                         **kwargs):
+    """Takes the arguments of m2m_changed of a relation with contacts and
+       returns the model holding the relation, the ids of its objects
+       changed and the ids of the contacts changed, or None before the
+       change"""
+    if not action.startswith('post_'):
+        return None
+    if action == 'post_clear':
+        pk_set = instance._cleared_ids[sender]
+    if reverse:
+        # Changed from the contact side, `model` holds the relation
+        return model, pk_set, {instance.pk}
+    return type(instance), {instance.pk}, pk_set
+
+
+@receiver(m2m_changed, sender=ActivityLog.companions.through)
+@receiver(m2m_changed, sender=Event.contacts.through)
+@receiver(m2m_changed, sender=Activity.partners.through)
+def collect_cleared_ids(sender, instance, action, reverse, model, **kwargs):
+    """Clears don't tell which objects they remove, they're collected
+       beforehand for get_relation_changes"""
+    if action != 'pre_clear':
+        return
+    holder = model if reverse else type(instance)
+    source, target = 'contact_id', f'{holder._meta.model_name}_id'
+    if not reverse:
+        source, target = target, source
+    instance.__dict__.setdefault('_cleared_ids', {})[sender] = set(
+        sender.objects.filter(**{source: instance.pk})
+        .values_list(target, flat=True))
+
+
+@receiver(m2m_changed, sender=ActivityLog.companions.through)
+@receiver(m2m_changed, sender=Event.contacts.through)
+@receiver(m2m_changed, sender=Activity.partners.through)
+def refresh_changed_contacts_stats(**kwargs):
+    changes = get_relation_changes(**kwargs)
+    if changes:
+        ContactStats.objects.refresh(changes[2])
+
+
+@receiver(post_init, sender=ActivityLog)
+@receiver(post_init, sender=Event)
+@receiver(post_init, sender=Activity)
+def track_stats_values(sender, instance, **kwargs):
+    instance._stats_values = get_stats_values(instance)
+
+
+@receiver(post_save, sender=ActivityLog)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Activity)
+def refresh_saved_contacts_stats(sender, instance, created, **kwargs):
+    """Dates or names may have changed, new objects have no contacts.
+       Saves that keep them, like title changes, don't refresh."""
+    values = get_stats_values(instance)
+    changed = values != instance._stats_values
+    instance._stats_values = values
+    if changed and not created:
+        ContactStats.objects.refresh(
+            get_contact_ids(type(instance), [instance.pk]))
+
+
+@receiver(bulk_saved, sender=ActivityLog)
+@receiver(bulk_saved, sender=Event)
+def refresh_bulk_saved_contacts_stats(sender, objs, **kwargs):
+    """Dates may have changed, new objects have no contacts"""
+    changed = []
+    for obj in objs:
+        values = get_stats_values(obj)
+        if values != obj._stats_values and obj.pk is not None:
+            changed.append(obj.pk)
+        obj._stats_values = values
+    if changed:
+        ContactStats.objects.refresh(get_contact_ids(sender, changed))
+
+
+@receiver(deleting, sender=ActivityLog)
+@receiver(deleting, sender=Event)
+@receiver(deleting, sender=Activity)
+def refresh_deleted_contacts_stats(sender, queryset, **kwargs):
+    """Relations are deleted along with the objects without sending
+       m2m_changed, so contacts are collected beforehand. Stats are
+       refreshed once after every object is deleted. Contacts and stats
+       of deleted users go along with them without this signal."""
+    run_batched(
+        refresh_contacts_stats, get_contact_ids(sender, queryset))
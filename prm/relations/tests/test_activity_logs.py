@@ -0,0 +1,88 @@
+"""Activity logs nested resource tests"""
+
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Activity, ActivityLog
+
+ACTIVITY_QUERY = 'FROM "relations_activity" WHERE'
+
+
+class ActivityLogsActivityTestCase(APITestCase):
+    """The activity in the URL is only looked up by the requests that need
+    it, and only among the user's activities"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        other = User.objects.create_user(
+            email='other@user.com',
+            username='other_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+
+        self.activity = Activity.objects.create(
+            owner=self.user, name='Running', description='Test')
+        self.log = ActivityLog.objects.create(
+            owner=self.user, activity=self.activity, details='Test',
+            date='2019-10-01')
+        self.other_activity = Activity.objects.create(
+            owner=other, name='Swimming', description='Test')
+        return super().setUp()
+
+    def activity_queries(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, format='json')
+        queries = [
+            query for query in context.captured_queries
+            if ACTIVITY_QUERY in query['sql']]
+        return response, len(queries)
+
+    def test_list_and_detail_join_activity(self):
+        url = f'/activities/{self.activity.code}/logs/'
+        response, queries = self.activity_queries('get', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(queries, 0)
+
+        response, queries = self.activity_queries(
+            'get', f'{url}{self.log.code}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, 0)
+
+    def test_create_looks_activity_up_once(self):
+        response, queries = self.activity_queries(
+            'post', f'/activities/{self.activity.code}/logs/',
+            {'details': 'New', 'date': '2019-10-02'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['activity'], self.activity.name)
+        self.assertEqual(queries, 1)
+
+    def test_other_users_activity_not_found(self):
+        url = f'/activities/{self.other_activity.code}/logs/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.post(
+            url, {'details': 'New', 'date': '2019-10-02'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(
+            ActivityLog.objects.filter(activity=self.other_activity).exists())
+
+    def test_activity_without_logs(self):
+        activity = Activity.objects.create(
+            owner=self.user, name='Reading', description='Test')
+        response = self.client.get(f'/activities/{activity.code}/logs/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
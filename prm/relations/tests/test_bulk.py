@@ -0,0 +1,87 @@
+"""Contacts bulk endpoint tests"""
+
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Contact
+
+BULK_URL = '/contacts/bulk/'
+
+
+def contact_data(i):
+    return {'first_name': f'Contact {i}', 'last_name': 'Test'}
+
+
+class ContactsBulkTestCase(APITestCase):
+    """Contacts can be created, updated and deleted in bulk"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        return super().setUp()
+
+    def bulk_create(self, count):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                BULK_URL, [contact_data(i) for i in range(count)],
+                format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response, len(context.captured_queries)
+
+    def test_bulk_create(self):
+        response, _ = self.bulk_create(50)
+        self.assertEqual(len(response.data), 50)
+        self.assertEqual(Contact.objects.filter(owner=self.user).count(), 50)
+
+        codes = {contact['code'] for contact in response.data}
+        self.assertEqual(len(codes), 50)
+        self.assertEqual(
+            codes, set(Contact.objects.values_list('code', flat=True)))
+
+    def test_bulk_create_queries_dont_grow_with_items(self):
+        _, few_queries = self.bulk_create(2)
+        _, many_queries = self.bulk_create(100)
+        self.assertEqual(few_queries, many_queries)
+
+    def test_bulk_create_is_atomic(self):
+        """A single invalid item rejects the whole request"""
+        payload = [contact_data(0), {'first_name': 'Missing last name'}]
+        response = self.client.post(BULK_URL, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('last_name', response.data[1])
+        self.assertFalse(Contact.objects.exists())
+
+    def test_bulk_update(self):
+        response, _ = self.bulk_create(3)
+        payload = [
+            {**contact, 'nickname': 'Updated'} for contact in response.data]
+
+        response = self.client.put(BULK_URL, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Contact.objects.filter(nickname='Updated').count(), 3)
+
+    def test_bulk_update_unknown_code(self):
+        payload = [{**contact_data(0), 'code': 'unknown'}]
+        response = self.client.put(BULK_URL, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_delete(self):
+        response, _ = self.bulk_create(3)
+        codes = [contact['code'] for contact in response.data[:2]]
+
+        response = self.client.delete(BULK_URL, codes, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(Contact.objects.count(), 1)
@@ -0,0 +1,67 @@
+"""Random code generation tests"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+
+# Models
+from ...users.models import User
+from ..models import Contact
+
+# Fields
+from ...utils.fields import RandomCodeField
+
+TAKEN_CODE = 'TakenCod'
+GENERATE_CODE = 'prm.utils.fields.RandomCodeField.generate_code'
+
+
+class RandomCodeTestCase(TestCase):
+    """Codes are generated without probing the table, taken ones are
+    replaced when the insert fails"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123')
+        Contact.objects.create(
+            owner=self.user, code=TAKEN_CODE, first_name='Taken',
+            last_name='Test')
+        return super().setUp()
+
+    def codes_starting_with_taken(self):
+        """Side effect returning the taken code once, then new codes"""
+        generate_code = RandomCodeField.generate_code
+        codes = iter([TAKEN_CODE])
+
+        def side_effect(field):
+            return next(codes, None) or generate_code(field)
+        return side_effect
+
+    def test_save_doesnt_query_for_codes(self):
+        contact = Contact(owner=self.user, first_name='New', last_name='Test')
+        with self.assertNumQueries(3):
+            # Savepoint, insert and savepoint release
+            contact.save()
+        self.assertEqual(len(contact.code), 8)
+
+    def test_save_retries_taken_code(self):
+        contact = Contact(owner=self.user, first_name='New', last_name='Test')
+        with patch(GENERATE_CODE, autospec=True,
+                   side_effect=self.codes_starting_with_taken()):
+            contact.save()
+        self.assertNotEqual(contact.code, TAKEN_CODE)
+        self.assertEqual(Contact.objects.count(), 2)
+
+    def test_bulk_create_retries_taken_code(self):
+        contacts = [
+            Contact(owner=self.user, first_name=f'New {i}', last_name='Test')
+            for i in range(10)]
+        with patch(GENERATE_CODE, autospec=True,
+                   side_effect=self.codes_starting_with_taken()):
+            Contact.objects.bulk_create(contacts)
+        self.assertEqual(Contact.objects.count(), 11)
+        self.assertEqual(
+            Contact.objects.filter(code=TAKEN_CODE).count(), 1)
@@ -0,0 +1,182 @@
+"""Contact stats tests"""
+
+# Standard Library
+from io import StringIO
+
+# Django
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ...journals.models import Event
+from ..models import Activity, ActivityLog, Contact, ContactStats
+
+
+class ContactStatsTestCase(APITestCase):
+    """Contact stats follow the logs, events and activities of contacts"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        self.contact = Contact.objects.create(
+            owner=self.user, first_name='Contact', last_name='Test')
+        self.other = Contact.objects.create(
+            owner=self.user, first_name='Other', last_name='Test')
+        self.activity = Activity.objects.create(
+            owner=self.user, name='Biking', description='Test')
+        return super().setUp()
+
+    def create_log(self, date, activity=None):
+        return ActivityLog.objects.create(
+            owner=self.user, activity=activity or self.activity,
+            details='Test', date=date)
+
+    def create_event(self, date):
+        return Event.objects.create(
+            owner=self.user, title='Test', location='Test', date=date,
+            start_time='10:00', end_time='11:00')
+
+    def get_stats(self, contact=None):
+        return ContactStats.objects.get(contact=contact or self.contact)
+
+    def test_companions_changes(self):
+        log = self.create_log('2019-10-01')
+        log.companions.add(self.contact, self.other)
+        self.create_log('2019-10-05').companions.add(self.contact)
+        stats = self.get_stats()
+        self.assertEqual(stats.log_count, 2)
+        self.assertEqual(str(stats.last_interaction), '2019-10-05')
+        self.assertEqual(stats.top_activities, [
+            {'code': self.activity.code, 'name': 'Biking', 'logs': 2}])
+
+        log.companions.remove(self.contact)
+        self.assertEqual(self.get_stats().log_count, 1)
+        log.companions.clear()
+        self.assertEqual(self.get_stats(self.other).log_count, 0)
+
+    def test_reverse_changes(self):
+        self.contact.activitylog_set.add(self.create_log('2019-10-01'))
+        self.assertEqual(self.get_stats().log_count, 1)
+
+    def test_clears(self):
+        """Objects a clear removes are collected once for stats, search
+        and sync"""
+        event = self.create_event('2019-11-01')
+        event.contacts.add(self.contact, self.other)
+        table = Event.contacts.through._meta.db_table
+        with CaptureQueriesContext(connection) as context:
+            self.contact.event_set.clear()
+        reads = []
+        for query in context.captured_queries:
+            if query['sql'].startswith('DELETE'):
+                break
+            if f'"{table}"' in query['sql']:
+                reads.append(query)
+        # Along with the one the delete collects the rows with
+        self.assertEqual(len(reads), 2)
+        self.assertEqual(self.get_stats().event_count, 0)
+        self.assertEqual(self.get_stats(self.other).event_count, 1)
+
+        event.contacts.clear()
+        self.assertEqual(self.get_stats(self.other).event_count, 0)
+
+    def test_events_and_partners(self):
+        event = self.create_event('2019-11-01')
+        event.contacts.add(self.contact)
+        self.create_log('2019-10-01').companions.add(self.contact)
+        self.activity.partners.add(self.contact)
+        stats = self.get_stats()
+        self.assertEqual(stats.event_count, 1)
+        self.assertEqual(stats.activity_count, 1)
+        self.assertEqual(str(stats.last_interaction), '2019-11-01')
+
+        event.date = '2019-09-01'
+        event.save()
+        self.assertEqual(str(self.get_stats().last_interaction), '2019-10-01')
+
+    def test_deletes(self):
+        log = self.create_log('2019-10-01')
+        log.companions.add(self.contact)
+        self.activity.name = 'Running'
+        self.activity.save()
+        self.assertEqual(self.get_stats().top_activities[0]['name'],
+                         'Running')
+
+        self.activity.delete()
+        self.assertEqual(self.get_stats().top_activities, [])
+        log.delete()
+        stats = self.get_stats()
+        self.assertEqual(stats.log_count, 0)
+        self.assertIsNone(stats.last_interaction)
+
+    def count_stats_queries(self, func):
+        with CaptureQueriesContext(connection) as context:
+            func()
+        table = ContactStats._meta.db_table
+        return len([query for query in context.captured_queries
+                    if f'"{table}"' in query['sql']])
+
+    def test_unrelated_changes_dont_refresh(self):
+        event = self.create_event('2019-11-01')
+        event.contacts.add(self.contact)
+        event.title = 'Renamed'
+        self.assertEqual(self.count_stats_queries(event.save), 0)
+
+        event.date = '2019-11-02'
+        self.assertEqual(self.count_stats_queries(event.save), 2)
+        self.assertEqual(
+            str(self.get_stats().last_interaction), '2019-11-02')
+
+    def test_bulk_delete_refreshes_once(self):
+        def bulk_delete(count):
+            events = [self.create_event('2019-11-01') for i in range(count)]
+            for event in events:
+                event.contacts.add(self.contact, self.other)
+            codes = [event.code for event in events]
+            return self.count_stats_queries(lambda: self.assertEqual(
+                self.client.delete(
+                    '/events/bulk/', codes, format='json').status_code,
+                status.HTTP_204_NO_CONTENT))
+
+        self.assertEqual(bulk_delete(1), bulk_delete(10))
+        self.assertEqual(self.get_stats().event_count, 0)
+
+    def test_owner_delete(self):
+        self.create_log('2019-10-01').companions.add(self.contact)
+        self.user.delete()
+        self.assertFalse(ContactStats.objects.exists())
+
+    def test_order_by_last_interaction(self):
+        self.create_log('2019-10-01').companions.add(self.other)
+        self.create_log('2019-10-05').companions.add(self.contact)
+        Contact.objects.create(
+            owner=self.user, first_name='New', last_name='Test')
+
+        response = self.client.get(
+            '/contacts/', {'ordering': '-last_interaction'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [item['first_name'] for item in response.data['results']]
+        self.assertEqual(names, ['Contact', 'Other', 'New'])
+        self.assertEqual(response.data['results'][0]['stats']['log_count'], 1)
+        self.assertIsNone(response.data['results'][2]['stats'])
+
+        response = self.client.get('/contacts/', {'ordering': 'name'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_command(self):
+        log = self.create_log('2019-10-01')
+        log.companions.add(self.contact)
+        ContactStats.objects.all().delete()
+        call_command('rebuild_contact_stats', stdout=StringIO())
+        self.assertEqual(ContactStats.objects.count(), 2)
+        self.assertEqual(self.get_stats().log_count, 1)
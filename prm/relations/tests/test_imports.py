@@ -0,0 +1,160 @@
+"""Contacts import tests"""
+
+# Standard Library
+import io
+from unittest.mock import Mock, patch
+
+# Django
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Contact
+
+# Imports
+from ..imports import import_contacts
+
+# Storages
+from ...utils.storages import private_storage
+
+# Tasks
+from ...taskapp.tasks import prune_imports
+
+CELERY_IMPORT = (
+    'prm.relations.views.contacts.import_contacts_from_storage.apply_async')
+CELERY_IMPORT_RESULT = (
+    'prm.relations.views.contacts.import_contacts_from_storage.AsyncResult')
+
+CSV_FILE = (
+    '\ufeffFirst Name,Last Name,E-mail Address,Phone,Company\r\n'
+    'Ana,Perez,ana@mail.com,+1 (809) 555-1234,ACME\r\n'
+    'Ana,Duplicated,ana@mail.com,,\r\n'
+    'Luis,Gomez,,8095550000,\r\n'
+    'Missing,,,,\r\n'
+)
+
+VCARD_FILE = (
+    'BEGIN:VCARD\r\n'
+    'VERSION:3.0\r\n'
+    'N:Perez;Ana;;;\r\n'
+    'FN:Ana Perez\r\n'
+    'EMAIL;TYPE=INTERNET:ana@mail.com\r\n'
+    'END:VCARD\r\n'
+    'BEGIN:VCARD\r\n'
+    'VERSION:3.0\r\n'
+    'N:Gomez;Luis;;;\r\n'
+    'item1.TEL;TYPE=CELL:+1 809 555 0000\r\n'
+    'BDAY:19900102\r\n'
+    'NOTE:Met at the park\\, on a\r\n'
+    '  sunny day\r\n'
+    'END:VCARD\r\n'
+)
+
+
+def create_user():
+    return User.objects.create_user(
+        email='test@user.com',
+        username='test_user',
+        password='Testpassword123',
+        is_active=True)
+
+
+class ImportContactsTestCase(TestCase):
+    """Contacts files are parsed, validated and deduplicated"""
+
+    def setUp(self):
+        self.user = create_user()
+        return super().setUp()
+
+    def import_file(self, content, import_format):
+        return import_contacts(
+            self.user, io.BytesIO(content.encode()), import_format)
+
+    def test_import_csv(self):
+        result = self.import_file(CSV_FILE, 'csv')
+        self.assertEqual(result['processed'], 4)
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['duplicates'], 1)
+        self.assertEqual(result['invalid'], 1)
+        self.assertEqual(result['errors'][0]['row'], 4)
+
+        ana = Contact.objects.get(owner=self.user, email='ana@mail.com')
+        self.assertEqual(ana.phone_number, '+18095551234')
+        self.assertEqual(ana.company, 'ACME')
+
+    def test_import_vcard(self):
+        result = self.import_file(VCARD_FILE, 'vcard')
+        self.assertEqual(result['created'], 2)
+
+        luis = Contact.objects.get(owner=self.user, first_name='Luis')
+        self.assertEqual(luis.last_name, 'Gomez')
+        self.assertEqual(luis.phone_number, '+18095550000')
+        self.assertEqual(str(luis.birth_date), '1990-01-02')
+        self.assertEqual(luis.biography, 'Met at the park, on a sunny day')
+
+    def test_skip_existing_contacts(self):
+        """Contacts already on the account are matched by email or phone"""
+        Contact.objects.create(
+            owner=self.user, first_name='Luis', last_name='Gomez',
+            phone_number='+18095550000')
+        result = self.import_file(VCARD_FILE, 'vcard')
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['duplicates'], 1)
+
+
+class ImportContactsViewTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        return super().setUp()
+
+    @patch(CELERY_IMPORT_RESULT, Mock(return_value=Mock(
+        state='PENDING', info=None)))
+    @patch(CELERY_IMPORT)
+    def test_import_schedules_task(self, import_mock):
+        upload = SimpleUploadedFile('contacts.vcf', VCARD_FILE.encode())
+        response = self.client.post(
+            '/contacts/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        import_mock.assert_called_once()
+        self.assertEqual(
+            import_mock.call_args[1]['kwargs']['import_format'], 'vcard')
+        self.assertEqual(
+            import_mock.call_args[1]['task_id'], response.data['task'])
+        # Kept out of the media storage under a name that can't be guessed
+        path = import_mock.call_args[1]['kwargs']['path']
+        self.assertTrue(private_storage.exists(path))
+        self.assertNotIn(self.user.username, path)
+        self.assertNotIn('contacts.vcf', path)
+
+        # Pruned when the task never ran
+        with override_settings(CONTACTS_IMPORT_STATUS_TIMEOUT=-1):
+            self.assertEqual(prune_imports(), 1)
+        self.assertFalse(private_storage.exists(path))
+
+        # Polled by its owner only, whatever the state
+        url = f'/contacts/import/{response.data["task"]}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'state': 'PENDING'})
+
+        other = User.objects.create_user(
+            email='other@user.com', username='other_user',
+            password='Testpassword123')
+        self.client.force_authenticate(other)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get('/contacts/import/unknown-task/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unsupported_file(self):
+        upload = SimpleUploadedFile('contacts.txt', b'')
+        response = self.client.post(
+            '/contacts/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
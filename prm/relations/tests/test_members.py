@@ -0,0 +1,178 @@
+"""Activity partners and activity log companions tests"""
+
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Activity, ActivityLog, Contact
+
+# Serializers
+from ..serializers import OwnedCodeRelatedField
+
+PARTNERS_TABLE = Activity.partners.through._meta.db_table
+CONTACTS_QUERY = f'FROM "{Contact._meta.db_table}" WHERE'
+
+
+class ContactMembersTestCase(APITestCase):
+    """Many contacts are added or removed at once, checking only their own
+    membership"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+
+        self.contacts = [
+            Contact.objects.create(
+                owner=self.user, first_name=f'Contact {i}', last_name='Test')
+            for i in range(6)]
+        self.activity = Activity.objects.create(
+            owner=self.user, name='Running', description='Test')
+        self.activity.partners.set(self.contacts[:3])
+        self.log = ActivityLog.objects.create(
+            owner=self.user, activity=self.activity, details='Test',
+            date='2019-10-01')
+        self.activity_url = f'/activities/{self.activity.code}/'
+        self.log_url = f'{self.activity_url}logs/{self.log.code}/'
+        return super().setUp()
+
+    def codes(self, contacts):
+        return ','.join(contact.code for contact in contacts)
+
+    def test_add_partners(self):
+        new = self.contacts[3:]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                self.activity_url, {},
+                QUERY_STRING=f'contact={self.codes(new)}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.activity.partners.count(), 6)
+
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith(f'INSERT INTO "{PARTNERS_TABLE}"')]
+        self.assertEqual(len(inserts), 1)
+
+    def test_add_existing_partners(self):
+        contacts = self.contacts[2:4]
+        response = self.client.patch(
+            self.activity_url, {},
+            QUERY_STRING=f'contact={self.codes(contacts)}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(self.contacts[2].code, response.data['contact'][0])
+        self.assertNotIn(self.contacts[3].code, response.data['contact'][0])
+        self.assertEqual(self.activity.partners.count(), 3)
+
+    def test_remove_partners(self):
+        contacts = self.contacts[:2] + self.contacts[:1]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.delete(
+                f'{self.activity_url}?contact={self.codes(contacts)}')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            list(self.activity.partners.all()), self.contacts[2:3])
+
+        deletes = [
+            query for query in context.captured_queries
+            if query['sql'].startswith(f'DELETE FROM "{PARTNERS_TABLE}"')]
+        self.assertEqual(len(deletes), 1)
+
+    def test_remove_missing_partners(self):
+        contacts = self.contacts[2:4]
+        response = self.client.delete(
+            f'{self.activity_url}?contact={self.codes(contacts)}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(self.contacts[3].code, response.data['contact'][0])
+        self.assertEqual(self.activity.partners.count(), 3)
+
+    def test_add_and_remove_companions(self):
+        response = self.client.patch(
+            self.log_url, {},
+            QUERY_STRING=f'contact={self.codes(self.contacts[:4])}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['companions']), 4)
+
+        response = self.client.delete(
+            f'{self.log_url}?contact={self.codes(self.contacts[1:3])}')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            set(self.log.companions.all()),
+            {self.contacts[0], self.contacts[3]})
+
+        response = self.client.patch(
+            self.log_url, {}, QUERY_STRING=f'contact={self.contacts[0].code}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OwnedCodeRelatedFieldTestCase(APITestCase):
+    """Codes are resolved among the user's contacts, at once and once per
+    request"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.other = User.objects.create_user(
+            email='other@user.com',
+            username='other_user',
+            password='Testpassword123',
+            is_active=True)
+        self.contacts = [
+            Contact.objects.create(
+                owner=self.user, first_name=f'Contact {i}', last_name='Test')
+            for i in range(3)]
+        self.other_contact = Contact.objects.create(
+            owner=self.other, first_name='Other', last_name='Test')
+
+        request = Request(APIRequestFactory().get('/'))
+        request.user = self.user
+        self.context = {'request': request}
+        return super().setUp()
+
+    def get_field(self, **kwargs):
+        field = OwnedCodeRelatedField(
+            queryset=Contact.objects.all(), **kwargs)
+        field.bind('contact', None)
+        field._context = self.context
+        return field
+
+    def test_codes_resolved_with_one_query(self):
+        codes = [contact.code for contact in self.contacts]
+        field = self.get_field(many=True)
+        with CaptureQueriesContext(connection) as context:
+            contacts = field.run_validation(codes + codes[:1])
+            # Cached for the rest of the request
+            self.assertEqual(
+                self.get_field().run_validation(codes[1]), self.contacts[1])
+        self.assertEqual(contacts, self.contacts + self.contacts[:1])
+        self.assertEqual(
+            len([query for query in context.captured_queries
+                 if CONTACTS_QUERY in query['sql']]), 1)
+
+    def test_other_users_contacts_not_found(self):
+        with self.assertRaises(ValidationError) as context:
+            self.get_field().run_validation(self.other_contact.code)
+        self.assertIn(self.other_contact.code, str(context.exception))
+
+    def test_other_users_contacts_not_added(self):
+        activity = Activity.objects.create(
+            owner=self.user, name='Running', description='Test')
+        self.client.force_authenticate(self.user)
+        response = self.client.patch(
+            f'/activities/{activity.code}/', {},
+            QUERY_STRING=f'contact={self.other_contact.code}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(activity.partners.exists())
@@ -0,0 +1,74 @@
+"""Relations query count tests"""
+
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Contact, Activity, ActivityLog
+
+ROWS = 20
+
+
+class ListQueryCountTestCase(APITestCase):
+    """List endpoints must issue the same number of queries no matter how
+    many rows are on the page"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+
+        contacts = [
+            Contact.objects.create(
+                owner=self.user, first_name=f'Contact {i}', last_name='Test')
+            for i in range(ROWS)]
+
+        for i in range(ROWS):
+            activity = Activity.objects.create(
+                owner=self.user, name=f'Activity {i}', description='Test')
+            activity.partners.set(contacts[:3])
+
+        # Every log belongs to the last activity
+        self.activity = activity
+        for i in range(ROWS):
+            log = ActivityLog.objects.create(
+                owner=self.user, activity=self.activity, details='Test',
+                date='2019-10-01')
+            log.companions.set(contacts[:3])
+        return super().setUp()
+
+    def count_queries(self, url, limit):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'limit': limit})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), min(limit, ROWS))
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url):
+        self.assertEqual(self.count_queries(url, 1),
+                         self.count_queries(url, ROWS))
+
+    def test_contacts_list(self):
+        """Contact owner is loaded along with the contacts"""
+        self.assertConstantQueries('/contacts/')
+
+    def test_activities_list(self):
+        """Activity partners are prefetched"""
+        self.assertConstantQueries('/activities/')
+
+    def test_all_activity_logs_list(self):
+        """Logs from every activity load their activity and companions"""
+        self.assertConstantQueries('/activities/logs/')
+
+    def test_activity_logs_list(self):
+        """Logs of a single activity load their activity and companions"""
+        self.assertConstantQueries(f'/activities/{self.activity.code}/logs/')
@@ -0,0 +1,98 @@
+"""Contact reminders tests"""
+
+# Standard Library
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+# Django
+from django.test import override_settings
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import ActivityLog, Contact, ContactReminder
+
+# Tasks
+from ...taskapp.tasks import compute_contact_reminders
+
+TODAY = date(2019, 12, 1)
+
+
+@override_settings(CONTACT_REMINDER_INTERVAL=30)
+class ContactRemindersTestCase(APITestCase):
+    """Contacts without recent interactions are listed as reminders"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        return super().setUp()
+
+    def create_contact(self, first_name, added, last_log=None, **fields):
+        contact = Contact.objects.create(
+            owner=self.user, first_name=first_name, last_name='Test',
+            **fields)
+        Contact.objects.filter(pk=contact.pk).update(
+            created=timezone.make_aware(datetime.combine(added, time())))
+        if last_log:
+            log = ActivityLog.objects.create(
+                owner=self.user, details='Test', date=last_log)
+            log.companions.add(contact)
+        return contact
+
+    def test_rebuild(self):
+        old = TODAY - timedelta(days=90)
+        self.create_contact('Neglected', old, last_log=date(2019, 10, 1))
+        self.create_contact('Recent', old, last_log=date(2019, 11, 20))
+        self.create_contact('Never', old)
+        self.create_contact('New', TODAY - timedelta(days=5))
+        self.create_contact('Disabled', old, reminder_interval=0)
+        self.create_contact(
+            'Frequent', old, last_log=date(2019, 11, 20), reminder_interval=7)
+
+        created = ContactReminder.objects.rebuild([self.user.pk], TODAY)
+        self.assertEqual(created, 3)
+        reminders = {
+            reminder.contact.first_name: reminder
+            for reminder in ContactReminder.objects.select_related('contact')}
+        self.assertEqual(set(reminders), {'Neglected', 'Never', 'Frequent'})
+        self.assertEqual(reminders['Neglected'].due_date, date(2019, 10, 31))
+        self.assertIsNone(reminders['Never'].last_interaction)
+
+        # Rebuilding replaces the previous reminders
+        log = ActivityLog.objects.create(
+            owner=self.user, details='Test', date=TODAY)
+        log.companions.add(reminders['Neglected'].contact)
+        self.assertEqual(
+            ContactReminder.objects.rebuild([self.user.pk], TODAY), 2)
+
+    @patch('prm.taskapp.tasks.compute_users_contact_reminders.delay')
+    def test_task_batches_users(self, delay):
+        for i in range(2):
+            User.objects.create_user(
+                email=f'test{i}@user.com', username=f'test_user{i}',
+                password='Testpassword123')
+        with self.settings(CONTACT_REMINDERS_BATCH_SIZE=2):
+            compute_contact_reminders()
+        self.assertEqual(
+            [len(call[0][0]) for call in delay.call_args_list], [2, 1])
+
+    def test_list_reminders(self):
+        old = TODAY - timedelta(days=90)
+        self.create_contact('Neglected', old, last_log=date(2019, 10, 1))
+        self.create_contact('Never', old)
+        ContactReminder.objects.rebuild([self.user.pk], TODAY)
+
+        response = self.client.get('/contacts/reminders/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [
+            reminder['contact']['first_name']
+            for reminder in response.data['results']]
+        self.assertEqual(names, ['Never', 'Neglected'])
@@ -0,0 +1,77 @@
+"""Responses cache tests"""
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Contact
+
+# Mixins
+from ...utils.mixins import get_response_cache_metrics
+
+
+class ResponseCacheTestCase(APITransactionTestCase):
+    """Responses are cached by user until their data changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        self.contact = Contact.objects.create(
+            owner=self.user, first_name='Contact', last_name='Test')
+        return super().setUp()
+
+    def get_contacts(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/contacts/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queried = any(
+            Contact._meta.db_table in query['sql']
+            for query in context.captured_queries)
+        return response.data, queried
+
+    def test_cached_until_changed(self):
+        data, queried = self.get_contacts()
+        self.assertTrue(queried)
+        cached, queried = self.get_contacts()
+        self.assertFalse(queried)
+        self.assertEqual(cached, data)
+
+        self.contact.nickname = 'Nick'
+        self.contact.save()
+        data, queried = self.get_contacts()
+        self.assertTrue(queried)
+        self.assertEqual(data['results'][0]['nickname'], 'Nick')
+
+        self.assertEqual(get_response_cache_metrics(['contacts']), {
+            'response_cache.contacts.hits': 1,
+            'response_cache.contacts.misses': 2,
+        })
+
+    def test_cached_by_user(self):
+        self.get_contacts()
+        other = User.objects.create_user(
+            email='other@user.com', username='other_user',
+            password='Testpassword123')
+        self.client.force_authenticate(other)
+        data, queried = self.get_contacts()
+        self.assertTrue(queried)
+        self.assertEqual(data['results'], [])
+
+    @override_settings(RESPONSE_CACHE_DISABLED=['contacts'])
+    def test_disabled(self):
+        self.get_contacts()
+        _, queried = self.get_contacts()
+        self.assertTrue(queried)
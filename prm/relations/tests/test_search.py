@@ -0,0 +1,64 @@
+"""Contact search tests"""
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ..models import Contact
+from ..models.contacts import has_trigram_extension
+
+
+class ContactSearchTestCase(APITestCase):
+    """Contacts are searched by full text on their search vector"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        Contact.objects.create(
+            owner=self.user, first_name='Jonathan', last_name='Smith',
+            company='Acme')
+        Contact.objects.create(
+            owner=self.user, first_name='Maria', last_name='Jones',
+            biography='Met Jonathan at Acme', email='maria@mail.com')
+        other = User.objects.create_user(
+            email='other@user.com', username='other_user',
+            password='Testpassword123')
+        Contact.objects.create(
+            owner=other, first_name='Jonathan', last_name='Other')
+        return super().setUp()
+
+    def search(self, text):
+        response = self.client.get('/contacts/search/', {'q': text})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [contact['first_name'] for contact in response.data['results']]
+
+    def test_names_rank_first(self):
+        self.assertEqual(self.search('jonathan'), ['Jonathan', 'Maria'])
+
+    def test_prefixes_and_every_word(self):
+        self.assertEqual(self.search('jon smi'), ['Jonathan'])
+        self.assertEqual(self.search('maria'), ['Maria'])
+
+    def test_vector_follows_updates(self):
+        Contact.objects.filter(first_name='Maria').update(nickname='Mery')
+        self.assertEqual(self.search('mery'), ['Maria'])
+
+    def test_bulk_created_contacts(self):
+        Contact.objects.bulk_create([
+            Contact(owner=self.user, first_name='Bulk', last_name='Test')])
+        self.assertEqual(self.search('bulk'), ['Bulk'])
+
+    def test_query_is_required(self):
+        response = self.client.get('/contacts/search/', {'q': ' '})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_typos(self):
+        if not has_trigram_extension('default'):
+            self.skipTest('pg_trgm is not installed')
+        self.assertEqual(self.search('jonatan'), ['Jonathan'])
@@ -1,3 +1,6 @@
+# Django
+from django.db.models import Prefetch
+
 # Django REST Framework
 from rest_framework import mixins, viewsets, status
 from rest_framework.response import Response
@@ -11,7 +14,7 @@ from ..serializers import (
     ActivityLogModelSerializer)
 
 # Models
-from ..models import Activity, ActivityLog
+from ..models import Activity, ActivityLog, Contact
 
 # Permissions
 from rest_framework.permissions import IsAuthenticated
@@ -21,8 +24,17 @@ from prm.users.permissions import IsAccountOwner
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg.openapi import Parameter, IN_QUERY, TYPE_STRING
 
+# Mixins
+from ...utils.mixins import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    OptimizedQuerysetMixin)
+
 
-class ActivitiesViewSet(mixins.CreateModelMixin,
+class ActivitiesViewSet(ConditionalGetMixin,
+                        CachedResponseMixin,
+                        OptimizedQuerysetMixin,
+                        mixins.CreateModelMixin,
                         mixins.RetrieveModelMixin,
                         mixins.UpdateModelMixin,
                         mixins.DestroyModelMixin,
@@ -34,19 +46,41 @@ class ActivitiesViewSet(mixins.CreateModelMixin,
 
     lookup_field = 'code'
 
+    cursor_ordering = ('-created',)
+
+    select_related_lookups = {
+        'logs': ('activity',),
+    }
+    prefetch_related_lookups = {
+        'default': (
+            Prefetch('partners',
+                     queryset=Contact.objects.only('id', 'first_name')),
+        ),
+        'logs': (
+            Prefetch('companions',
+                     queryset=Contact.objects.only('id', 'first_name')),
+        ),
+        'destroy': (),
+    }
+
+    def get_cursor_ordering(self):
+        if self.action == 'logs':
+            return ('-date', '-created')
+        return self.cursor_ordering
+
     def get_queryset(self):
         queryset = Activity.objects.filter(owner=self.request.user)
         contact = self.request.query_params.get('contact', None)
 
         if contact is not None and self.action == 'list':
             queryset = queryset.filter(partners__code=contact)
-        return queryset
+        return self.optimize_queryset(queryset)
 
     @swagger_auto_schema(manual_parameters=[
         Parameter('contact', IN_QUERY,
                   description=(
-                      '(Optional) contact code. If present, will add '
-                      'the contact to the activities partners'),
+                      '(Optional) comma separated contact codes. If present, '
+                      'will add the contacts to the activity partners'),
                   type=TYPE_STRING),
     ])
     def partial_update(self, request, *args, **kwargs):
@@ -62,8 +96,8 @@ class ActivitiesViewSet(mixins.CreateModelMixin,
 
         activity = self.get_object()
         serializer = AddContactToActivitySerializer(
-            data={'contact': contact_code, },
-            context={'activity': activity, })
+            data={'contact': contact_code.split(','), },
+            context={**self.get_serializer_context(), 'activity': activity})
         serializer.is_valid(raise_exception=True)
         activity = serializer.save()
         data = self.get_serializer(activity).data
@@ -72,8 +106,8 @@ class ActivitiesViewSet(mixins.CreateModelMixin,
     @swagger_auto_schema(manual_parameters=[
         Parameter('contact', IN_QUERY,
                   description=(
-                      '(Optional) contact code. If present, will delete '
-                      'the contact to the activities partners'),
+                      '(Optional) comma separated contact codes. If present, '
+                      'will delete the contacts from the activity partners'),
                   type=TYPE_STRING),
     ])
     def destroy(self, request, *args, **kwargs):
@@ -88,9 +122,8 @@ class ActivitiesViewSet(mixins.CreateModelMixin,
 
         activity = self.get_object()
         serializer = RemoveContactFromActivitySerializer(
-            data={'contact': contact_code},
-            context={'activity': activity}
-        )
+            data={'contact': contact_code.split(',')},
+            context={**self.get_serializer_context(), 'activity': activity})
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -100,8 +133,8 @@ class ActivitiesViewSet(mixins.CreateModelMixin,
     @action(detail=False, methods=['get'])
     def logs(self, request):
         """Returns all logs from all activities"""
-        queryset = ActivityLog.objects.filter(
-            owner=self.request.user)
+        queryset = self.optimize_queryset(
+            ActivityLog.objects.filter(owner=self.request.user))
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = ActivityLogModelSerializer(page, many=True)
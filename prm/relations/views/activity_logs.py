@@ -1,6 +1,7 @@
 # TODO: Refactor activity and activity log viewsets on similar behaviors
 
 # Django
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 
 # Django REST Framework
@@ -14,7 +15,7 @@ from ..serializers import (
     RemoveContactFromActivityLogSerializer)
 
 # Models
-from ..models import Activity, ActivityLog
+from ..models import Activity, ActivityLog, Contact
 
 # Permissions
 from rest_framework.permissions import IsAuthenticated
@@ -24,8 +25,17 @@ from prm.users.permissions import IsAccountOwner
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg.openapi import Parameter, IN_QUERY, TYPE_STRING
 
+# Mixins
+from ...utils.mixins import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    OptimizedQuerysetMixin)
 
-class ActivitiyLogsViewSet(mixins.CreateModelMixin,
+
+class ActivitiyLogsViewSet(ConditionalGetMixin,
+                           CachedResponseMixin,
+                           OptimizedQuerysetMixin,
+                           mixins.CreateModelMixin,
                            mixins.RetrieveModelMixin,
                            mixins.UpdateModelMixin,
                            mixins.DestroyModelMixin,
@@ -37,11 +47,29 @@ class ActivitiyLogsViewSet(mixins.CreateModelMixin,
 
     lookup_field = 'code'
 
-    def dispatch(self, request, *args, **kwargs):
-        """Verify that the activity exists"""
-        activity_code = kwargs['activity']
-        self.activity = get_object_or_404(Activity, code=activity_code)
-        return super().dispatch(request, *args, **kwargs)
+    cursor_ordering = ('-date', '-created')
+
+    select_related_lookups = {
+        'default': ('activity',),
+        'destroy': (),
+    }
+    prefetch_related_lookups = {
+        'default': (
+            Prefetch('companions',
+                     queryset=Contact.objects.only('id', 'first_name')),
+        ),
+        'destroy': (),
+    }
+
+    def get_activity(self):
+        """The user's activity in the URL, only loaded by the actions that
+        need it and then shared by them. Logs are found joining on its
+        code instead."""
+        if not hasattr(self, '_activity'):
+            self._activity = get_object_or_404(
+                Activity, owner=self.request.user,
+                code=self.kwargs['activity'])
+        return self._activity
 
     def get_queryset(self):
         queryset = ActivityLog.objects.filter(
@@ -50,13 +78,21 @@ class ActivitiyLogsViewSet(mixins.CreateModelMixin,
 
         if contact is not None and self.action == 'list':
             queryset = queryset.filter(companions__code=contact)
-        return queryset
+        return self.optimize_queryset(queryset)
+
+    def paginate_queryset(self, queryset):
+        """An empty page can mean that the activity doesn't exist, only then
+        it is looked up"""
+        page = super().paginate_queryset(queryset)
+        if self.action == 'list' and page is not None and not page:
+            self.get_activity()
+        return page
 
     @swagger_auto_schema(manual_parameters=[
         Parameter('contact', IN_QUERY,
                   description=(
-                      '(Optional) contact code. If present, will add '
-                      'the contact to the activities log companions'),
+                      '(Optional) comma separated contact codes. If present, '
+                      'will add the contacts to the activity log companions'),
                   type=TYPE_STRING),
     ])
     def partial_update(self, request, *args, **kwargs):
@@ -72,8 +108,10 @@ class ActivitiyLogsViewSet(mixins.CreateModelMixin,
         # This is so the get queryset doesn't filter by contact
         activity_log = self.get_object()
         serializer = AddContactToActivityLogSerializer(
-            data={'contact': contact_code},
-            context={'activity_log': activity_log, })
+            data={'contact': contact_code.split(',')},
+            context={
+                **self.get_serializer_context(),
+                'activity_log': activity_log})
         serializer.is_valid(raise_exception=True)
         activity_log = serializer.save()
 
@@ -83,8 +121,9 @@ class ActivitiyLogsViewSet(mixins.CreateModelMixin,
     @swagger_auto_schema(manual_parameters=[
         Parameter('contact', IN_QUERY,
                   description=(
-                      '(Optional) contact code. If present, will delete '
-                      'the contact to the activities logs companions'),
+                      '(Optional) comma separated contact codes. If present, '
+                      'will delete the contacts from the activity log '
+                      'companions'),
                   type=TYPE_STRING),
     ])
     def destroy(self, request, *args, **kwargs):
@@ -99,12 +138,13 @@ class ActivitiyLogsViewSet(mixins.CreateModelMixin,
 
         activity_log = self.get_object()
         serializer = RemoveContactFromActivityLogSerializer(
-            data={'contact': contact_code},
-            context={'activity_log': activity_log}
-        )
+            data={'contact': contact_code.split(',')},
+            context={
+                **self.get_serializer_context(),
+                'activity_log': activity_log})
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user, activity=self.activity)
+        serializer.save(owner=self.request.user, activity=self.get_activity())
@@ -1,18 +1,59 @@
+# Django
+from django.db.models import F
+
 # Django REST Framework
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
 
 # Serializers
-from ..serializers import ContactModelSerializer
+from ..serializers import (
+    ContactModelSerializer,
+    ContactReminderModelSerializer)
 
 # Models
-from ..models import Contact
+from ..models import Contact, ContactReminder
 
 # Permissions
 from rest_framework.permissions import IsAuthenticated
 from prm.users.permissions import IsAccountOwner
 
+# Swagger
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.openapi import (
+    Parameter, IN_FORM, IN_QUERY, TYPE_FILE, TYPE_STRING)
+
+# Mixins
+from ...utils.mixins import (
+    BulkModelMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    OptimizedQuerysetMixin)
+
+# Imports
+from ..imports import (
+    IMPORT_FORMATS,
+    get_import_format,
+    get_import_owner,
+    set_import_owner)
+
+# Storages
+from ...utils.storages import save_private_file
+
+# Celery
+from celery.utils import uuid
+
+# Tasks
+from ...taskapp.tasks import import_contacts_from_storage
 
-class ContactsViewSet(mixins.CreateModelMixin,
+
+class ContactsViewSet(ConditionalGetMixin,
+                      CachedResponseMixin,
+                      OptimizedQuerysetMixin,
+                      BulkModelMixin,
+                      mixins.CreateModelMixin,
                       mixins.RetrieveModelMixin,
                       mixins.UpdateModelMixin,
                       mixins.DestroyModelMixin,
@@ -24,8 +65,150 @@ class ContactsViewSet(mixins.CreateModelMixin,
 
     lookup_field = 'code'
 
+    cursor_ordering = ('-created',)
+
+    select_related_lookups = {
+        'default': ('owner', 'stats'),
+        'destroy': (),
+    }
+
+    # Values of the 'ordering' query param, contacts without interactions
+    # go last either way
+    orderings = {
+        'last_interaction': (
+            F('stats__last_interaction').asc(nulls_last=True), '-created'),
+        '-last_interaction': (
+            F('stats__last_interaction').desc(nulls_last=True), '-created'),
+    }
+
+    def get_ordering(self):
+        ordering = self.request.query_params.get('ordering')
+        if ordering and ordering not in self.orderings:
+            raise ValidationError({'message': (
+                f"'ordering' must be one of {', '.join(self.orderings)}")})
+        return self.orderings.get(ordering)
+
     def get_queryset(self):
-        return Contact.objects.filter(owner=self.request.user)
+        queryset = Contact.objects.filter(owner=self.request.user)
+        if self.action == 'list' and self.get_ordering():
+            queryset = queryset.order_by(*self.get_ordering())
+        return self.optimize_queryset(queryset)
+
+    def get_cursor_ordering(self):
+        """Custom orderings are paginated by limit and offset"""
+        if self.action == 'reminders':
+            return ('due_date', 'id')
+        if self.action == 'search' or self.get_ordering():
+            return None
+        return self.cursor_ordering
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
+
+    def perform_bulk_create(self, serializer):
+        super().perform_bulk_create(serializer)
+        # New contacts have no stats, don't query them one by one
+        for contact in serializer.instance:
+            Contact.stats.related.set_cached_value(contact, None)
+
+    @swagger_auto_schema(manual_parameters=[
+        Parameter('ordering', IN_QUERY, enum=sorted(orderings),
+                  description='Order contacts by their last interaction',
+                  type=TYPE_STRING),
+    ])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(manual_parameters=[
+        Parameter('q', IN_QUERY, required=True, type=TYPE_STRING,
+                  description='Words to look for on the contacts'),
+    ])
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Contacts matching the 'q' query param on their names, email,
+           company, biography or how you met, the most relevant first"""
+        text = request.query_params.get('q', '')
+        if not text.strip():
+            return Response({'message': "'q' param is required"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset().search(text)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'],
+            serializer_class=ContactReminderModelSerializer)
+    def reminders(self, request):
+        """Contacts without interactions for longer than their reminder
+           interval, the most neglected first. Computed once a day."""
+        queryset = (
+            ContactReminder.objects
+            .filter(owner=request.user)
+            .select_related('contact'))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @swagger_auto_schema(
+        manual_parameters=[Parameter(
+            'file', IN_FORM, type=TYPE_FILE, required=True,
+            description='CSV (.csv) or vCard (.vcf, .vcard) file')],
+        responses={status.HTTP_202_ACCEPTED: 'Import scheduled'})
+    @action(detail=False, methods=['post'], url_path='import',
+            parser_classes=[MultiPartParser])
+    def import_file(self, request):
+        """Imports contacts from a CSV or vCard file in the background,
+           skipping the ones whose email or phone number already exist.
+           Poll the returned status url for the progress."""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': 'Missing file'},
+                            status.HTTP_400_BAD_REQUEST)
+
+        import_format = get_import_format(upload.name)
+        if import_format is None:
+            extensions = ', '.join(
+                extension for extensions in IMPORT_FORMATS.values()
+                for extension in extensions)
+            return Response(
+                {'file': f'Unsupported file, use one of: {extensions}'},
+                status.HTTP_400_BAD_REQUEST)
+
+        # Workers read the file from storage, not from the request
+        path = save_private_file('imports', import_format, upload)
+        # Owned before the task can report any progress
+        task_id = uuid()
+        set_import_owner(task_id, request.user.pk)
+        import_contacts_from_storage.apply_async(kwargs={
+            'user_pk': request.user.pk,
+            'path': path,
+            'import_format': import_format,
+        }, task_id=task_id)
+
+        data = {
+            'task': task_id,
+            'status': request.build_absolute_uri(f'{task_id}/'),
+        }
+        return Response(data, status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'],
+            url_path=r'import/(?P<task_id>[-a-zA-Z0-9]+)')
+    def import_status(self, request, task_id):
+        """Progress of a contacts import"""
+        if get_import_owner(task_id) != request.user.pk:
+            raise NotFound()
+        result = import_contacts_from_storage.AsyncResult(task_id)
+        if not isinstance(result.info, dict):
+            # Queued or failed, there's no progress to report
+            return Response({'state': result.state})
+
+        info = result.info.copy()
+        info.pop('user', None)
+        return Response({'state': result.state, **info})
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = 'prm.search'
+    verbose_name = 'Search'
+
+    def ready(self):
+        from . import signals  # noqa F401
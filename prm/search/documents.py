@@ -0,0 +1,168 @@
+"""Search document types.
+
+Each type turns an object of its model into the fields of its search
+document. Names of contacts and activities are also indexed on the
+objects that reference them, so "hiking with Ana" finds the log.
+
+Writes schedule their objects to be indexed once the transaction commits,
+so every object changed by a request is indexed in a single batch.
+"""
+
+# Standard Library
+import threading
+
+# Django
+from django.db import transaction
+from django.db.models import Prefetch
+
+# Models
+from .models import SearchDocument
+from ..journals.models import Event, Mood
+from ..relations.models import Activity, ActivityLog, Contact
+
+# Kinds
+from ..relations.kinds import KindType
+
+
+def join(*values):
+    return ' '.join(str(value) for value in values if value)
+
+
+def contact_names():
+    return Contact.objects.only('id', 'first_name', 'last_name', 'nickname')
+
+
+def get_contact_name(contact):
+    return join(contact.first_name, contact.last_name, contact.nickname)
+
+
+class DocumentType(KindType):
+    """Base document type, `get_queryset` returns the objects along with
+       the related ones `get_fields` uses"""
+
+    def get_fields(self, obj):
+        """Returns the code, title, body and date of the document"""
+        raise NotImplementedError
+
+
+class ContactDocumentType(DocumentType):
+    model = Contact
+
+    def get_fields(self, contact):
+        return {
+            'code': contact.code,
+            'title': join(
+                contact.first_name, contact.middle_name, contact.last_name),
+            'body': join(
+                contact.nickname, contact.email, contact.phone_number,
+                contact.company, contact.position, contact.biography,
+                contact.met),
+            'date': None,
+        }
+
+
+class ActivityDocumentType(DocumentType):
+    model = Activity
+
+    def get_queryset(self):
+        return super().get_queryset().prefetch_related(
+            Prefetch('partners', queryset=contact_names()))
+
+    def get_fields(self, activity):
+        return {
+            'code': activity.code,
+            'title': activity.name,
+            'body': join(
+                activity.description,
+                *map(get_contact_name, activity.partners.all())),
+            'date': activity.last_time,
+        }
+
+
+class ActivityLogDocumentType(DocumentType):
+    model = ActivityLog
+
+    def get_queryset(self):
+        return (
+            super().get_queryset()
+            .select_related('activity')
+            .prefetch_related(
+                Prefetch('companions', queryset=contact_names())))
+
+    def get_fields(self, log):
+        return {
+            'code': log.code,
+            'title': log.activity.name if log.activity else 'Activity log',
+            'body': join(
+                log.details, log.location,
+                *map(get_contact_name, log.companions.all())),
+            'date': log.date,
+        }
+
+
+class EventDocumentType(DocumentType):
+    model = Event
+
+    def get_queryset(self):
+        return super().get_queryset().prefetch_related(
+            Prefetch('contacts', queryset=contact_names()))
+
+    def get_fields(self, event):
+        return {
+            'code': event.code,
+            'title': event.title,
+            'body': join(
+                event.description, event.location,
+                *map(get_contact_name, event.contacts.all())),
+            'date': event.date,
+        }
+
+
+class MoodDocumentType(DocumentType):
+    model = Mood
+
+    def get_fields(self, mood):
+        return {
+            'code': mood.date.isoformat(),
+            'title': mood.get_mood_display(),
+            'body': join(mood.hightlights, mood.description),
+            'date': mood.date,
+        }
+
+
+DOCUMENT_TYPES = {
+    document_type.model: document_type
+    for document_type in (
+        ContactDocumentType(),
+        ActivityDocumentType(),
+        ActivityLogDocumentType(),
+        EventDocumentType(),
+        MoodDocumentType(),
+    )
+}
+
+
+def get_document_type(model):
+    return DOCUMENT_TYPES.get(model)
+
+
+_pending = threading.local()
+
+
+def schedule_index(model, ids):
+    """Indexes the objects, or removes the documents of the deleted ones,
+       after the current transaction commits"""
+    if not hasattr(_pending, 'objects'):
+        _pending.objects = {}
+    _pending.objects.setdefault(model, set()).update(ids)
+    # Every write registers the callback, the first one to run indexes
+    # the pending objects. Ids left by a rolled back transaction are
+    # indexed along with the next one, which is harmless.
+    transaction.on_commit(flush_index)
+
+
+def flush_index():
+    pending = getattr(_pending, 'objects', {})
+    _pending.objects = {}
+    for model, ids in pending.items():
+        SearchDocument.objects.index(model, ids)
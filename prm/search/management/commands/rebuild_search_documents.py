@@ -0,0 +1,44 @@
+"""Search documents rebuild command."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Models
+from prm.search.models import SearchDocument
+
+# Documents
+from prm.search.documents import DOCUMENT_TYPES
+
+# Utils
+from prm.relations.imports import chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Indexes every contact, activity, activity log, event and mood, or '
+        'the ones of the given users, in chunks. Documents are kept up to '
+        'date on writes, run it after loading data without signals.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', dest='usernames', action='append', default=[],
+            help='Only index the objects of this user, repeatable')
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Objects indexed per transaction')
+
+    def handle(self, *args, **options):
+        for model, document_type in DOCUMENT_TYPES.items():
+            objs = model._default_manager.order_by('pk')
+            if options['usernames']:
+                objs = objs.filter(owner__username__in=options['usernames'])
+            ids = objs.values_list('pk', flat=True).iterator(
+                chunk_size=options['chunk_size'])
+
+            indexed = 0
+            for chunk in chunks(ids, options['chunk_size']):
+                with transaction.atomic():
+                    indexed += len(SearchDocument.objects.index(model, chunk))
+            self.stdout.write(self.style.SUCCESS(
+                f'Indexed {indexed} {document_type.kind} documents'))
@@ -0,0 +1,76 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:09
+
+from django.conf import settings
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# Keeps search_vector up to date on every insert or update, bulk ones
+# included. Titles weigh more than bodies.
+CREATE_TRIGGER = '''
+CREATE FUNCTION search_searchdocument_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.body, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER search_searchdocument_vector_update
+BEFORE INSERT OR UPDATE OF title, body
+ON search_searchdocument
+FOR EACH ROW EXECUTE PROCEDURE search_searchdocument_vector();
+'''
+
+DROP_TRIGGER = '''
+DROP TRIGGER search_searchdocument_vector_update ON search_searchdocument;
+DROP FUNCTION search_searchdocument_vector();
+'''
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Datetime on which the object was created.', verbose_name='created at ')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Datetime on which the object was last modified.', verbose_name='modified at ')),
+                ('kind', models.CharField(choices=[('contact', 'Contact'), ('activity', 'Activity'), ('activity_log', 'Activity log'), ('event', 'Event'), ('mood', 'Mood')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('code', models.CharField(help_text='Identifier of the object on the API', max_length=20)),
+                ('title', models.CharField(max_length=300)),
+                ('body', models.TextField(blank=True)),
+                ('date', models.DateField(blank=True, null=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Title and body, maintained by a database trigger', null=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created', '-modified'],
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='search_document_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=models.Index(fields=['owner', 'kind'], name='search_document_owner_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
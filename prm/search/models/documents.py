@@ -0,0 +1,171 @@
+# Django
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchRank, SearchVectorField
+from django.db import models
+from django.db.models import F, Func, TextField
+from django.utils import timezone
+
+# Models
+from ...utils import PRMModel
+
+# Kinds
+from ...relations.kinds import KIND_CHOICES
+
+# Search
+from ...utils.search import SEARCH_CONFIG, prefix_search_query
+
+
+# Characters escaped by django.utils.html.escape, ampersands first
+HTML_ESCAPES = (
+    ('&', '&amp;'),
+    ('<', '&lt;'),
+    ('>', '&gt;'),
+    ('"', '&quot;'),
+    ("'", '&#x27;'),
+)
+
+
+def quote_literal(text):
+    return "'{}'".format(text.replace("'", "''"))
+
+
+class HTMLEscape(Func):
+    """Text escaped for HTML, like django.utils.html.escape"""
+
+    template = '%(expressions)s'
+    for character, entity in HTML_ESCAPES:
+        template = 'replace({}, {}, {})'.format(
+            template, quote_literal(character), quote_literal(entity))
+    output_field = TextField()
+
+
+class Headline(Func):
+    """HTML of the text with the words matching the query highlighted,
+       ts_headline. The text is escaped first, so only the highlights are
+       markup. `options` is inlined on the SQL, it must not come from
+       users."""
+
+    function = 'ts_headline'
+    template = (
+        f"%(function)s('{SEARCH_CONFIG}'::regconfig, %(expressions)s, "
+        "'StartSel=<mark>, StopSel=</mark>, %(options)s')")
+    output_field = TextField()
+
+    def __init__(self, expression, query, options='HighlightAll=true'):
+        super().__init__(HTMLEscape(expression), query, options=options)
+
+
+class SearchDocumentManager(models.Manager):
+    """Search document manager"""
+
+    def index(self, model, ids):
+        """Creates or updates the documents of the objects of the model,
+           deleting the ones of objects that no longer exist. Costs the
+           same queries whatever the number of objects."""
+        from ..documents import get_document_type
+
+        document_type = get_document_type(model)
+        ids = set(ids)
+        if not document_type or not ids:
+            return []
+
+        objs = document_type.get_queryset().filter(pk__in=ids)
+        documents = {
+            obj.pk: self.model(
+                kind=document_type.kind, object_id=obj.pk,
+                owner_id=obj.owner_id, **document_type.get_fields(obj))
+            for obj in objs}
+        self.remove(model, ids - set(documents))
+        if not documents:
+            return []
+
+        existing = dict(
+            self.filter(kind=document_type.kind, object_id__in=documents)
+            .values_list('object_id', 'pk'))
+        now = timezone.now()
+        for document in documents.values():
+            document.pk = existing.get(document.object_id)
+            document.modified = now
+        self.bulk_update(
+            [document for document in documents.values() if document.pk],
+            ['code', 'title', 'body', 'date', 'modified'])
+        # A concurrent index may have created the document meanwhile
+        self.bulk_create(
+            [document for document in documents.values()
+             if not document.pk],
+            ignore_conflicts=True)
+        return list(documents.values())
+
+    def remove(self, model, ids):
+        from ..documents import get_document_type
+
+        document_type = get_document_type(model)
+        if document_type and ids:
+            self.filter(
+                kind=document_type.kind, object_id__in=ids).delete()
+
+    def search(self, owner, text, kinds=None):
+        """Documents of the owner matching every word of the text by
+           prefix, the most relevant first, along with the `rank` and the
+           highlighted `title_headline` and `body_headline`."""
+        query = prefix_search_query(text)
+        if query is None:
+            return self.none()
+
+        queryset = self.filter(owner=owner, search_vector=query)
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        return (
+            queryset
+            .annotate(
+                rank=SearchRank(F('search_vector'), query),
+                title_headline=Headline('title', query),
+                body_headline=Headline(
+                    'body', query, options='MaxFragments=2, MaxWords=20'))
+            .order_by('-rank', '-date', '-id'))
+
+
+class SearchDocument(PRMModel):
+    """
+    Searchable text of a contact, activity, activity log, event or mood,
+    one per object, so every kind is searched with a single indexed query.
+    Kept up to date by signals, see `prm.search.documents`.
+    """
+
+    owner = models.ForeignKey('users.User', on_delete=models.CASCADE)
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+
+    object_id = models.PositiveIntegerField()
+
+    code = models.CharField(
+        max_length=20, help_text='Identifier of the object on the API')
+
+    title = models.CharField(max_length=300)
+
+    body = models.TextField(blank=True)
+
+    date = models.DateField(blank=True, null=True)
+
+    # Uses the SEARCH_CONFIG configuration, see 0001_initial
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text='Title and body, maintained by a database trigger')
+
+    objects = SearchDocumentManager()
+
+    def __str__(self):
+        return f'{self.kind} {self.code} of {self.owner_id}'
+
+    class Meta(PRMModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'],
+                     name='search_document_vector_idx'),
+            models.Index(fields=['owner', 'kind'],
+                         name='search_document_owner_idx'),
+        ]
@@ -0,0 +1 @@
+from .documents import *
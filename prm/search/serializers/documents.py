@@ -0,0 +1,24 @@
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from ..models import SearchDocument
+
+
+class SearchDocumentModelSerializer(serializers.ModelSerializer):
+    """Search hit serializer, `code` identifies the object on the
+       endpoint of its type"""
+
+    type = serializers.CharField(source='kind')
+
+    rank = serializers.FloatField()
+
+    title_headline = serializers.CharField()
+
+    body_headline = serializers.CharField()
+
+    class Meta:
+        model = SearchDocument
+        fields = ('type', 'code', 'title', 'date', 'rank',
+                  'title_headline', 'body_headline')
+        read_only_fields = fields
@@ -0,0 +1,90 @@
+"""Search signals."""
+
+# Django
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete)
+from django.dispatch import receiver
+
+# Models
+from ..journals.models import Event
+from ..relations.models import Activity, ActivityLog, Contact
+
+# Signals
+from ..relations.signals import get_relation_changes
+from ..utils.signals import bulk_saved
+
+# Transactions
+from ..utils.transactions import get_deleted_users
+
+# Documents
+from .documents import DOCUMENT_TYPES, schedule_index
+
+# Kinds
+from ..relations.kinds import CONTACT_RELATIONS
+
+
+def get_referencing_objects(instance):
+    """Objects whose documents hold the name of the contact or activity,
+       as (model, ids) pairs"""
+    if isinstance(instance, Contact):
+        return [
+            (model, getattr(model, relation).through.objects
+             .filter(contact_id=instance.pk)
+             .values_list(f'{model._meta.model_name}_id', flat=True))
+            for model, relation in CONTACT_RELATIONS.items()]
+    if isinstance(instance, Activity):
+        return [(ActivityLog, instance.activitylog_set.values_list(
+            'pk', flat=True))]
+    return []
+
+
+def schedule_referencing_objects(referencing_objects):
+    for model, ids in referencing_objects:
+        schedule_index(model, ids)
+
+
+@receiver(post_save)
+def index_saved_object(sender, instance, created, **kwargs):
+    if sender not in DOCUMENT_TYPES:
+        return
+    schedule_index(sender, [instance.pk])
+    if not created:
+        schedule_referencing_objects(get_referencing_objects(instance))
+
+
+@receiver(bulk_saved)
+def index_bulk_saved_objects(sender, objs, **kwargs):
+    if sender in DOCUMENT_TYPES:
+        schedule_index(
+            sender, [obj.pk for obj in objs if obj.pk is not None])
+
+
+@receiver(pre_delete)
+def collect_referencing_objects(sender, instance, **kwargs):
+    """Evaluated before the relations are deleted along with the object"""
+    if sender in DOCUMENT_TYPES:
+        instance._search_referencing_objects = [
+            (model, list(ids))
+            for model, ids in get_referencing_objects(instance)]
+
+
+@receiver(post_delete)
+def remove_deleted_object(sender, instance, **kwargs):
+    # Documents of deleted users go along with them
+    if sender not in DOCUMENT_TYPES or instance.owner_id in get_deleted_users():
+        return
+    schedule_index(sender, [instance.pk])
+    schedule_referencing_objects(instance._search_referencing_objects)
+
+
+@receiver(m2m_changed, sender=ActivityLog.companions.through)
+@receiver(m2m_changed, sender=Event.contacts.through)
+@receiver(m2m_changed, sender=Activity.partners.through)
+def index_changed_relations(**kwargs):
+    """Contact names are indexed on the objects holding the relation"""
+    changes = get_relation_changes(**kwargs)
+    if changes:
+        schedule_index(changes[0], changes[1])
@@ -0,0 +1,117 @@
+"""Global search tests"""
+
+# Standard Library
+from io import StringIO
+
+# Django
+from django.core.management import call_command
+
+# Django REST Framework
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ...journals.models import Event, Mood
+from ...relations.models import Activity, ActivityLog, Contact
+from ..models import SearchDocument
+
+
+class GlobalSearchTestCase(APITransactionTestCase):
+    """Documents follow the objects once transactions commit, so these
+       tests don't wrap each test in a transaction"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        self.ana = Contact.objects.create(
+            owner=self.user, first_name='Ana', last_name='Lopez')
+        self.activity = Activity.objects.create(
+            owner=self.user, name='Hiking', description='Mountains')
+        self.log = ActivityLog.objects.create(
+            owner=self.user, activity=self.activity, details='Long trail',
+            date='2019-10-01')
+        self.log.companions.add(self.ana)
+        return super().setUp()
+
+    def search(self, text, **params):
+        response = self.client.get('/search/', {'q': text, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(hit['type'], hit['code'])
+                for hit in response.data['results']]
+
+    def test_search_across_types(self):
+        Event.objects.create(
+            owner=self.user, title='Ana birthday', location='Home',
+            date='2019-11-01', start_time='10:00', end_time='11:00')
+        Mood.objects.upsert_for_day(
+            self.user, '2019-10-01', mood=Mood.HAPPY,
+            description='Hiking all day')
+
+        hits = self.search('hiking ana')
+        self.assertEqual(hits, [('activity_log', self.log.code)])
+
+        types = {hit_type for hit_type, _ in self.search('ana')}
+        self.assertEqual(types, {'contact', 'activity_log', 'event'})
+        self.assertEqual(
+            self.search('hiking', type='mood'), [('mood', '2019-10-01')])
+
+    def test_highlighting(self):
+        response = self.client.get('/search/', {'q': 'trail'})
+        hit = response.data['results'][0]
+        self.assertIn('<mark>trail</mark>', hit['body_headline'])
+
+    def test_highlighting_escapes_text(self):
+        """Only the highlights are markup"""
+        Mood.objects.upsert_for_day(
+            self.user, '2019-10-01', mood=Mood.HAPPY,
+            description='<img src=x onerror="alert(1)"> Tom & Jerry\'s trail')
+        response = self.client.get('/search/', {'q': 'trail', 'type': 'mood'})
+        headline = response.data['results'][0]['body_headline']
+        self.assertIn('&quot;&gt; Tom &amp; Jerry&#x27;s', headline)
+        self.assertIn('<mark>trail</mark>', headline)
+        text = headline.replace('<mark>', '').replace('</mark>', '')
+        for character in '<>"\'':
+            self.assertNotIn(character, text)
+
+    def test_renames_are_indexed(self):
+        self.ana.first_name = 'Anabel'
+        self.ana.save()
+        self.activity.name = 'Trekking'
+        self.activity.save()
+        self.assertIn(('activity_log', self.log.code),
+                      self.search('trekking anabel'))
+
+    def test_deletes_are_indexed(self):
+        self.ana.delete()
+        self.assertEqual(self.search('ana'), [])
+        self.log.delete()
+        self.assertEqual(self.search('trail'), [])
+
+    def test_bulk_created_objects(self):
+        self.client.post(
+            '/contacts/bulk/', [{'first_name': 'Bulk', 'last_name': 'Test'}],
+            format='json')
+        self.assertEqual(len(self.search('bulk')), 1)
+
+    def test_other_users_documents(self):
+        other = User.objects.create_user(
+            email='other@user.com', username='other_user',
+            password='Testpassword123')
+        Contact.objects.create(owner=other, first_name='Ana', last_name='X')
+        self.assertEqual(len(self.search('ana', type='contact')), 1)
+
+    def test_invalid_params(self):
+        response = self.client.get('/search/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/search/', {'q': 'ana', 'type': 'user'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_command(self):
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_documents', stdout=StringIO())
+        self.assertEqual(SearchDocument.objects.count(), 3)
@@ -0,0 +1,18 @@
+"""Search urls"""
+
+# Django
+from django.urls import path, include
+
+# Django REST Framework
+from rest_framework.routers import DefaultRouter
+
+# Views
+from .views import search as search_views
+
+router = DefaultRouter()
+
+router.register(r'search', search_views.SearchViewSet, basename='search')
+
+urlpatterns = [
+    path('', include(router.urls))
+]
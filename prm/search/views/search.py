@@ -0,0 +1,61 @@
+# Django REST Framework
+from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import ValidationError
+
+# Serializers
+from ..serializers import SearchDocumentModelSerializer
+
+# Models
+from ..models import SearchDocument
+
+# Kinds
+from ...relations.kinds import KIND_CHOICES
+
+# Permissions
+from rest_framework.permissions import IsAuthenticated
+
+# Swagger
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.openapi import Parameter, IN_QUERY, TYPE_STRING
+
+
+class SearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Search across contacts, activities, activity logs, events and
+       moods"""
+
+    serializer_class = SearchDocumentModelSerializer
+    permission_classes = [IsAuthenticated]
+
+    kinds = [kind for kind, _ in KIND_CHOICES]
+
+    def get_kinds(self):
+        kinds = self.request.query_params.get('type')
+        if not kinds:
+            return None
+        kinds = kinds.split(',')
+        invalid = set(kinds) - set(self.kinds)
+        if invalid:
+            raise ValidationError({'message': (
+                f"'type' must be a comma separated list of "
+                f"{', '.join(self.kinds)}")})
+        return kinds
+
+    def get_queryset(self):
+        text = self.request.query_params.get('q', '')
+        if not text.strip():
+            raise ValidationError({'message': "'q' param is required"})
+        return SearchDocument.objects.search(
+            self.request.user, text, self.get_kinds())
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            Parameter('q', IN_QUERY, required=True, type=TYPE_STRING,
+                      description='Words to look for'),
+            Parameter('type', IN_QUERY, type=TYPE_STRING,
+                      description='Comma separated types to search, '
+                                  'defaults to every type'),
+        ],
+        responses={status.HTTP_200_OK: SearchDocumentModelSerializer})
+    def list(self, request, *args, **kwargs):
+        """Ranked hits with the matching words highlighted"""
+        return super().list(request, *args, **kwargs)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    name = 'prm.sync'
+    verbose_name = 'Sync'
+
+    def ready(self):
+        from . import signals  # noqa F401
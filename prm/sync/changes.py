@@ -0,0 +1,245 @@
+"""Delta sync.
+
+Clients keep the token returned by their last sync and get back the
+objects created or updated since then, found by their `modified` dates,
+along with the codes of the deleted ones, found on their tombstones.
+Both are read with (owner, modified) index scans.
+
+Syncs return at most SYNC_PAGE_SIZE objects and codes. When more are left
+the token returned continues the same sync where the page stopped, by the
+(modified, id) of the last row, until a page says there's nothing more.
+
+Synced objects reference each other by code, so renaming a contact
+doesn't change the activity logs it's part of. Changes to relations touch
+the `modified` date of the objects holding them, see `prm.sync.signals`.
+Deleting a contact or an activity doesn't touch the objects referencing
+it, clients drop the references along with the deleted object.
+"""
+
+# Standard Library
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+# Django
+from django.conf import settings
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from django.utils.http import base36_to_int, int_to_base36
+
+# Models
+from .models import Tombstone
+from ..journals.models import Event, Mood
+from ..relations.models import Activity, ActivityLog, Contact
+
+# Serializers
+from .serializers import (
+    ActivityLogSyncSerializer,
+    ActivitySyncSerializer,
+    ContactSyncSerializer,
+    EventSyncSerializer,
+    MoodSyncSerializer)
+
+# Kinds
+from ..relations.kinds import KindType
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class ExpiredToken(Exception):
+    pass
+
+
+# Where a sync that has more changes left continues: the moment of the
+# token it ends with, the section reached, deletions first and then every
+# sync type, and the (modified, id) of the last row returned in it
+Position = namedtuple('Position', ['until', 'section', 'after'])
+
+
+def encode_moment(moment):
+    """Microseconds since the epoch in base 36"""
+    return int_to_base36((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_moment(value):
+    return EPOCH + timedelta(microseconds=base36_to_int(value))
+
+
+def make_token(moment, position=None):
+    """Opaque token of a moment, followed by the position of the sync to
+       continue if any"""
+    if position is None:
+        return encode_moment(moment)
+    modified, pk = position.after or (None, None)
+    return '.'.join([
+        encode_moment(moment) if moment else '',
+        encode_moment(position.until),
+        int_to_base36(position.section),
+        encode_moment(modified) if modified else '',
+        int_to_base36(pk) if pk else '',
+    ])
+
+
+def parse_token(token):
+    """Returns the moment of the token and the position to continue from,
+       tokens older than the tombstones kept raise ExpiredToken"""
+    try:
+        if '.' not in token:
+            moment, position = decode_moment(token), None
+        else:
+            since, until, section, modified, pk = token.split('.')
+            moment = decode_moment(since) if since else None
+            after = (decode_moment(modified), base36_to_int(pk)) if (
+                modified and pk) else None
+            position = Position(
+                decode_moment(until), base36_to_int(section), after)
+    except (ValueError, OverflowError):
+        raise InvalidToken(token)
+    if moment is not None and moment < timezone.now() - timedelta(
+            days=settings.SYNC_TOMBSTONE_DAYS):
+        raise ExpiredToken(token)
+    return moment, position
+
+
+def filter_changes(queryset, since=None, after=None):
+    """Rows modified since the moment, in sync order, after the
+       (modified, id) given"""
+    if since is not None:
+        queryset = queryset.filter(modified__gt=since)
+    if after is not None:
+        modified, pk = after
+        queryset = queryset.filter(modified__gte=modified).exclude(
+            Q(modified=modified) & Q(id__lte=pk))
+    return queryset.order_by('modified', 'id')
+
+
+def contact_codes():
+    return Contact.objects.only('id', 'code')
+
+
+class SyncType(KindType):
+    """Base sync type, `get_queryset` returns the objects along with the
+       related ones the serializer uses"""
+
+    serializer_class = None
+
+    def get_lookup(self, obj):
+        """Identifier of the object on the API"""
+        return obj.code
+
+    def get_changed(self, owner, since=None, after=None):
+        """Objects of the owner changed since the moment, in sync order"""
+        return filter_changes(
+            self.get_queryset().filter(owner=owner), since, after)
+
+    def serialize(self, objs):
+        return self.serializer_class(objs, many=True).data
+
+
+class ContactSyncType(SyncType):
+    model = Contact
+    serializer_class = ContactSyncSerializer
+
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
+class ActivitySyncType(SyncType):
+    model = Activity
+    serializer_class = ActivitySyncSerializer
+
+    def get_queryset(self):
+        return super().get_queryset().prefetch_related(
+            Prefetch('partners', queryset=contact_codes()))
+
+
+class ActivityLogSyncType(SyncType):
+    model = ActivityLog
+    serializer_class = ActivityLogSyncSerializer
+
+    def get_queryset(self):
+        return (
+            super().get_queryset()
+            .select_related('activity')
+            .prefetch_related(
+                Prefetch('companions', queryset=contact_codes())))
+
+
+class EventSyncType(SyncType):
+    model = Event
+    serializer_class = EventSyncSerializer
+
+    def get_queryset(self):
+        return super().get_queryset().prefetch_related(
+            Prefetch('contacts', queryset=contact_codes()))
+
+
+class MoodSyncType(SyncType):
+    model = Mood
+    serializer_class = MoodSyncSerializer
+
+    def get_lookup(self, mood):
+        return str(mood.date)
+
+
+SYNC_TYPES = {
+    sync_type.model: sync_type
+    for sync_type in (
+        ContactSyncType(),
+        ActivitySyncType(),
+        ActivityLogSyncType(),
+        EventSyncType(),
+        MoodSyncType(),
+    )
+}
+
+
+def get_sync_type(model):
+    return SYNC_TYPES.get(model)
+
+
+def get_changes(owner, since=None, position=None):
+    """Returns the objects of the owner changed and the codes of the ones
+       deleted since the given moment, by kind, along with the token of
+       the next sync. Kinds without changes are left out. The next token
+       is SYNC_OVERLAP seconds behind, so changes committed by slower
+       transactions aren't missed, at the cost of syncing them twice.
+
+       Once SYNC_PAGE_SIZE rows are returned `more` is set and the token
+       continues from the given position, the last page may be empty."""
+    if position is None:
+        position = Position(
+            timezone.now() - timedelta(seconds=settings.SYNC_OVERLAP), 0,
+            None)
+    limit = settings.SYNC_PAGE_SIZE
+    after = position.after
+    deleted = {}
+    changed = {}
+    sync_types = list(SYNC_TYPES.values())
+    for section in range(position.section, len(sync_types) + 1):
+        if section == 0:
+            rows = [] if since is None else list(filter_changes(
+                Tombstone.objects.filter(owner=owner), since, after)
+                .only('modified', 'kind', 'code')[:limit])
+            for tombstone in rows:
+                deleted.setdefault(tombstone.kind, []).append(
+                    tombstone.code)
+        else:
+            sync_type = sync_types[section - 1]
+            rows = list(sync_type.get_changed(owner, since, after)[:limit])
+            if rows:
+                changed[sync_type.kind] = sync_type.serialize(rows)
+
+        limit -= len(rows)
+        if not limit:
+            position = Position(
+                position.until, section, (rows[-1].modified, rows[-1].id))
+            return {'token': make_token(since, position), 'more': True,
+                    'deleted': deleted, 'changed': changed}
+        after = None
+
+    return {'token': make_token(position.until), 'more': False,
+            'deleted': deleted, 'changed': changed}
@@ -0,0 +1 @@
+from .tombstones import *
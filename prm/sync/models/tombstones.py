@@ -0,0 +1,34 @@
+# Django
+from django.db import models
+
+# Models
+from ...utils import PRMModel
+
+# Kinds
+from ...relations.kinds import KIND_CHOICES
+
+
+class Tombstone(PRMModel):
+    """
+    Record of a deleted contact, activity, activity log, event or mood, so
+    clients syncing their changes learn about the deletion. Tombstones are
+    pruned after SYNC_TOMBSTONE_DAYS, older sync tokens need a full sync.
+    """
+
+    owner = models.ForeignKey('users.User', on_delete=models.CASCADE)
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+
+    code = models.CharField(
+        max_length=20, help_text='Identifier of the object on the API')
+
+    def __str__(self):
+        return f'Deleted {self.kind} {self.code}'
+
+    class Meta(PRMModel.Meta):
+        indexes = [
+            models.Index(fields=['owner', 'modified'],
+                         name='tombstone_owner_modified_idx'),
+            models.Index(fields=['modified'],
+                         name='tombstone_modified_idx'),
+        ]
@@ -0,0 +1 @@
+from .sync import *
@@ -0,0 +1,58 @@
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from ...journals.models import Event, Mood
+from ...relations.models import Activity, ActivityLog, Contact
+
+
+class ContactSyncSerializer(serializers.ModelSerializer):
+    """Contact as synced, without the stats derived from other objects"""
+
+    class Meta:
+        model = Contact
+        exclude = ('id', 'owner', 'created', 'search_vector')
+
+
+class ActivitySyncSerializer(serializers.ModelSerializer):
+    """Activity as synced, partners are referenced by code"""
+
+    partners = serializers.SlugRelatedField(
+        many=True, slug_field='code', read_only=True)
+
+    class Meta:
+        model = Activity
+        exclude = ('id', 'owner', 'created')
+
+
+class ActivityLogSyncSerializer(serializers.ModelSerializer):
+    """Activity log as synced, its activity and companions are referenced
+       by code"""
+
+    activity = serializers.SlugRelatedField(slug_field='code', read_only=True)
+
+    companions = serializers.SlugRelatedField(
+        many=True, slug_field='code', read_only=True)
+
+    class Meta:
+        model = ActivityLog
+        exclude = ('id', 'owner', 'created')
+
+
+class EventSyncSerializer(serializers.ModelSerializer):
+    """Event as synced"""
+
+    contacts = serializers.SlugRelatedField(
+        many=True, slug_field='code', read_only=True)
+
+    class Meta:
+        model = Event
+        exclude = ('id', 'owner', 'created')
+
+
+class MoodSyncSerializer(serializers.ModelSerializer):
+    """Mood as synced"""
+
+    class Meta:
+        model = Mood
+        exclude = ('id', 'owner', 'created')
@@ -0,0 +1,54 @@
+"""Sync signals."""
+
+# Django
+from django.db.models.signals import m2m_changed, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+# Models
+from .models import Tombstone
+from ..journals.models import Event
+from ..relations.models import Activity, ActivityLog
+
+# Signals
+from ..relations.signals import get_relation_changes
+from ..utils.signals import run_batched
+
+# Transactions
+from ..utils.transactions import get_deleted_users
+
+# Sync
+from .changes import SYNC_TYPES
+
+
+def touch(model, ids):
+    """Marks the objects as changed, so they're synced again"""
+    if ids:
+        model._default_manager.filter(pk__in=ids).update(
+            modified=timezone.now())
+
+
+def create_tombstones(tombstones):
+    Tombstone.objects.bulk_create(tombstones)
+
+
+@receiver(post_delete)
+def create_tombstone(sender, instance, **kwargs):
+    """Tombstones of the objects deleted together are inserted at once"""
+    # Clients of deleted users have nothing left to sync
+    if sender not in SYNC_TYPES or instance.owner_id in get_deleted_users():
+        return
+    run_batched(create_tombstones, [Tombstone(
+        owner_id=instance.owner_id, kind=SYNC_TYPES[sender].kind,
+        code=SYNC_TYPES[sender].get_lookup(instance))])
+
+
+@receiver(m2m_changed, sender=ActivityLog.companions.through)
+@receiver(m2m_changed, sender=Event.contacts.through)
+@receiver(m2m_changed, sender=Activity.partners.through)
+def touch_changed_relations(**kwargs):
+    """Relations don't change the `modified` date of their objects, the
+       ones holding them are synced with the codes of their contacts"""
+    changes = get_relation_changes(**kwargs)
+    if changes:
+        touch(changes[0], changes[1])
@@ -0,0 +1,236 @@
+"""Delta sync tests"""
+
+# Standard Library
+from datetime import timedelta
+
+# Django
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_delete
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ...journals.models import Mood
+from ...relations.models import Activity, ActivityLog, Contact
+from ..models import Tombstone
+
+# Sync
+from ..changes import make_token
+
+# Tasks
+from ...taskapp.tasks import prune_tombstones
+
+
+@override_settings(SYNC_OVERLAP=0)
+class DeltaSyncTestCase(APITestCase):
+    """Syncs return what changed since the token of the previous one"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        self.ana = Contact.objects.create(
+            owner=self.user, first_name='Ana', last_name='Lopez')
+        self.activity = Activity.objects.create(
+            owner=self.user, name='Hiking', description='Mountains')
+        self.log = ActivityLog.objects.create(
+            owner=self.user, activity=self.activity, details='Long trail',
+            date='2019-10-01')
+        return super().setUp()
+
+    def sync(self, token=None):
+        params = {'since': token} if token else {}
+        response = self.client.get('/sync/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def codes(self, data, kind):
+        return [obj['code'] for obj in data['changed'].get(kind, [])]
+
+    def test_full_sync(self):
+        other = User.objects.create_user(
+            email='other@user.com', username='other_user',
+            password='Testpassword123')
+        Contact.objects.create(
+            owner=other, first_name='Other', last_name='Contact')
+
+        data = self.sync()
+        self.assertEqual(self.codes(data, 'contact'), [self.ana.code])
+        self.assertEqual(
+            self.codes(data, 'activity_log'), [self.log.code])
+        self.assertEqual(
+            data['changed']['activity_log'][0]['activity'],
+            self.activity.code)
+        self.assertEqual(data['deleted'], {})
+
+    def test_delta_sync(self):
+        token = self.sync()['token']
+        self.assertEqual(self.sync(token)['changed'], {})
+
+        self.ana.nickname = 'Anita'
+        self.ana.save()
+        Mood.objects.upsert_for_day(
+            self.user, '2019-10-01', mood=Mood.HAPPY, description='Great')
+        data = self.sync(token)
+        self.assertEqual(set(data['changed']), {'contact', 'mood'})
+        self.assertEqual(data['changed']['contact'][0]['nickname'], 'Anita')
+        self.assertEqual(data['changed']['mood'][0]['date'], '2019-10-01')
+
+        # Only the changes since the new token
+        self.assertEqual(self.sync(data['token'])['changed'], {})
+
+    def test_relation_changes(self):
+        token = self.sync()['token']
+        self.log.companions.add(self.ana)
+        data = self.sync(token)
+        self.assertEqual(list(data['changed']), ['activity_log'])
+        self.assertEqual(
+            data['changed']['activity_log'][0]['companions'],
+            [self.ana.code])
+
+        # Changed from the contact side
+        token = data['token']
+        self.ana.activitylog_set.clear()
+        self.ana.activity_set.add(self.activity)
+        data = self.sync(token)
+        self.assertEqual(
+            set(data['changed']), {'activity', 'activity_log'})
+
+    def test_deletions(self):
+        token = self.sync()['token']
+        self.client.delete(f'/activities/{self.activity.code}/')
+        Mood.objects.create(
+            owner=self.user, mood=Mood.GOOD, description='Test mood',
+            date='2019-10-02').delete()
+
+        data = self.sync(token)
+        self.assertEqual(data['deleted'], {
+            'activity': [self.activity.code],
+            'mood': ['2019-10-02'],
+        })
+        self.assertNotIn('activity', data['changed'])
+
+    def test_deleted_user_leaves_no_tombstones(self):
+        self.user.delete()
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_failed_user_delete_is_forgotten(self):
+        """Users are only skipped within the transaction deleting them"""
+        def fail(**kwargs):
+            raise DatabaseError('Rolled back')
+
+        # Fails halfway through the cascade
+        post_delete.connect(fail, sender=Contact)
+        try:
+            with self.assertRaises(DatabaseError):
+                with transaction.atomic():
+                    self.user.delete()
+        finally:
+            post_delete.disconnect(fail, sender=Contact)
+
+        self.ana.delete()
+        self.assertTrue(
+            Tombstone.objects.filter(code=self.ana.code).exists())
+
+    def test_invalid_token(self):
+        response = self.client.get('/sync/', {'since': 'not a token!'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_token(self):
+        with self.settings(SYNC_TOMBSTONE_DAYS=1):
+            token = make_token(timezone.now() - timedelta(days=2))
+            response = self.client.get('/sync/', {'since': token})
+            self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+            self.ana.delete()
+            Tombstone.objects.update(
+                modified=timezone.now() - timedelta(days=2))
+            self.assertEqual(prune_tombstones(), 1)
+
+    def test_bulk_delete_tombstones(self):
+        """Tombstones of a bulk delete are inserted at once"""
+        contacts = [
+            Contact.objects.create(
+                owner=self.user, first_name=f'Contact {i}', last_name='Test')
+            for i in range(10)]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.delete(
+                '/contacts/bulk/', [contact.code for contact in contacts],
+                format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith(
+                f'INSERT INTO "{Tombstone._meta.db_table}"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            Tombstone.objects.filter(kind='contact').count(), 10)
+
+    def sync_pages(self, token=None):
+        """Follows the tokens until no changes are left, returns the pages"""
+        pages = [self.sync(token)]
+        while pages[-1]['more']:
+            pages.append(self.sync(pages[-1]['token']))
+        return pages
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_full_sync_pages(self):
+        contacts = [self.ana] + [
+            Contact.objects.create(
+                owner=self.user, first_name=f'Contact {i}', last_name='Test')
+            for i in range(2)]
+        # Same modified date, told apart by id
+        Contact.objects.filter(pk__in=[c.pk for c in contacts[2:]]).update(
+            modified=contacts[1].modified)
+
+        pages = self.sync_pages()
+        self.assertEqual(len(pages), 3)
+        for page in pages:
+            self.assertLessEqual(
+                sum(len(objs) for objs in page['changed'].values()), 2)
+        self.assertEqual(
+            [code for page in pages for code in self.codes(page, 'contact')],
+            [contact.code for contact in contacts])
+        self.assertEqual(
+            [code for page in pages
+             for code in self.codes(page, 'activity_log')],
+            [self.log.code])
+
+        # The last token syncs the changes made since the first page
+        self.assertFalse(pages[-1]['more'])
+        self.assertEqual(self.sync(pages[-1]['token'])['changed'], {})
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_delta_sync_pages(self):
+        token = self.sync_pages()[-1]['token']
+        contacts = [
+            Contact.objects.create(
+                owner=self.user, first_name=f'Contact {i}', last_name='Test')
+            for i in range(2)]
+        self.ana.delete()
+        self.log.delete()
+        self.activity.delete()
+
+        pages = self.sync_pages(token)
+        self.assertEqual(len(pages), 3)
+        deleted = {}
+        for page in pages:
+            for kind, codes in page['deleted'].items():
+                deleted.setdefault(kind, []).extend(codes)
+        self.assertEqual(deleted, {
+            'contact': [self.ana.code],
+            'activity': [self.activity.code],
+            'activity_log': [self.log.code],
+        })
+        self.assertEqual(
+            [code for page in pages for code in self.codes(page, 'contact')],
+            [contact.code for contact in contacts])
@@ -0,0 +1,18 @@
+"""Sync urls"""
+
+# Django
+from django.urls import path, include
+
+# Django REST Framework
+from rest_framework.routers import DefaultRouter
+
+# Views
+from .views import sync as sync_views
+
+router = DefaultRouter()
+
+router.register(r'sync', sync_views.SyncViewSet, basename='sync')
+
+urlpatterns = [
+    path('', include(router.urls))
+]
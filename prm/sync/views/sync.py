@@ -0,0 +1,55 @@
+# Django REST Framework
+from rest_framework import status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+# Permissions
+from rest_framework.permissions import IsAuthenticated
+
+# Swagger
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.openapi import Parameter, IN_QUERY, TYPE_STRING
+
+# Sync
+from ..changes import ExpiredToken, InvalidToken, get_changes, parse_token
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """Changes of the user's data since their last sync"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get_since(self):
+        """Moment and position of the `since` token"""
+        token = self.request.query_params.get('since')
+        if not token:
+            return None, None
+        try:
+            return parse_token(token)
+        except InvalidToken:
+            raise ValidationError({'message': "Invalid 'since' token"})
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            Parameter('since', IN_QUERY, type=TYPE_STRING,
+                      description='Token returned by the last sync, '
+                                  'everything is returned without it'),
+        ],
+        responses={
+            status.HTTP_200_OK: 'Changed objects and deleted codes by '
+                                'type, along with the next token and '
+                                'whether more changes are left',
+            status.HTTP_410_GONE: 'The token expired, a full sync '
+                                  'without it is needed'})
+    def list(self, request):
+        """Objects created or updated and codes of the ones deleted since
+           the `since` token, by type. Deletions come first, a deleted
+           object may have been created again afterwards. When `more` is
+           set the token continues this sync where it stopped."""
+        try:
+            since, position = self.get_since()
+        except ExpiredToken:
+            return Response(
+                {'message': 'Sync token expired, a full sync is needed'},
+                status=status.HTTP_410_GONE)
+        return Response(get_changes(request.user, since, position))
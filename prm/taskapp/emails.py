@@ -0,0 +1,209 @@
+"""Email delivery pipeline.
+
+Emails are stored on the `QueuedEmail` table as part of the transaction
+that sends them and a delivery task is scheduled once it commits, so a
+burst of signups is coalesced in a few tasks. Each task drains the queue
+in batches, every batch rendered with cached templates and sent over a
+single connection, within the messages per minute allowed by the relay.
+Batches are leased to the worker sending them, so no transaction is held
+while talking to the relay and every email is deleted as soon as it's
+sent.
+"""
+
+# Standard Library
+import logging
+import time
+from datetime import timedelta
+from functools import lru_cache
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template.loader import get_template
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+# Models
+from .models import QueuedEmail
+
+FROM_EMAIL = 'Personal CRM <noreply@prm.com>'
+
+SCHEDULED_KEY = 'emails:delivery_scheduled'
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_email_template(template_name):
+    """Compiled template, loaded once per process"""
+    return get_template(template_name)
+
+
+def render_email(email):
+    """Returns the message of the queued email"""
+    html_content = get_email_template(email.template_name).render(
+        email.context)
+    message = EmailMultiAlternatives(
+        email.subject, strip_tags(html_content), email.from_email,
+        [email.to])
+    message.attach_alternative(html_content, 'text/html')
+    return message
+
+
+def queue_email(to, subject, template_name, context, from_email=FROM_EMAIL):
+    """Queues an email, delivered once the current transaction commits.
+       The context must be JSON serializable."""
+    email = QueuedEmail.objects.create(
+        to=to, subject=subject, template_name=template_name,
+        context=context, from_email=from_email)
+    transaction.on_commit(schedule_delivery)
+    return email
+
+
+def schedule_delivery():
+    """Schedules a delivery task unless one is already waiting, so emails
+       queued within EMAIL_BATCH_DELAY seconds go in the same batches"""
+    from .tasks import send_queued_emails
+
+    delay = settings.EMAIL_BATCH_DELAY
+    if cache.add(SCHEDULED_KEY, True, delay):
+        send_queued_emails.apply_async(countdown=delay)
+
+
+def get_relay():
+    """Rate limits are counted by backend and host"""
+    return ':'.join(str(value) for value in (
+        settings.EMAIL_BACKEND, settings.EMAIL_HOST, settings.EMAIL_PORT))
+
+
+def get_rate_key(relay, minute):
+    return f'emails:rate:{relay}:{minute}'
+
+
+def acquire_rate(relay, count):
+    """Reserves up to `count` messages of the relay's allowance for the
+       current minute. Returns the reserved count, the seconds until the
+       next minute and the minute, to release what isn't used."""
+    limit = settings.EMAIL_RATE_LIMIT
+    now = time.time()
+    minute = int(now) // 60
+    wait = 60 - int(now) % 60
+    if not limit:
+        return count, wait, minute
+
+    key = get_rate_key(relay, minute)
+    cache.add(key, 0, wait + 1)
+    try:
+        used = cache.incr(key, count)
+    except ValueError:
+        # Expired meanwhile
+        cache.set(key, count, wait + 1)
+        used = count
+    return max(0, min(count, limit - (used - count))), wait, minute
+
+
+def release_rate(relay, minute, count):
+    """Gives back the part of a reservation that wasn't sent"""
+    if not settings.EMAIL_RATE_LIMIT or count <= 0:
+        return
+    try:
+        cache.decr(get_rate_key(relay, minute), count)
+    except ValueError:
+        # The minute is over
+        pass
+
+
+def deliver_queued_emails(batch_size=None):
+    """Sends queued emails until the queue is empty or the relay rate
+       limit is reached. Returns the number of sent emails and, when the
+       limit was reached, the seconds to wait before resuming."""
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    relay = get_relay()
+    sent = 0
+    # Failed emails wait for the next run
+    failed = set()
+    try:
+        while True:
+            reserved, wait, minute = acquire_rate(relay, batch_size)
+            if not reserved:
+                return sent, wait
+
+            emails = claim_emails(reserved, exclude=failed)
+            release_rate(relay, minute, reserved - len(emails))
+            if not emails:
+                return sent, None
+
+            batch_sent, batch_failed = deliver_batch(emails)
+            sent += batch_sent
+            failed.update(batch_failed)
+            if len(emails) < reserved:
+                return sent, None
+    finally:
+        prune_failed_emails()
+
+
+def claim_emails(size, exclude=()):
+    """Leases the next emails to this worker for EMAIL_LEASE_TIME seconds.
+       Rows are only locked while they're claimed, emails leased by other
+       workers are skipped until their lease expires."""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            QueuedEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(attempts__lt=settings.EMAIL_MAX_ATTEMPTS)
+            .filter(Q(leased_until__isnull=True) | Q(leased_until__lt=now))
+            .exclude(pk__in=exclude)
+            .order_by('id')[:size])
+        QueuedEmail.objects.filter(pk__in=[email.pk for email in emails]) \
+            .update(leased_until=now + timedelta(
+                seconds=settings.EMAIL_LEASE_TIME))
+    return emails
+
+
+def record_failure(emails, err):
+    """Failed emails are released for a retry, up to EMAIL_MAX_ATTEMPTS
+       times"""
+    QueuedEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+        attempts=F('attempts') + 1, last_error=repr(err), leased_until=None,
+        modified=timezone.now())
+
+
+def deliver_batch(emails):
+    """Sends the claimed emails over a single connection, outside of any
+       transaction. Each email is deleted as soon as it's sent, so a worker
+       stopped halfway only leaves the unsent ones to retry. Returns the
+       number of sent emails and the ids of the failed ones."""
+    sent = 0
+    failed = []
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                try:
+                    connection.send_messages([render_email(email)])
+                except Exception as err:
+                    record_failure([email], err)
+                    failed.append(email.pk)
+                else:
+                    QueuedEmail.objects.filter(pk=email.pk).delete()
+                    sent += 1
+    except Exception as err:
+        # The relay couldn't be reached or the connection dropped
+        unsent = emails[sent + len(failed):]
+        record_failure(unsent, err)
+        failed.extend(email.pk for email in unsent)
+    return sent, failed
+
+
+def prune_failed_emails():
+    """Drops the emails that reached EMAIL_MAX_ATTEMPTS"""
+    emails = QueuedEmail.objects.filter(
+        attempts__gte=settings.EMAIL_MAX_ATTEMPTS)
+    for email in emails.only('to', 'subject', 'last_error'):
+        logger.error(
+            'Dropping email %s to %s after %s attempts: %s', email.subject,
+            email.to, settings.EMAIL_MAX_ATTEMPTS, email.last_error)
+    emails.delete()
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='leased_until',
+            field=models.DateTimeField(blank=True, help_text='Emails are being sent by a worker until then', null=True),
+        ),
+    ]
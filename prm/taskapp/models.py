@@ -0,0 +1,41 @@
+"""Celery tasks models."""
+
+# Django
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+
+# Models
+from ..utils import PRMModel
+
+
+class QueuedEmail(PRMModel):
+    """
+    Email waiting to be delivered. Emails are queued along with the
+    transaction that requires them and delivered in batches by
+    `send_queued_emails`, rendered from their template and context.
+    """
+
+    to = models.EmailField()
+
+    from_email = models.CharField(max_length=254)
+
+    subject = models.CharField(max_length=255)
+
+    template_name = models.CharField(max_length=255)
+
+    context = JSONField(default=dict)
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0, help_text='Failed delivery attempts')
+
+    last_error = models.TextField(blank=True)
+
+    leased_until = models.DateTimeField(
+        blank=True, null=True,
+        help_text='Emails are being sent by a worker until then')
+
+    def __str__(self):
+        return f'{self.subject} to {self.to}'
+
+    class Meta(PRMModel.Meta):
+        ordering = ['id']
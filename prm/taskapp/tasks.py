@@ -1,16 +1,42 @@
 """Celery tasks."""
 
 # Django
+from django.apps import apps
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.core.files import File
 
 # Django REST Framework
 from rest_framework.reverse import reverse
 
 # Models
 from ..users.models import User
+from ..relations.models import ContactReminder
+from ..sync.models import Tombstone
+
+# Exports
+from ..users.exports import export_account
+
+# Imports
+from ..relations.imports import chunks, import_contacts
+
+# Emails
+from .emails import deliver_queued_emails, queue_email
+
+# Storages
+from ..utils.storages import (
+    make_download_token,
+    private_storage,
+    prune_private_files,
+    save_private_file)
+
+# Pictures
+from ..utils.pictures import (
+    delete_picture_variants,
+    get_picture_variants_names,
+    save_picture_variants)
+
+# Versions
+from ..utils.versions import bump_data_version
 
 # Celery
 from celery import task
@@ -18,6 +44,7 @@ from celery import task
 # Utils
 from django.utils import timezone
 from datetime import timedelta
+import tempfile
 
 # JWT
 import jwt
@@ -36,20 +63,158 @@ def gen_verification_token(user):
 
 
 @task(name='send_confirmation_email', max_retries=3)
-def send_confirmation_email(user_pk, host):
+def send_confirmation_email(user_pk, host, username=None, email=None):
+    """Queues the account verification email, the user is only fetched
+       when the caller doesn't send the username and email"""
+    if username is None or email is None:
+        user = User.objects.only('username', 'email').get(pk=user_pk)
+    else:
+        user = User(pk=user_pk, username=username, email=email)
+    queue_email(
+        to=user.email,
+        subject='Verify your email at Personal CRM (PRM)',
+        template_name='emails/users/register_confirmation.html',
+        context={
+            'user': {'username': user.username},
+            'token': gen_verification_token(user),
+            'type': 'email_confirmation',
+            'verification_link': f"{host}{reverse('users:users-verify')}"
+        })
+
+
+@task(name='export_account_to_storage')
+def export_account_to_storage(user_pk, export_format, host):
+    """Writes the account export to the private storage and emails the
+       user a link to download it that expires, meant for accounts too
+       large to stream in a single request."""
     user = User.objects.get(pk=user_pk)
-    token = gen_verification_token(user)
-    subject = 'Verify your email at Personal CRM (PRM)'
-    from_email = 'Personal CRM <noreply@prm.com>'
-    html_content = render_to_string('emails/users/register_confirmation.html', {
-        'user': user,
-        'token': token,
-        'type': 'email_confirmation',
-        'verification_link': f"{host}{reverse('users:users-verify')}"
-    })
-    text_content = strip_tags(html_content)
-
-    message = EmailMultiAlternatives(
-        subject, text_content, from_email, [user.email])
-    message.attach_alternative(html_content, 'text/html')
-    message.send()
+    chunks, content_type, extension = export_account(user, export_format)
+
+    # Spool to disk so memory stays flat while the export is generated
+    with tempfile.TemporaryFile() as file:
+        for chunk in chunks:
+            file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+        file.seek(0)
+        name = save_private_file('exports', extension, File(file))
+
+    token = make_download_token(name, f'{user.username}.{extension}')
+    path = reverse('users:users-download-export', kwargs={'token': token})
+
+    queue_email(
+        to=user.email,
+        subject='Your Personal CRM (PRM) export is ready',
+        template_name='emails/users/export_ready.html',
+        context={
+            'user': {'username': user.username},
+            'download_link': f'https://{host}{path}',
+            'expires_hours': settings.EXPORTS_TIMEOUT // 3600,
+        })
+
+
+@task(bind=True, name='import_contacts_from_storage')
+def import_contacts_from_storage(self, user_pk, path, import_format):
+    """Imports the contacts file uploaded to the private storage, reporting
+       the progress as the task state and deleting the file when done."""
+    user = User.objects.get(pk=user_pk)
+
+    def report_progress(result):
+        self.update_state(state='PROGRESS', meta={'user': user_pk, **result})
+
+    try:
+        with private_storage.open(path, 'rb') as file:
+            result = import_contacts(
+                user, file, import_format, on_progress=report_progress)
+    finally:
+        private_storage.delete(path)
+    return {'user': user_pk, **result}
+
+
+@task(name='compute_contact_reminders')
+def compute_contact_reminders():
+    """Schedules the reminders computation of every user, in batches so
+       each task stays within the time limit. Runs daily on celery beat."""
+    user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+    batches = chunks(
+        user_ids.iterator(), settings.CONTACT_REMINDERS_BATCH_SIZE)
+    for batch in batches:
+        compute_users_contact_reminders.delay(batch)
+
+
+@task(name='compute_users_contact_reminders', max_retries=3)
+def compute_users_contact_reminders(user_ids):
+    """Replaces the reminders of the users with their neglected contacts"""
+    return ContactReminder.objects.rebuild(user_ids)
+
+
+@task(bind=True, name='send_queued_emails', max_retries=None)
+def send_queued_emails(self):
+    """Delivers the queued emails in batches, resuming once the relay
+       allows it when the rate limit is reached. Also runs every minute on
+       celery beat to retry failed deliveries."""
+    sent, wait = deliver_queued_emails()
+    if wait is not None:
+        raise self.retry(countdown=wait)
+    return sent
+
+
+@task(name='prune_tombstones')
+def prune_tombstones():
+    """Deletes the tombstones older than the sync tokens accepted. Runs
+       daily on celery beat."""
+    cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+    deleted, _ = Tombstone.objects.filter(modified__lt=cutoff).delete()
+    return deleted
+
+
+@task(name='prune_exports')
+def prune_exports():
+    """Deletes the account exports whose links expired. Runs daily on
+       celery beat."""
+    return prune_private_files('exports', settings.EXPORTS_TIMEOUT)
+
+
+@task(name='prune_imports')
+def prune_imports():
+    """Deletes the contacts files left by imports that never ran. Runs
+       daily on celery beat."""
+    return prune_private_files(
+        'imports', settings.CONTACTS_IMPORT_STATUS_TIMEOUT)
+
+
+@task(name='generate_picture_variants')
+def generate_picture_variants(model_label, pk):
+    """Stores the resized copies of the picture of a contact or profile,
+       replacing the ones of its previous picture"""
+    model = apps.get_model(model_label)
+    entity = model.objects.filter(pk=pk).first()
+    if entity is None:
+        return None
+
+    source = entity.picture.name or None
+    variants = save_picture_variants(entity) if source else {}
+    # The picture may have been replaced while this one was resized
+    queryset = model.objects.filter(pk=pk)
+    if source:
+        queryset = queryset.filter(picture=source)
+    updated = queryset.update(
+        picture_variants={'source': source, 'variants': variants},
+        modified=timezone.now())
+
+    storage = entity.picture.storage
+    if not updated:
+        # Copies of the same content are shared with the stored variants
+        current = model.objects.filter(pk=pk).values_list(
+            'picture_variants', flat=True).first() or {}
+        delete_picture_variants(
+            storage, variants,
+            keep=get_picture_variants_names(current.get('variants', {})))
+        return None
+    delete_picture_variants(
+        storage, entity.picture_variants.get('variants', {}),
+        keep=get_picture_variants_names(variants))
+
+    # Updates skip post_save, cached responses are invalidated here
+    owner_id = getattr(entity, 'owner_id', None)
+    if owner_id is not None:
+        bump_data_version(owner_id)
+    return variants
@@ -0,0 +1,136 @@
+"""Email delivery tests"""
+
+# Standard Library
+from datetime import timedelta
+from unittest.mock import patch
+
+# Django
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+# Models
+from ..models import QueuedEmail
+
+# Emails
+from ..emails import deliver_queued_emails, get_email_template, queue_email
+
+# Tasks
+from ..tasks import send_confirmation_email
+
+TEMPLATE = 'emails/users/export_ready.html'
+
+
+class CountingEmailBackend(EmailBackend):
+    """Locmem backend counting the connections opened"""
+
+    opened = 0
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return super().open()
+
+
+@override_settings(
+    EMAIL_BACKEND='prm.taskapp.tests.test_emails.CountingEmailBackend',
+    EMAIL_RATE_LIMIT=0)
+class EmailDeliveryTestCase(TestCase):
+    """Queued emails are delivered in batches over a single connection"""
+
+    def setUp(self):
+        cache.clear()
+        CountingEmailBackend.opened = 0
+        return super().setUp()
+
+    def queue(self, count):
+        for i in range(count):
+            queue_email(
+                to=f'test{i}@user.com', subject='Test',
+                template_name=TEMPLATE,
+                context={'user': {'username': f'test{i}'},
+                         'download_link': 'https://prm.com/export.zip'})
+
+    def test_deliver_in_batches(self):
+        self.queue(5)
+        sent, wait = deliver_queued_emails(batch_size=2)
+        self.assertEqual((sent, wait), (5, None))
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertIn('test0', mail.outbox[0].alternatives[0][0])
+        self.assertEqual(CountingEmailBackend.opened, 3)
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    @override_settings(EMAIL_RATE_LIMIT=3)
+    def test_rate_limit(self):
+        self.queue(5)
+        sent, wait = deliver_queued_emails(batch_size=2)
+        self.assertEqual(sent, 3)
+        self.assertIsNotNone(wait)
+        self.assertEqual(QueuedEmail.objects.count(), 2)
+
+    @override_settings(EMAIL_RATE_LIMIT=10)
+    def test_unused_rate_is_released(self):
+        """Batches only use the allowance of the emails they send"""
+        self.queue(3)
+        sent, _ = deliver_queued_emails(batch_size=10)
+        self.assertEqual(sent, 3)
+
+        self.queue(7)
+        sent, _ = deliver_queued_emails(batch_size=10)
+        self.assertEqual(sent, 7)
+
+    def test_failed_emails_are_kept(self):
+        self.queue(2)
+        with patch.object(CountingEmailBackend, 'send_messages',
+                          side_effect=[OSError('Relay down'), 1]):
+            sent, _ = deliver_queued_emails()
+        self.assertEqual(sent, 1)
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('Relay down', email.last_error)
+
+    def test_unreachable_relay_counts_attempts(self):
+        self.queue(2)
+        with patch.object(CountingEmailBackend, 'open',
+                          side_effect=OSError('Relay down')):
+            for attempt in range(settings.EMAIL_MAX_ATTEMPTS - 1):
+                self.assertEqual(deliver_queued_emails(), (0, None))
+            self.assertEqual(
+                set(QueuedEmail.objects.values_list('attempts', flat=True)),
+                {settings.EMAIL_MAX_ATTEMPTS - 1})
+
+            # The last attempt drops them
+            deliver_queued_emails()
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_sent_emails_deleted_as_they_go(self):
+        """A worker stopped halfway only leaves the unsent emails"""
+        self.queue(3)
+        with patch.object(CountingEmailBackend, 'send_messages',
+                          side_effect=[1, KeyboardInterrupt]):
+            with self.assertRaises(KeyboardInterrupt):
+                deliver_queued_emails()
+        emails = QueuedEmail.objects.all()
+        self.assertEqual([email.to for email in emails],
+                         ['test1@user.com', 'test2@user.com'])
+        # Leased until the stopped worker's time limit
+        self.assertEqual(deliver_queued_emails(), (0, None))
+
+        emails.update(leased_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_queued_emails(), (2, None))
+
+    def test_templates_are_cached(self):
+        self.assertIs(get_email_template(TEMPLATE),
+                      get_email_template(TEMPLATE))
+
+    def test_confirmation_email_is_queued(self):
+        send_confirmation_email(
+            user_pk=1, host='prm.com', username='test',
+            email='test@user.com')
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.to, 'test@user.com')
+        self.assertIn('token', email.context)
+        deliver_queued_emails()
+        self.assertIn('Welcome test', mail.outbox[0].alternatives[0][0])
@@ -0,0 +1 @@
+from .tokens import *
@@ -0,0 +1,162 @@
+# Standard Library
+import threading
+import time
+from collections import OrderedDict
+
+# Django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+
+# Django REST Framework
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+CACHE_KEY_PREFIX = 'auth_tokens:'
+
+# User fields kept on cached tokens, the rest are loaded when accessed.
+# Credentials like the password hash are never cached.
+CACHED_USER_FIELDS = (
+    'id', 'email', 'username', 'first_name', 'last_name', 'is_active',
+    'is_staff', 'is_superuser')
+
+
+class LocalTokenCache:
+    """Least recently used, process local cache whose entries expire after
+    `timeout` seconds. Keeps the hottest tokens from even reaching the
+    shared cache."""
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_token_cache = LocalTokenCache(
+    max_size=settings.AUTH_TOKEN_LOCAL_CACHE_SIZE,
+    timeout=settings.AUTH_TOKEN_LOCAL_CACHE_TIMEOUT)
+
+
+def get_token_cache_key(key):
+    return f'{CACHE_KEY_PREFIX}{key}'
+
+
+def invalidate_token(key):
+    """Drop a token from both cache tiers"""
+    local_token_cache.delete(key)
+    cache.delete(get_token_cache_key(key))
+
+
+def load_instance(model, values):
+    """Instance as loaded from the database with the values of some fields,
+       the others are deferred"""
+    fields = [
+        field.attname for field in model._meta.concrete_fields
+        if field.attname in values]
+    return model.from_db(
+        router.db_for_read(model), fields,
+        [values[field] for field in fields])
+
+
+def invalidate_tokens_on_commit(keys):
+    """Drops the tokens once the changes to them or their user commit,
+       requests authenticating before would cache them again"""
+    keys = list(keys)
+
+    def invalidate():
+        for key in keys:
+            invalidate_token(key)
+
+    transaction.on_commit(invalidate)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that resolves tokens through the process local
+    cache, then the shared cache and only then the database.
+
+    Both tiers keep the token and the CACHED_USER_FIELDS of its user, each
+    request gets instances built from them. Cached tokens are invalidated
+    by the users signals whenever the token or its user changes. Other
+    processes may keep a stale token on their local tier for up to
+    AUTH_TOKEN_LOCAL_CACHE_TIMEOUT seconds.
+    """
+
+    def authenticate_credentials(self, key):
+        data = local_token_cache.get(key)
+        if data is None:
+            data = self.get_cached_token(key)
+            local_token_cache.set(key, data)
+
+        token = self.load_token(data)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.'))
+
+        return (token.user, token)
+
+    def get_cached_token(self, key):
+        """Fetch the token data from the shared cache, or from the database
+           if it isn't cached yet"""
+        cache_key = get_token_cache_key(key)
+        data = cache.get(cache_key)
+        if data is not None:
+            return data
+
+        model = self.get_model()
+        try:
+            token = (
+                model.objects.select_related('user')
+                .only('key', 'created', 'user_id', *(
+                    f'user__{field}' for field in CACHED_USER_FIELDS))
+                .get(key=key))
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        data = {
+            'key': token.key,
+            'created': token.created,
+            'user': {
+                field: getattr(token.user, field)
+                for field in CACHED_USER_FIELDS},
+        }
+        cache.set(cache_key, data, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        return data
+
+    def load_token(self, data):
+        """Token and user instances of the cached data"""
+        user = load_instance(get_user_model(), data['user'])
+        token = load_instance(self.get_model(), {
+            'key': data['key'], 'user_id': user.pk,
+            'created': data['created']})
+        token.user = user
+        return token
@@ -0,0 +1,152 @@
+"""Account export.
+
+Streams every contact, activity, activity log, event and mood of an user
+as newline delimited JSON or as a zip of CSV files. Rows are read with
+`.iterator()`, which uses server side cursors on PostgreSQL, and many to
+many relations are aggregated on the database, so memory stays flat no
+matter the size of the account.
+"""
+
+# Standard Library
+import csv
+import io
+import zipfile
+
+# Django
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+
+# Models
+from ..relations.models import Contact, Activity, ActivityLog
+from ..journals.models import Event, Mood
+
+CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+
+def code_array(relation):
+    """Aggregates the codes of a many to many relation"""
+    return ArrayAgg(
+        f'{relation}__code',
+        filter=Q(**{f'{relation}__isnull': False}),
+        distinct=True)
+
+
+def get_export_querysets(user):
+    """Returns (name, fields, queryset of dicts) for every exported model"""
+    contact_fields = [
+        field.name for field in Contact._meta.concrete_fields
+        if field.name not in ('id', 'owner', 'search_vector')]
+    return (
+        ('contacts', contact_fields,
+         Contact.objects.filter(owner=user).values(*contact_fields)),
+        ('activities',
+         ['code', 'name', 'description', 'is_active', 'last_time',
+          'partners', 'created', 'modified'],
+         Activity.objects.filter(owner=user).values(
+             'code', 'name', 'description', 'is_active', 'last_time',
+             'created', 'modified', partners_codes=code_array('partners'))),
+        ('activity_logs',
+         ['code', 'activity', 'details', 'date', 'location', 'companions',
+          'created', 'modified'],
+         ActivityLog.objects.filter(owner=user).values(
+             'code', 'details', 'date', 'location', 'created', 'modified',
+             activity_code=F('activity__code'),
+             companions_codes=code_array('companions'))),
+        ('events',
+         ['code', 'title', 'description', 'location', 'date', 'start_time',
+          'end_time', 'contacts', 'created', 'modified'],
+         Event.objects.filter(owner=user).values(
+             'code', 'title', 'description', 'location', 'date',
+             'start_time', 'end_time', 'created', 'modified',
+             contacts_codes=code_array('contacts'))),
+        ('moods',
+         ['date', 'mood', 'hightlights', 'description', 'created',
+          'modified'],
+         Mood.objects.filter(owner=user).values(
+             'date', 'mood', 'hightlights', 'description', 'created',
+             'modified')),
+    )
+
+
+def iterate_rows(queryset):
+    """Iterates the rows in primary key order through a server side cursor.
+
+    Related codes are annotated as `<relation>_code` or `<relation>_codes`
+    since annotations can't reuse the field names, rows are returned with
+    the relation names and many to many codes as lists.
+    """
+    for row in queryset.order_by('pk').iterator(chunk_size=CHUNK_SIZE):
+        for key in list(row):
+            if key.endswith('_codes'):
+                row[key[:-len('_codes')]] = row.pop(key) or []
+            elif key.endswith('_code'):
+                row[key[:-len('_code')]] = row.pop(key)
+        yield row
+
+
+def export_ndjson(user):
+    """Yields the account as lines of {"type": ..., "data": {...}}"""
+    encoder = DjangoJSONEncoder()
+    for name, _, queryset in get_export_querysets(user):
+        lines = []
+        for row in iterate_rows(queryset):
+            lines.append(encoder.encode({'type': name, 'data': row}))
+            if len(lines) == CHUNK_SIZE:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+
+class StreamBuffer:
+    """Write only file that hands over what was written so far, lets
+       zipfile write to a streaming response"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def export_csv_zip(user):
+    """Yields a zip file holding a CSV file per exported model"""
+    buffer = StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, fields, queryset in get_export_querysets(user):
+            with archive.open(f'{name}.csv', 'w', force_zip64=True) as file:
+                text = io.TextIOWrapper(file, encoding='utf-8', newline='')
+                writer = csv.DictWriter(text, fieldnames=fields)
+                writer.writeheader()
+                for i, row in enumerate(iterate_rows(queryset), start=1):
+                    for key, value in row.items():
+                        if isinstance(value, list):
+                            row[key] = ' '.join(value)
+                    writer.writerow(row)
+                    if i % CHUNK_SIZE == 0:
+                        text.flush()
+                        yield buffer.pop()
+                text.flush()
+                text.detach()
+            yield buffer.pop()
+    yield buffer.pop()
+
+
+def export_account(user, export_format):
+    """Returns a generator of the account in the given format, along with
+       its content type and file extension"""
+    if export_format == 'csv':
+        return export_csv_zip(user), 'application/zip', 'zip'
+    return export_ndjson(user), 'application/x-ndjson', 'ndjson'
@@ -4,10 +4,15 @@ from ..models import Profile
 # Django REST Framework
 from rest_framework import serializers
 
+# Serializers
+from ...utils.serializers import PictureVariantsField
+
 
 class ProfileModelSerializer(serializers.ModelSerializer):
     """Profile model serializer"""
 
+    picture_variants = PictureVariantsField()
+
     class Meta:
         model = Profile
         exclude = ('user', 'id', 'created', 'modified')
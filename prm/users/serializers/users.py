@@ -90,7 +90,8 @@ class UserSignUpSerializer(serializers.Serializer):
         user = User.objects.create_user(**data, is_active=False)
         Profile.objects.create(user=user)
         send_confirmation_email.delay(
-            user_pk=user.pk, host=self.context['request'].get_host())
+            user_pk=user.pk, host=self.context['request'].get_host(),
+            username=user.username, email=user.email)
         return user
 
 
@@ -0,0 +1,26 @@
+"""Users signals."""
+
+# Django
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Models
+from .models import User
+from rest_framework.authtoken.models import Token
+
+# Authentication
+from .authentication import invalidate_tokens_on_commit
+
+
+@receiver([post_save, post_delete], sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """Rotated or deleted tokens must stop authenticating once committed"""
+    invalidate_tokens_on_commit([instance.key])
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_tokens(sender, instance, **kwargs):
+    """Cached tokens hold a copy of the user, so password changes or
+       is_active toggles must drop them"""
+    invalidate_tokens_on_commit(
+        Token.objects.filter(user=instance).values_list('key', flat=True))
@@ -0,0 +1,101 @@
+"""Cached token authentication tests"""
+
+# Django
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+# Models
+from ...users.models import User, Profile
+
+# Django REST Framework
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+# Authentication
+from ..authentication import get_token_cache_key, local_token_cache
+
+PROFILE_URL = '/users/profile/'
+
+
+class CachedTokenAuthenticationTestCase(APITransactionTestCase):
+    """Tokens are resolved from cache and dropped when changes to them
+       commit"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        Profile.objects.create(user=self.user)
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        return super().setUp()
+
+    def tearDown(self):
+        local_token_cache.clear()
+        cache.clear()
+        return super().tearDown()
+
+    def test_cached_token_skips_database(self):
+        """Once cached, authenticating doesn't query the tokens table"""
+        response = self.client.get(PROFILE_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Only the shared cache tier is left
+        local_token_cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(PROFILE_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for query in context.captured_queries:
+            self.assertNotIn('authtoken_token', query['sql'])
+
+    def test_credentials_not_cached(self):
+        self.client.get(PROFILE_URL)
+        data = cache.get(get_token_cache_key(self.token.key))
+        self.assertEqual(data['user']['id'], self.user.pk)
+        self.assertNotIn('password', data['user'])
+        self.assertNotIn(self.user.password, str(data))
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(PROFILE_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(PROFILE_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_drops_cached_token(self):
+        self.client.get(PROFILE_URL)
+        self.user.set_password('Newpassword123')
+        self.user.save()
+
+        self.assertIsNone(local_token_cache.get(self.token.key))
+        self.assertIsNone(cache.get(get_token_cache_key(self.token.key)))
+
+    def test_token_dropped_on_commit(self):
+        """Until commit, requests would read and cache the old rows again"""
+        self.client.get(PROFILE_URL)
+        key = get_token_cache_key(self.token.key)
+        with transaction.atomic():
+            self.user.set_password('Newpassword123')
+            self.user.save()
+            self.assertIsNotNone(cache.get(key))
+        self.assertIsNone(cache.get(key))
+
+        self.client.get(PROFILE_URL)
+        with transaction.atomic():
+            self.token.delete()
+            self.assertIsNotNone(cache.get(key))
+        self.assertIsNone(cache.get(key))
+
+    def test_logout_revokes_token(self):
+        self.client.get(PROFILE_URL)
+        response = self.client.post('/users/logout/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Token.objects.exists())
+
+        response = self.client.get(PROFILE_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,105 @@
+"""Account export tests"""
+
+# Standard Library
+import csv
+import io
+import json
+import zipfile
+
+# Django
+from django.test import override_settings
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+# Models
+from ...users.models import User
+from ...relations.models import Contact, Activity
+from ...journals.models import Mood
+from ...taskapp.models import QueuedEmail
+
+# Tasks
+from ...taskapp.tasks import export_account_to_storage, prune_exports
+
+# Storages
+from ...utils.storages import private_storage
+
+
+class AccountExportTestCase(APITestCase):
+    """Users can download all of their data"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        self.url = f'/users/{self.user.username}/export/'
+
+        self.contact = Contact.objects.create(
+            owner=self.user, first_name='Contact', last_name='Test')
+        activity = Activity.objects.create(
+            owner=self.user, name='Biking', description='Test')
+        activity.partners.add(self.contact)
+        Mood.objects.upsert_for_day(
+            owner=self.user, date='2019-10-01', mood=Mood.GOOD,
+            description='Test')
+        return super().setUp()
+
+    def test_export_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [row['type'] for row in rows],
+            ['contacts', 'activities', 'moods'])
+        self.assertEqual(rows[1]['data']['partners'], [self.contact.code])
+
+    def test_export_csv_zip(self):
+        response = self.client.get(self.url, {'type': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        content = io.BytesIO(b''.join(response.streaming_content))
+        with zipfile.ZipFile(content) as archive:
+            self.assertIn('activity_logs.csv', archive.namelist())
+            activities = archive.read('activities.csv').decode()
+        rows = list(csv.DictReader(io.StringIO(activities)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['partners'], self.contact.code)
+
+    def test_cannot_export_other_accounts(self):
+        other_user = User.objects.create_user(
+            email='other@user.com',
+            username='other_user',
+            password='Testpassword123',
+            is_active=True)
+        response = self.client.get(f'/users/{other_user.username}/export/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_background_export_link(self):
+        export_account_to_storage(self.user.pk, 'ndjson', 'testserver')
+        link = QueuedEmail.objects.get().context['download_link']
+        self.assertTrue(link.startswith('https://testserver/users/exports/'))
+        path = link[len('https://testserver'):]
+
+        # The link is the only credential
+        self.client.force_authenticate(None)
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('test_user.ndjson', response['Content-Disposition'])
+        self.assertIn(b'"contacts"', b''.join(response.streaming_content))
+
+        response = self.client.get(path[:-3] + 'xx/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        with override_settings(EXPORTS_TIMEOUT=-1):
+            response = self.client.get(path)
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND)
+
+            self.assertEqual(prune_exports(), 1)
+        self.assertEqual(private_storage.listdir('exports')[1], [])
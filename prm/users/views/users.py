@@ -1,7 +1,12 @@
+# Django
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, StreamingHttpResponse
 
 # Django REST Framework
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
 # Serializers
@@ -25,6 +30,15 @@ from ..permissions import IsAccountOwner
 from drf_yasg.utils import swagger_auto_schema, no_body
 from drf_yasg import openapi
 
+# Exports
+from ..exports import export_account, EXPORT_FORMATS
+
+# Storages
+from ...utils.storages import load_download_token, private_storage
+
+# Tasks
+from ...taskapp.tasks import export_account_to_storage
+
 
 class UserViewSet(mixins.RetrieveModelMixin,
                   mixins.UpdateModelMixin,
@@ -36,11 +50,14 @@ class UserViewSet(mixins.RetrieveModelMixin,
     lookup_field = 'username'
 
     def get_permissions(self):
-        if self.action in ['signup', 'verify', 'login']:
+        if self.action in ['signup', 'verify', 'login', 'download_export']:
             permissions = [AllowAny]
         elif self.action in [
-                'retrieve', 'update', 'partial_update', 'profile']:
+                'retrieve', 'update', 'partial_update', 'profile',
+                'export']:
             permissions = [IsAuthenticated, IsAccountOwner]
+        elif self.action == 'logout':
+            permissions = [IsAuthenticated]
         else:
             # Method not allowed
             return []
@@ -107,6 +124,75 @@ class UserViewSet(mixins.RetrieveModelMixin,
         data = UserModelTokenSerializer(user).data
         return Response(data, status.HTTP_200_OK)
 
+    @swagger_auto_schema(request_body=no_body, responses={
+        status.HTTP_204_NO_CONTENT: 'Token revoked'})
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        """Revokes the authorization token used on the request"""
+        request.auth.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @swagger_auto_schema(
+        method='get',
+        manual_parameters=[openapi.Parameter(
+            'type', openapi.IN_QUERY,
+            description="Export format, 'ndjson' (default) or 'csv'",
+            type=openapi.TYPE_STRING)],
+        responses={status.HTTP_200_OK: 'NDJSON stream or zip of CSV files'})
+    @swagger_auto_schema(
+        method='post',
+        manual_parameters=[openapi.Parameter(
+            'type', openapi.IN_QUERY,
+            description="Export format, 'ndjson' (default) or 'csv'",
+            type=openapi.TYPE_STRING)],
+        request_body=no_body,
+        responses={status.HTTP_202_ACCEPTED: 'Export scheduled'})
+    @action(detail=True, methods=['get', 'post'])
+    def export(self, request, *args, **kwargs):
+        """Streams every contact, activity, log, event and mood of the
+           account. POST generates the export in the background instead and
+           emails a download link when it's ready."""
+        user = self.get_object()
+        export_format = self.request.query_params.get('type', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'type': f"Must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status.HTTP_400_BAD_REQUEST)
+
+        if request.method == 'POST':
+            export_account_to_storage.delay(
+                user_pk=user.pk, export_format=export_format,
+                host=request.get_host())
+            data = {'message': (
+                "Your export is being generated, you'll receive an email "
+                "when it's ready")}
+            return Response(data, status.HTTP_202_ACCEPTED)
+
+        chunks, content_type, extension = export_account(user, export_format)
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{user.username}.{extension}"')
+        return response
+
+    @swagger_auto_schema(responses={
+        status.HTTP_200_OK: 'Export file',
+        status.HTTP_404_NOT_FOUND: 'Invalid or expired link'})
+    @action(detail=False, methods=['get'],
+            url_path=r'exports/(?P<token>[-\w:]+)')
+    def download_export(self, request, token):
+        """Export generated in the background, from the signed link
+           emailed to its owner"""
+        try:
+            name, filename = load_download_token(
+                token, settings.EXPORTS_TIMEOUT)
+        except signing.BadSignature:
+            raise NotFound()
+        if not private_storage.exists(name):
+            raise NotFound()
+        return FileResponse(
+            private_storage.open(name, 'rb'), as_attachment=True,
+            filename=filename)
+
     @swagger_auto_schema(method='get', responses={
         status.HTTP_200_OK: UserModelSerializer})
     @swagger_auto_schema(
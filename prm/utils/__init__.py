@@ -1,3 +1,8 @@
 from .models import *
 from .mixins import *
 from .validators import *
+from .pagination import *
+from .fields import *
+
+# Receivers of every app's models, connected along with the models above
+from . import pictures, transactions, versions  # noqa F401
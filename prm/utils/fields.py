@@ -0,0 +1,92 @@
+"""Django model fields"""
+
+# Standard Library
+import string
+
+# Django
+from django.utils.crypto import get_random_string
+
+# Fields
+from django_extensions.db.fields import RandomCharField
+
+
+class RandomCodeField(RandomCharField):
+    """RandomCharField that generates its code without checking the table.
+
+    With the default 62 characters alphabet an 8 characters code has over
+    2 * 10^14 possible values, so collisions are rare enough to be handled
+    by retrying the insert when the unique constraint fails, see
+    `PRMModel.save` and `PRMQuerySet.bulk_create`. Codes assigned before
+    the object is inserted are kept.
+    """
+
+    def pre_save(self, model_instance, add):
+        code = getattr(model_instance, self.attname)
+        if not code:
+            code = self.generate_code()
+            setattr(model_instance, self.attname, code)
+        return code
+
+    def get_population(self):
+        population = ''
+        if self.include_alpha:
+            if self.lowercase:
+                population += string.ascii_lowercase
+            elif self.uppercase:
+                population += string.ascii_uppercase
+            else:
+                population += string.ascii_letters
+        if self.include_digits:
+            population += string.digits
+        if self.include_punctuation:
+            population += string.punctuation
+        return population
+
+    def generate_code(self):
+        return get_random_string(self.length, self.get_population())
+
+
+def get_random_code_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, RandomCodeField)]
+
+
+def assign_random_codes(objs):
+    """Assign a code to every empty RandomCodeField of the objects, unique
+    within the batch. Doesn't query the database."""
+    if not objs:
+        return objs
+
+    for field in get_random_code_fields(type(objs[0])):
+        used = {getattr(obj, field.attname) for obj in objs} - {''}
+        for obj in objs:
+            if getattr(obj, field.attname):
+                continue
+            code = field.generate_code()
+            while code in used:
+                code = field.generate_code()
+            used.add(code)
+            setattr(obj, field.attname, code)
+    return objs
+
+
+def release_taken_codes(objs):
+    """Empty the codes of the objects that already exist on the table, so
+    they are generated again. Returns whether any code was taken."""
+    if not objs:
+        return False
+
+    model = type(objs[0])
+    released = False
+    for field in get_random_code_fields(model):
+        codes = {getattr(obj, field.attname) for obj in objs} - {''}
+        taken = set(
+            model._default_manager
+            .filter(**{f'{field.attname}__in': codes})
+            .values_list(field.attname, flat=True))
+        for obj in objs:
+            if getattr(obj, field.attname) in taken:
+                setattr(obj, field.attname, '')
+                released = True
+    return released
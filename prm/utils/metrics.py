@@ -0,0 +1,42 @@
+"""Counters shared by every process through the cache."""
+
+# Django
+from django.core.cache import cache
+
+
+def get_counter_key(name):
+    return f'metrics:{name}'
+
+
+def increment(name, value=1):
+    """Returns the new value of the counter"""
+    key = get_counter_key(name)
+    if cache.add(key, value, None):
+        return value
+    try:
+        return cache.incr(key, value)
+    except ValueError:
+        # Evicted meanwhile
+        cache.set(key, value, None)
+        return value
+
+
+def get_counters(names):
+    """Returns the value of each counter, 0 for the unknown ones"""
+    values = cache.get_many([get_counter_key(name) for name in names])
+    return {name: values.get(get_counter_key(name), 0) for name in names}
+
+
+def get_members(name):
+    """Members of a set shared by every process"""
+    size = get_counters([f'{name}.size'])[f'{name}.size']
+    keys = [get_counter_key(f'{name}.{index}')
+            for index in range(1, size + 1)]
+    return set(cache.get_many(keys).values())
+
+
+def add_member(name, member):
+    """Adds the member to the set without locking it, a member added by
+       processes at the same time is kept twice but read once"""
+    index = increment(f'{name}.size')
+    cache.set(get_counter_key(f'{name}.{index}'), member, None)
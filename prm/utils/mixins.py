@@ -1,4 +1,16 @@
+# Standard Library
+import hashlib
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
 # Django REST Framework
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import ListModelMixin
 from rest_framework.response import Response
 from rest_framework import status
@@ -6,8 +18,17 @@ from rest_framework import status
 # Validators
 from .validators import validate_date
 
+# Versions
+from .versions import get_data_version
+
+# Metrics
+from .metrics import get_counters, increment
+
 
 class ListModelFilterBetweenDatesMixin(ListModelMixin):
+    # Keyset pagination ordering, matches the (owner, date) indexes
+    cursor_ordering = ('date', 'created')
+
     def list(self, request, *args, **kwargs):
         """Check for 'from' and 'to' date query params to return a date range
            of moods. Date must be formatted as "YYYY-MM-DD" """
@@ -46,3 +67,265 @@ class ListModelFilterBetweenDatesMixin(ListModelMixin):
         return self.get_queryset().filter(
             date__gte=from_date,
             date__lte=to_date)
+
+
+class OptimizedQuerysetMixin:
+    """Apply select_related and prefetch_related lookups per action.
+
+    Serializers with related fields issue one query per row unless the
+    relations are loaded along with the queryset. Viewsets declare the
+    lookups each action needs on `select_related_lookups` and
+    `prefetch_related_lookups`, both dicts mapping an action name to a
+    tuple of lookups, actions not listed fall back to the 'default' entry.
+    Call `optimize_queryset` from `get_queryset` to apply them.
+    """
+
+    select_related_lookups = {}
+    prefetch_related_lookups = {}
+
+    def _get_action_lookups(self, lookups, action):
+        if action in lookups:
+            return lookups[action]
+        return lookups.get('default', ())
+
+    def optimize_queryset(self, queryset, action=None):
+        """Returns the queryset with the lookups declared for the action"""
+        action = action or self.action
+        select_related = self._get_action_lookups(
+            self.select_related_lookups, action)
+        prefetch_related = self._get_action_lookups(
+            self.prefetch_related_lookups, action)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class BulkModelMixin:
+    """Create, update and delete many objects in a single request.
+
+    Adds a `bulk` list route: POST creates a list of objects, PUT updates a
+    list of objects identified by their `lookup_field` and DELETE deletes
+    a list of lookup values. Each request is a single transaction, the
+    serializer's `list_serializer_class` decides how the objects are
+    persisted (see `BulkListSerializer`).
+    """
+
+    @action(detail=False, methods=['post', 'put', 'delete'])
+    def bulk(self, request):
+        if request.method == 'POST':
+            return self.bulk_create(request)
+        if request.method == 'PUT':
+            return self.bulk_update(request)
+        return self.bulk_destroy(request)
+
+    def get_bulk_data(self, request):
+        """Validate the request holds a list of at most BULK_MAX_ITEMS"""
+        data = request.data
+        if not isinstance(data, list):
+            raise ValidationError({'message': 'Expected a list of items'})
+        if len(data) > settings.BULK_MAX_ITEMS:
+            raise ValidationError({'message': (
+                f'Cannot process more than {settings.BULK_MAX_ITEMS} '
+                'items at once')})
+        return data
+
+    def bulk_create(self, request):
+        serializer = self.get_serializer(
+            data=self.get_bulk_data(request), many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            self.perform_bulk_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+    def bulk_update(self, request):
+        data = self.get_bulk_data(request)
+        lookups = [
+            str(item.get(self.lookup_field, ''))
+            if isinstance(item, dict) else ''
+            for item in data]
+        instances = self.get_queryset().in_bulk(
+            [lookup for lookup in lookups if lookup],
+            field_name=self.lookup_field)
+
+        errors = [
+            {} if lookup in instances
+            else {self.lookup_field: ['Not found']}
+            for lookup in lookups]
+        if any(errors):
+            raise ValidationError(errors)
+        if len(set(lookups)) != len(lookups):
+            raise ValidationError({'message': (
+                f'Each {self.lookup_field} can only be updated once')})
+
+        serializer = self.get_serializer(
+            [instances[lookup] for lookup in lookups], data=data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            self.perform_bulk_update(serializer)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def perform_bulk_update(self, serializer):
+        serializer.save()
+
+    def bulk_destroy(self, request):
+        lookups = self.get_bulk_data(request)
+        queryset = self.get_queryset().filter(
+            **{f'{self.lookup_field}__in': lookups})
+        queryset = queryset.select_related(None).prefetch_related(None)
+        with transaction.atomic():
+            self.perform_bulk_destroy(queryset)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_bulk_destroy(self, queryset):
+        queryset.delete()
+
+
+class ConditionalGetMixin:
+    """Answer unchanged list and retrieve requests with 304 Not Modified.
+
+    The ETag and Last-Modified validators come from the version of the
+    user's data, bumped after any object they own is written (see
+    `prm.utils.versions`), so validating a request costs a cache lookup
+    and no query. Relations and stats changes are covered too, unlike
+    with the objects `modified` dates. Responses are marked private so
+    shared caches don't keep them.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validators(self, request):
+        """Returns the ETag and Last-Modified of the requested resource"""
+        version = get_data_version(request.user.pk)
+        key = ':'.join([
+            str(request.user.pk), repr(version), request.get_full_path(),
+            str(request.accepted_media_type)])
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        return etag, int(version)
+
+    def is_conditional(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and self.action in self.conditional_actions
+            and request.user.is_authenticated)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if self.is_conditional(request):
+            # Before the data is read, a response built from data changed
+            # meanwhile keeps the previous validators
+            self.validators = self.get_validators(request)
+
+    def list(self, request, *args, **kwargs):
+        return (
+            self.get_not_modified_response(request)
+            or super().list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        headers = request.META
+        if (self.validators and 'HTTP_IF_MODIFIED_SINCE' in headers
+                and 'HTTP_IF_NONE_MATCH' not in headers):
+            # Only ETags are given for objects the user got, dates alone
+            # don't tell the object exists
+            self.get_object()
+        return (
+            self.get_not_modified_response(request)
+            or super().retrieve(request, *args, **kwargs))
+
+    def get_not_modified_response(self, request):
+        if not self.validators:
+            return None
+        etag, last_modified = self.validators
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            response = Response(status=response.status_code)
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+def get_response_cache_metrics(basenames):
+    """Cache hits and misses of the given endpoints"""
+    names = [
+        f'response_cache.{basename}.{counter}'
+        for basename in basenames for counter in ('hits', 'misses')]
+    return get_counters(names)
+
+
+class CachedResponseMixin:
+    """Cache the list and retrieve responses of each user.
+
+    Responses are cached by user, version of the user's data (see
+    `prm.utils.versions`), URL and media type, so writes make the cached
+    responses of the user unreachable and they're never stale. Hits and
+    misses are counted by endpoint. Caching is disabled by setting
+    `cache_responses` to False or by listing the viewset basename on
+    RESPONSE_CACHE_DISABLED.
+    """
+
+    cache_responses = True
+    cached_actions = ('list', 'retrieve')
+
+    def is_response_cached(self, request):
+        return (
+            self.cache_responses
+            and request.method in ('GET', 'HEAD')
+            and self.action in self.cached_actions
+            and request.user.is_authenticated
+            and self.basename not in settings.RESPONSE_CACHE_DISABLED)
+
+    def get_response_cache_key(self, request):
+        version = get_data_version(request.user.pk)
+        key = ':'.join([
+            repr(version), request.build_absolute_uri(),
+            str(request.accepted_media_type)])
+        digest = hashlib.md5(key.encode()).hexdigest()
+        return f'responses:{request.user.pk}:{digest}'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.response_cache_key = None
+        if self.is_response_cached(request):
+            # Before the data is read, a response built from data changed
+            # meanwhile is cached under the previous version
+            self.response_cache_key = self.get_response_cache_key(request)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+    def get_cached_response(self, view, request, *args, **kwargs):
+        key = self.response_cache_key
+        if key is None:
+            return view(request, *args, **kwargs)
+
+        data = cache.get(key)
+        if data is not None:
+            increment(f'response_cache.{self.basename}.hits')
+            return Response(data)
+
+        increment(f'response_cache.{self.basename}.misses')
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
@@ -1,7 +1,68 @@
 """Django models utilities"""
 
 # Django
-from django.db import models
+from django.contrib.postgres.fields import JSONField
+from django.db import IntegrityError, models, router, transaction
+
+# Signals
+from .signals import batched_receivers, bulk_saved, deleting
+
+# Fields
+from .fields import (
+    assign_random_codes,
+    get_random_code_fields,
+    release_taken_codes)
+
+# Attempts to insert objects before giving up on finding unused codes
+MAX_CODE_ATTEMPTS = 5
+
+
+class PRMQuerySet(models.QuerySet):
+    """PRM base queryset"""
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        """Assigns random codes to the objects in memory and inserts them,
+           generating new codes for the ones that were already taken if
+           the insert fails."""
+        objs = list(objs)
+        if not objs or not get_random_code_fields(self.model):
+            objs = super().bulk_create(
+                objs, batch_size=batch_size,
+                ignore_conflicts=ignore_conflicts)
+            bulk_saved.send(sender=self.model, objs=objs)
+            return objs
+
+        for attempt in range(MAX_CODE_ATTEMPTS):
+            assign_random_codes(objs)
+            try:
+                # Savepoint so a failed insert can be retried
+                with transaction.atomic(using=self.db):
+                    objs = super().bulk_create(
+                        objs, batch_size=batch_size,
+                        ignore_conflicts=ignore_conflicts)
+                bulk_saved.send(sender=self.model, objs=objs)
+                return objs
+            except IntegrityError:
+                # Objects from the batches inserted before the failure
+                # were rolled back along with it
+                for obj in objs:
+                    obj.pk = None
+                    obj._state.adding = True
+                if (attempt == MAX_CODE_ATTEMPTS - 1
+                        or not release_taken_codes(objs)):
+                    raise
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        super().bulk_update(objs, fields, batch_size=batch_size)
+        bulk_saved.send(sender=self.model, objs=objs)
+
+    def delete(self):
+        """Receivers of the deleted objects batch their work, which is
+           committed along with the delete"""
+        with transaction.atomic(using=self.db), batched_receivers():
+            deleting.send(sender=self.model, queryset=self)
+            return super().delete()
 
 
 class PRMModel(models.Model):
@@ -25,11 +86,39 @@ class PRMModel(models.Model):
         help_text='Datetime on which the object was last modified.'
     )
 
+    objects = PRMQuerySet.as_manager()
+
     class Meta:
         abstract = True
         get_latest_by = 'created'
         ordering = ['-created', '-modified']
 
+    def save(self, *args, **kwargs):
+        """Random codes are generated without checking the table, if one is
+           already taken the insert is retried with a new code."""
+        if not self._state.adding or not get_random_code_fields(type(self)):
+            return super().save(*args, **kwargs)
+
+        using = kwargs.get('using') or router.db_for_write(type(self))
+        for attempt in range(MAX_CODE_ATTEMPTS):
+            try:
+                with transaction.atomic(using=using):
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if (attempt == MAX_CODE_ATTEMPTS - 1
+                        or not release_taken_codes([self])):
+                    raise
+
+    def delete(self, using=None, keep_parents=False):
+        """Receivers of the objects deleted in cascade batch their work,
+           which is committed along with the delete"""
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using), batched_receivers():
+            deleting.send(
+                sender=type(self),
+                queryset=type(self)._default_manager.filter(pk=self.pk))
+            return super().delete(using=using, keep_parents=keep_parents)
+
 
 class Entity(PRMModel):
     """Entity Base model
@@ -45,6 +134,13 @@ class Entity(PRMModel):
         blank=True,
         null=True)
 
+    picture_variants = JSONField(
+        default=dict,
+        blank=True,
+        help_text=(
+            'Resized copies of the picture, generated in the background, '
+            'see prm.utils.pictures'))
+
     address = models.CharField('Home address', max_length=250, blank=True)
 
     company = models.CharField(
@@ -0,0 +1,79 @@
+"""Pagination classes"""
+
+# Django REST Framework
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination sharing the 'limit' parameter with the limit/offset
+    pagination, so clients switching between both keep their page sizes"""
+
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+
+class LimitOffsetOrCursorPagination(LimitOffsetPagination):
+    """Limit/offset pagination that switches to keyset pagination when the
+    client opts in with `?pagination=cursor` (or sends a cursor).
+
+    Keyset pages are fetched by filtering on the ordering of the view,
+    declared on its `cursor_ordering` attribute or `get_cursor_ordering`
+    method, so they cost the same no matter how deep the client scrolls
+    and skip the COUNT(*) query. Views without an ordering always use
+    limit/offset.
+    """
+
+    pagination_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+
+    cursor_paginator = None
+
+    def get_cursor_ordering(self, view):
+        if hasattr(view, 'get_cursor_ordering'):
+            return view.get_cursor_ordering()
+        return getattr(view, 'cursor_ordering', None)
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.pagination_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = self.get_cursor_ordering(view)
+        if ordering and self.use_cursor(request):
+            self.cursor_paginator = KeysetPagination(ordering)
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view)
+
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_fields(self, view):
+        fields = super().get_schema_fields(view)
+        if not self.get_cursor_ordering(view):
+            return fields
+        return fields + [
+            coreapi.Field(
+                name=self.pagination_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(
+                    title='Pagination',
+                    description="Set to 'cursor' to use keyset pagination")),
+            coreapi.Field(
+                name=self.cursor_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(
+                    title='Cursor',
+                    description='The pagination cursor value')),
+        ]
@@ -0,0 +1,130 @@
+"""Picture variants.
+
+Uploaded pictures are stored as they are, resized copies without their
+metadata are generated in the background by the generate_picture_variants
+task and stored next to them, so payloads can link to the size they need.
+The names of the copies are kept on the entity along with the picture
+they were generated from, see Entity.picture_variants. They're made of the
+entity and a hash of the picture content, storages that overwrite files,
+like S3, never write over the copies of another picture.
+"""
+
+# Standard Library
+import hashlib
+import os
+from io import BytesIO
+
+# Django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+# Models
+from .models import Entity
+
+# Pillow
+from PIL import Image, ImageOps
+
+# Pillow format and file extension by variant format
+FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+
+def picture_changed(entity):
+    """Whether the variants don't match the entity's current picture"""
+    source = entity.picture_variants.get('source')
+    return (entity.picture.name or None) != source
+
+
+def get_variant_names(entity):
+    """Stored variants of the current picture, by size and format. Empty
+       while they're being generated."""
+    if picture_changed(entity):
+        return {}
+    return entity.picture_variants.get('variants', {})
+
+
+def open_picture(file):
+    """Upright image in a mode every format can save"""
+    with Image.open(file) as image:
+        # Orientation is only stored in the metadata that's stripped
+        image = ImageOps.exif_transpose(image)
+        alpha = (image.mode in ('RGBA', 'LA', 'PA')
+                 or 'transparency' in image.info)
+        return image.convert('RGBA' if alpha else 'RGB')
+
+
+def flatten(image):
+    """Places transparent images on a white background"""
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, 'white')
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def get_variants_prefix(entity, content):
+    """Start of the names of the copies of a picture of the entity"""
+    directory = os.path.dirname(entity.picture.name)
+    identifier = getattr(entity, 'code', None) or entity.pk
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    return os.path.join(
+        directory, f'{entity._meta.model_name}_{identifier}_{digest}')
+
+
+def save_picture_variants(entity):
+    """Stores the resized copies of the picture of an entity next to it,
+       returns their names by size and format"""
+    picture = entity.picture
+    with picture.open('rb'):
+        content = picture.read()
+    image = open_picture(BytesIO(content))
+
+    prefix = get_variants_prefix(entity, content)
+    names = {}
+    for size_name, size in settings.PICTURE_VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        # Camera, location and color profile metadata is left out
+        resized.info = {}
+        for variant_format, (pil_format, extension) in FORMATS.items():
+            output = resized if pil_format == 'WEBP' else flatten(resized)
+            buffer = BytesIO()
+            output.save(
+                buffer, pil_format,
+                quality=settings.PICTURE_VARIANTS_QUALITY)
+            names.setdefault(size_name, {})[variant_format] = (
+                picture.storage.save(
+                    f'{prefix}_{size_name}.{extension}',
+                    ContentFile(buffer.getvalue())))
+    return names
+
+
+def get_picture_variants_names(variants):
+    return {
+        name for names in variants.values() for name in names.values()}
+
+
+def delete_picture_variants(storage, variants, keep=()):
+    """Deletes the stored variants but the ones named in `keep`, which
+       storages that overwrite files may have written again"""
+    for name in get_picture_variants_names(variants) - set(keep):
+        storage.delete(name)
+
+
+@receiver(post_save)
+def schedule_picture_variants(sender, instance, raw=False, **kwargs):
+    """Uploaded or removed pictures of contacts and profiles get their
+       variants replaced once committed"""
+    if not isinstance(instance, Entity) or raw:
+        return
+    if picture_changed(instance):
+        # The tasks module imports this one
+        from ..taskapp.tasks import generate_picture_variants
+        label, pk = instance._meta.label, instance.pk
+        transaction.on_commit(
+            lambda: generate_picture_variants.delay(label, pk))
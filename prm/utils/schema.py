@@ -0,0 +1,77 @@
+"""API schema views."""
+
+# Standard Library
+import hashlib
+
+# Django
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+# Swagger
+from drf_yasg.renderers import (
+    OpenAPIRenderer,
+    SwaggerJSONRenderer,
+    SwaggerYAMLRenderer)
+from drf_yasg.views import get_schema_view
+
+SPEC_RENDERERS = (OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer)
+
+
+def get_cached_schema_view(*args, **kwargs):
+    """drf_yasg schema view generating the schema once per process.
+
+    The schema only changes along with the code, so each format is
+    generated and rendered on the first request and served from memory
+    afterwards, with an ETag and SCHEMA_CACHE_TIMEOUT seconds of public
+    caching. The web UI pages hold the user and CSRF token, they're
+    rendered on every request but don't introspect the API.
+    """
+    schema_view = get_schema_view(*args, **kwargs)
+
+    class CachedSchemaView(schema_view):
+        # (content type, content, ETag) by format, version and host
+        rendered_schemas = {}
+
+        def get_schema_key(self, request, version=''):
+            if not isinstance(request.accepted_renderer, SPEC_RENDERERS):
+                return None
+            return (
+                request.accepted_renderer.format,
+                request.version or version or '',
+                request.build_absolute_uri('/'))
+
+        def get(self, request, version='', format=None):
+            key = self.get_schema_key(request, version)
+            if key not in self.rendered_schemas:
+                return super().get(request, version, format)
+
+            content_type, content, etag = self.rendered_schemas[key]
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = HttpResponse(content, content_type=content_type)
+            return response
+
+        def finalize_response(self, request, response, *args, **kwargs):
+            response = super().finalize_response(
+                request, response, *args, **kwargs)
+            key = self.get_schema_key(request, kwargs.get('version', ''))
+            if key is None:
+                return response
+
+            if key not in self.rendered_schemas:
+                if response.status_code != 200:
+                    return response
+                response.render()
+                etag = quote_etag(hashlib.md5(response.content).hexdigest())
+                self.rendered_schemas[key] = (
+                    response['Content-Type'], response.content, etag)
+
+            response['ETag'] = self.rendered_schemas[key][2]
+            patch_cache_control(
+                response, public=True,
+                max_age=settings.SCHEMA_CACHE_TIMEOUT)
+            return response
+
+    return CachedSchemaView
@@ -0,0 +1,25 @@
+"""Full text search utilities"""
+
+# Standard Library
+import re
+
+# Django
+from django.contrib.postgres.search import SearchQuery
+
+# Text search configuration of the search vectors
+SEARCH_CONFIG = 'simple'
+
+
+def get_search_words(text):
+    return re.findall(r'\w+', text)
+
+
+def prefix_search_query(text, config=SEARCH_CONFIG):
+    """Query matching every word of the text by prefix, None when the text
+       has no words"""
+    words = get_search_words(text)
+    if not words:
+        return None
+    return SearchQuery(
+        ' & '.join(f'{word}:*' for word in words),
+        config=config, search_type='raw')
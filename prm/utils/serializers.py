@@ -0,0 +1,64 @@
+"""Django REST Framework serializers utilities"""
+
+# Django
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Pictures
+from .pictures import get_variant_names
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """List serializer persisting every item with a single bulk query.
+
+    Meant for flat models, many to many and nested fields are not saved.
+    """
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objs = model._default_manager.bulk_create(
+            model(**attrs) for attrs in validated_data)
+        # New objects have no relations, serializing them must not query
+        for obj in objs:
+            obj._prefetched_objects_cache = {
+                field.name: field.related_model._default_manager.none()
+                for field in model._meta.many_to_many}
+        return objs
+
+    def update(self, instances, validated_data):
+        """Update the instances, given in the same order as the data"""
+        model = self.child.Meta.model
+        fields = {'modified'}
+        now = timezone.now()
+        for instance, attrs in zip(instances, validated_data):
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+            # bulk_update skips pre_save, so auto_now isn't applied
+            instance.modified = now
+            fields.update(attrs)
+        model._default_manager.bulk_update(instances, fields)
+        return instances
+
+
+class PictureVariantsField(serializers.ReadOnlyField):
+    """URLs of the resized copies of an entity's picture, by size and
+    format. Empty until they're generated, then clients can fetch the
+    smallest one that fits instead of the original."""
+
+    def get_attribute(self, instance):
+        return instance
+
+    def to_representation(self, entity):
+        storage = entity.picture.storage
+        request = self.context.get('request', None)
+        urls = {}
+        for size, names in get_variant_names(entity).items():
+            urls[size] = {}
+            for variant_format, name in names.items():
+                url = storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                urls[size][variant_format] = url
+        return urls
@@ -0,0 +1,53 @@
+"""Django signals"""
+
+# Standard Library
+import threading
+from contextlib import contextmanager
+
+# Django
+from django.dispatch import Signal
+
+# Sent by PRMQuerySet after bulk_create and bulk_update, which don't send
+# post_save, with the model as sender and the saved `objs`. Objects
+# skipped by bulk_create(ignore_conflicts=True) have no pk.
+bulk_saved = Signal(providing_args=['objs'])
+
+# Sent by PRMQuerySet.delete and PRMModel.delete, with the model as sender
+# and the `queryset` of the objects to delete, before deleting them within
+# a `batched_receivers` block. Receivers can collect what the objects
+# reference with a single query, objects deleted in cascade don't send it.
+deleting = Signal(providing_args=['queryset'])
+
+_batch = threading.local()
+
+
+@contextmanager
+def batched_receivers():
+    """Receivers calling `run_batched` within the block, like the
+       post_delete of every object of a cascade, run their work once when
+       it ends, still inside the transaction. Blocks can be nested, the
+       outermost one runs the work, which is dropped on errors."""
+    if getattr(_batch, 'pending', None) is not None:
+        yield
+        return
+
+    _batch.pending = {}
+    try:
+        yield
+        # Work may batch more work, like deletes sending post_delete
+        while _batch.pending:
+            func, values = _batch.pending.popitem()
+            func(values)
+    finally:
+        _batch.pending = None
+
+
+def run_batched(func, values):
+    """Calls `func` with the values of every call made within the current
+       `batched_receivers` block when it ends, or right away outside of
+       one"""
+    pending = getattr(_batch, 'pending', None)
+    if pending is None:
+        func(list(values))
+    else:
+        pending.setdefault(func, []).extend(values)
@@ -0,0 +1,67 @@
+"""Private files.
+
+Files holding personal data, like account exports and contacts imports,
+are kept on PRIVATE_FILE_STORAGE under names that can't be guessed, never
+on the public media storage. Users download them through links signed by
+the app that expire, see `make_download_token`.
+"""
+
+# Standard Library
+import os
+import secrets
+from datetime import timedelta
+
+# Django
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import get_storage_class
+from django.utils import timezone
+from django.utils.functional import LazyObject
+
+DOWNLOAD_SALT = 'prm.utils.storages.download'
+
+
+class PrivateStorage(LazyObject):
+    def _setup(self):
+        storage_class = get_storage_class(settings.PRIVATE_FILE_STORAGE)
+        self._wrapped = storage_class(
+            **settings.PRIVATE_FILE_STORAGE_OPTIONS)
+
+
+private_storage = PrivateStorage()
+
+
+def save_private_file(directory, extension, content):
+    """Stores the content under a random name, returns the name"""
+    return private_storage.save(
+        f'{directory}/{secrets.token_urlsafe(24)}.{extension}', content)
+
+
+def make_download_token(name, filename):
+    """Signed token of a private file, downloaded as `filename`"""
+    return signing.dumps(
+        {'name': name, 'filename': filename}, salt=DOWNLOAD_SALT)
+
+
+def load_download_token(token, max_age):
+    """Returns the name and download filename of the token, raises
+       signing.BadSignature when it's invalid or older than `max_age`"""
+    data = signing.loads(token, salt=DOWNLOAD_SALT, max_age=max_age)
+    return data['name'], data['filename']
+
+
+def prune_private_files(directory, max_age):
+    """Deletes the files of the directory older than `max_age` seconds,
+       returns how many"""
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    try:
+        _, names = private_storage.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    deleted = 0
+    for name in names:
+        path = os.path.join(directory, name)
+        if private_storage.get_modified_time(path) < cutoff:
+            private_storage.delete(path)
+            deleted += 1
+    return deleted
@@ -0,0 +1,146 @@
+"""Picture variants tests"""
+
+# Standard Library
+from io import BytesIO
+from unittest.mock import patch
+
+# Django
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+# Django REST Framework
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+
+# Pillow
+from PIL import Image
+
+# Models
+from ...users.models import Profile, User
+from ...relations.models import Contact
+
+# Tasks
+from ...taskapp.tasks import generate_picture_variants
+
+DELAY = 'prm.taskapp.tasks.generate_picture_variants.delay'
+
+EXIF_MAKE = 0x010f
+EXIF_ORIENTATION = 0x0112
+
+
+def make_picture(name='picture.jpg', size=(2000, 1000), orientation=1):
+    """JPEG upload with camera metadata"""
+    exif = Image.Exif()
+    exif[EXIF_MAKE] = 'Camera'
+    exif[EXIF_ORIENTATION] = orientation
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'JPEG', exif=exif.tobytes())
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+class PictureVariantsTestCase(APITransactionTestCase):
+    """Uploaded pictures get resized copies without metadata, generated
+    once committed, and payloads link to them"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@user.com',
+            username='test_user',
+            password='Testpassword123',
+            is_active=True)
+        self.client.force_authenticate(self.user)
+        self.contact = Contact.objects.create(
+            owner=self.user, first_name='Contact', last_name='Test')
+        self.url = f'/contacts/{self.contact.code}/'
+        return super().setUp()
+
+    def upload(self, picture):
+        with patch(DELAY) as delay:
+            response = self.client.patch(
+                self.url, {'picture': picture}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        delay.assert_called_once_with('relations.Contact', self.contact.pk)
+        generate_picture_variants('relations.Contact', self.contact.pk)
+        self.contact.refresh_from_db()
+        return self.contact.picture_variants['variants']
+
+    def open_variant(self, name):
+        with self.contact.picture.storage.open(name) as file:
+            image = Image.open(file)
+            image.load()
+        return image
+
+    def test_variants_generated(self):
+        with patch(DELAY):
+            response = self.client.patch(
+                self.url, {'picture': make_picture()}, format='multipart')
+        # Not generated yet
+        self.assertEqual(response.data['picture_variants'], {})
+
+        variants = self.upload(make_picture())
+        self.assertEqual(set(variants), set(settings.PICTURE_VARIANTS))
+        for size_name, size in settings.PICTURE_VARIANTS.items():
+            self.assertEqual(set(variants[size_name]), {'webp', 'jpeg'})
+            for variant_format, name in variants[size_name].items():
+                image = self.open_variant(name)
+                self.assertEqual(image.format, variant_format.upper())
+                self.assertEqual(image.size, (size, size // 2))
+                self.assertFalse(image.getexif())
+
+        response = self.client.get(self.url)
+        urls = response.data['picture_variants']
+        self.assertEqual(set(urls), set(settings.PICTURE_VARIANTS))
+        self.assertTrue(urls['small']['webp'].startswith('http://'))
+        self.assertTrue(urls['small']['webp'].endswith(
+            variants['small']['webp']))
+
+    def test_orientation_applied(self):
+        variants = self.upload(make_picture(size=(400, 200), orientation=6))
+        image = self.open_variant(variants['medium']['jpeg'])
+        self.assertEqual(image.size, (160, 320))
+
+    def test_replaced_picture_variants_deleted(self):
+        old = self.upload(make_picture())
+        new = self.upload(make_picture('other.jpg'))
+        storage = self.contact.picture.storage
+        self.assertFalse(storage.exists(old['small']['webp']))
+        self.assertTrue(storage.exists(new['small']['webp']))
+
+    def test_variant_names(self):
+        """Variants of different pictures uploaded with the same name or
+           of the same content never overwrite each other"""
+        old = self.upload(make_picture('same.jpg', size=(2000, 1000)))
+        new = self.upload(make_picture('same.png', size=(1000, 2000)))
+        storage = self.contact.picture.storage
+        self.assertNotEqual(old['small']['webp'], new['small']['webp'])
+        self.assertIn(self.contact.code, new['small']['webp'])
+        self.assertTrue(storage.exists(new['small']['webp']))
+
+        # Overwriting storages write the variants of the same content again
+        save = storage.save
+
+        def overwrite(name, content, **kwargs):
+            storage.delete(name)
+            return save(name, content, **kwargs)
+
+        with patch.object(storage, 'save', overwrite):
+            again = self.upload(make_picture('again.png', size=(1000, 2000)))
+        self.assertEqual(again, new)
+        for names in again.values():
+            for name in names.values():
+                self.assertTrue(storage.exists(name))
+
+    def test_profile_variants(self):
+        profile = Profile.objects.create(user=self.user)
+        with patch(DELAY) as delay:
+            profile.picture = make_picture()
+            profile.save()
+        delay.assert_called_once_with('users.Profile', profile.pk)
+
+        # Saves that keep the picture don't generate it again
+        generate_picture_variants('users.Profile', profile.pk)
+        profile.refresh_from_db()
+        with patch(DELAY) as delay:
+            profile.biography = 'Test'
+            profile.save()
+        delay.assert_not_called()
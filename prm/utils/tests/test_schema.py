@@ -0,0 +1,47 @@
+"""API schema tests"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+
+# Swagger
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+# URLs
+from config.urls import schema_view
+
+GET_SCHEMA = 'drf_yasg.generators.OpenAPISchemaGenerator.get_schema'
+
+
+class CachedSchemaTestCase(TestCase):
+    """The schema is generated once and then served from memory"""
+
+    def setUp(self):
+        schema_view.rendered_schemas.clear()
+        return super().setUp()
+
+    def test_schema_generated_once(self):
+        get_schema = OpenAPISchemaGenerator.get_schema
+        with patch(GET_SCHEMA, autospec=True,
+                   side_effect=get_schema) as mock:
+            response = self.client.get('/swagger/', {'format': 'openapi'})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'/contacts/', response.content)
+            etag = response['ETag']
+            self.assertIn('max-age', response['Cache-Control'])
+
+            cached = self.client.get('/swagger/', {'format': 'openapi'})
+            self.assertEqual(cached.content, response.content)
+            self.assertEqual(cached['ETag'], etag)
+
+            not_modified = self.client.get(
+                '/swagger/', {'format': 'openapi'}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(mock.call_count, 1)
+
+    def test_ui_not_cached(self):
+        response = self.client.get('/swagger/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
@@ -0,0 +1,42 @@
+"""Transaction scoped state tests"""
+
+# Django
+from django.db import DatabaseError, transaction
+from django.test import TransactionTestCase
+
+# Transactions
+from ..transactions import get_transaction_state
+
+
+class TransactionStateTestCase(TransactionTestCase):
+    """State lives until the transaction commits or rolls back, rollbacks
+    of savepoints included"""
+
+    def test_shared_until_commit(self):
+        with transaction.atomic():
+            get_transaction_state('test').add(1)
+            with transaction.atomic():
+                self.assertEqual(get_transaction_state('test'), {1})
+        with transaction.atomic():
+            self.assertEqual(get_transaction_state('test'), set())
+
+    def test_dropped_on_rollback(self):
+        with self.assertRaises(DatabaseError):
+            with transaction.atomic():
+                get_transaction_state('test').add(1)
+                raise DatabaseError('Rolled back')
+        with transaction.atomic():
+            self.assertEqual(get_transaction_state('test'), set())
+
+    def test_dropped_on_savepoint_rollback(self):
+        with transaction.atomic():
+            get_transaction_state('test').add(1)
+            with self.assertRaises(DatabaseError):
+                with transaction.atomic():
+                    get_transaction_state('test').add(2)
+                    raise DatabaseError('Rolled back')
+            self.assertEqual(get_transaction_state('test'), set())
+
+    def test_outside_transactions(self):
+        get_transaction_state('test').add(1)
+        self.assertEqual(get_transaction_state('test'), set())
@@ -0,0 +1,87 @@
+"""Transaction scoped state.
+
+Receivers running for many objects of the same transaction, like the
+post_delete of every object of a cascade, can share state that lives as
+long as the transaction and is dropped when it commits or rolls back,
+which is told apart through commit callbacks, see `get_transaction_state`.
+"""
+
+# Standard Library
+import threading
+import weakref
+
+# Django
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+_local = threading.local()
+
+
+class TransactionState:
+    """State shared within a transaction, along with the commit callbacks
+       registered by the calls that got it"""
+
+    def __init__(self, value):
+        self.value = value
+        self.markers = []
+        self.stale = False
+
+    def add_marker(self, marker):
+        self.markers.append(weakref.ref(marker, self.forget))
+
+    def forget(self, _):
+        # A marker went away, the rollback it was discarded by may have
+        # undone changes the value keeps track of
+        self.stale = True
+
+
+class TransactionMarker:
+    """Commit callback dropping the state once the transaction commits.
+       Rollbacks, including the ones of savepoints, discard the callbacks
+       registered within them, which makes the state stale."""
+
+    def __init__(self, key, state):
+        self.key = key
+        self.state = state
+
+    def __call__(self):
+        if _local.states.get(self.key) is self.state:
+            del _local.states[self.key]
+
+
+def get_transaction_state(name, factory=set, using=None):
+    """Object shared by the calls made within the current transaction.
+       Outside of transactions every call gets a new one."""
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        return factory()
+
+    if not hasattr(_local, 'states'):
+        _local.states = {}
+    key = (connection.alias, name)
+    state = _local.states.get(key)
+    if state is None or state.stale:
+        state = _local.states[key] = TransactionState(factory())
+    # Registered by every call, so savepoints rolled back after any of
+    # them are told apart
+    marker = TransactionMarker(key, state)
+    state.add_marker(marker)
+    transaction.on_commit(marker, using=connection.alias)
+    return state.value
+
+
+def get_deleted_users():
+    """Users being deleted in the current transaction. Receivers of the
+       deletes cascaded from the user can skip the work on data that's
+       deleted along with them."""
+    return get_transaction_state('deleted_users')
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def track_deleted_user(sender, instance, **kwargs):
+    """Every pre_delete is sent before the first row is deleted, so the
+       user is tracked during the whole cascade, which runs in a
+       transaction"""
+    get_deleted_users().add(instance.pk)
@@ -0,0 +1,93 @@
+"""Per user data versions.
+
+The version of a user's data changes whenever an object they own is
+written, so responses built from it can be validated or cached by version
+instead of querying the data. Versions are timestamps, so they double as
+the last modification date.
+"""
+
+# Standard Library
+import time
+
+# Django
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+# Signals
+from .signals import bulk_saved
+
+# Transactions
+from .transactions import get_deleted_users, get_transaction_state
+
+
+def get_version(key):
+    """Timestamp of the last bump of the key. Unknown versions, like
+       evicted ones, start now."""
+    version = cache.get(key)
+    if version is None:
+        version = time.time()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(key):
+    """New versions are at least a second apart, so Last-Modified dates,
+       which have a resolution of seconds, change along with them"""
+    version = max(time.time(), int(cache.get(key, 0)) + 1)
+    cache.set(key, version, None)
+    return version
+
+
+def bump_version_on_commit(key):
+    """Bumps the version right away and again once the changes are
+       visible, so responses built meanwhile from the data before the
+       changes never keep the latest version. Keys are bumped once per
+       transaction, whatever the number of changes."""
+    bumped = get_transaction_state('bumped_versions')
+    if key in bumped:
+        return
+    bumped.add(key)
+    bump_version(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_version(key))
+
+
+def get_data_version_key(user_pk):
+    return f'data_version:{user_pk}'
+
+
+def get_data_version(user_pk):
+    """Timestamp of the last change of the user's data"""
+    return get_version(get_data_version_key(user_pk))
+
+
+def bump_data_version(user_pk):
+    return bump_version(get_data_version_key(user_pk))
+
+
+def bump_data_version_on_commit(user_pk):
+    bump_version_on_commit(get_data_version_key(user_pk))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(m2m_changed)
+def bump_owner_data_version(sender, instance, **kwargs):
+    """Changes to objects owned by a user make their cached responses
+       stale, see ConditionalGetMixin"""
+    if kwargs.get('action', '').startswith('pre_'):
+        # m2m_changed is sent before and after the change
+        return
+    owner_id = getattr(instance, 'owner_id', None)
+    if owner_id is not None and owner_id not in get_deleted_users():
+        bump_data_version_on_commit(owner_id)
+
+
+@receiver(bulk_saved)
+def bump_bulk_saved_owners_data_version(sender, objs, **kwargs):
+    for owner_id in {getattr(obj, 'owner_id', None) for obj in objs}:
+        if owner_id is not None:
+            bump_data_version_on_commit(owner_id)